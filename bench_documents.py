@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Banc de performance de la chaîne documentaire
+
+Génère un corpus synthétique reproductible (graine fixe) puis chronomètre
+chaque phase dans un processus Python neuf, pour mesurer aussi sa mémoire
+maximale (RSS) :
+
+  update_docx         update_existing_word_docs(), moteur python-docx
+  update_stream       update_existing_word_docs(), réécriture XML en flux
+  update_incremental  second passage sur un dossier déjà traité (manifeste)
+  copy_cold           copy_to_target() vers un dossier vide
+  copy_warm           copy_to_target() vers un dossier déjà à jour
+  prospectus          build_prospectus() sur les lots synthétiques
+  quotes_batch        generate_prospectus.run_batch() (devis personnalisés)
+  releves             releves.reconcile() (réservations × paiements)
+
+Corpus : nombre de .docx, paragraphes par document, densité de tableaux,
+fragmentation des runs (termes coupés entre runs), taille des images, part
+de documents contenant des termes, lots, réservations et paiements. Le
+corpus est mis en cache dans --work, sous une empreinte de ses paramètres.
+
+Chaque phase est lancée --repeat fois (processus neuf à chaque fois) et la
+mesure la plus rapide est retenue. Les résultats (durée, CPU, débit docs/s ou
+pages/s, RSS maximal) sont comparés à la référence versionnée
+bench/baseline.json : toute métrique dégradée au-delà du seuil fait échouer le
+banc (code de sortie 1). Les durées sont comparées avec un plancher de
+--min-seconds : une phase de quelques millisecondes ne mesure que du bruit.
+Sans référence, le banc échoue (code 2) ; --save-baseline enregistre la
+mesure courante comme nouvelle référence.
+
+La référence et la mesure courante ne viennent pas forcément de la même
+machine (poste du développeur, runner CI). Avant chaque exécution d'une phase,
+un étalon fixe (calcul pur Python, compression, XML), sans lien avec le
+corpus, est chronométré dans un processus neuf : les durées et débits de la
+phase sont ramenés au rapport de ses étalons et de ceux de la référence, ce
+qui compare des ratios normalisés plutôt que des secondes brutes, et suit
+les variations de vitesse d'une machine partagée au fil du banc. Le RSS ne
+dépend pas de la vitesse de la machine mais de l'interpréteur : il n'est
+comparé que si la référence a été prise avec la même version de Python.
+
+Usage :
+    python3 bench_documents.py [--docs 200] [--paragraphs 40] [--tables 0.2]
+                               [--run-chars 12] [--media-kb 0] [--match-ratio 0.2]
+                               [--phases update_docx,prospectus] [--jobs 1]
+                               [--baseline bench/baseline.json] [--threshold 0.25]
+                               [--repeat 3] [--min-seconds 0.05] [--save-baseline]
+"""
+
+import os
+import io
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import hashlib
+import argparse
+import platform
+import contextlib
+import subprocess
+import zipfile
+import zlib
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+DEFAULT_WORK = SCRIPT_DIR / '.cache' / 'bench'
+DEFAULT_BASELINE = SCRIPT_DIR / 'bench' / 'baseline.json'
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 3
+# En deçà, une durée n'est plus comparée telle quelle (bruit du planificateur, cache disque)
+DEFAULT_MIN_SECONDS = 0.05
+RESULT_MARKER = '@@BENCH '
+CORPUS_VERSION = 1
+BASELINE_VERSION = 2
+# Étalon de normalisation : exécuté comme une phase, jamais comparé lui-même
+CALIBRATION = 'calibration'
+CALIBRATION_ROUNDS = 20
+
+PHASES = ['update_docx', 'update_stream', 'update_incremental', 'copy_cold', 'copy_warm',
+          'prospectus', 'quotes_batch', 'releves']
+# Métriques suivies : (clé, sens) ; +1 = plus grand est meilleur
+TRACKED = [('seconds', -1), ('rate', +1), ('peak_rss_kb', -1)]
+
+WORDS = ('terrain titré lot parcelle bornage Yaoundé Soa Mbankomo versement échéance client '
+         'réservation contrat paiement frais dossier mensualité durée mois titre foncier '
+         'viabilisé accès route eau électricité plan cadastral notaire signature').split()
+FIXED_ZIP_DATE = (2026, 2, 1, 0, 0, 0)
+
+
+# ── Corpus synthétique ────────────────────────────────────────────────────────
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+
+def _sentence(rng, terms, with_term):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    if with_term:
+        words.insert(rng.randrange(len(words)), rng.choice(terms))
+    text = ' '.join(words)
+    return text[0].upper() + text[1:] + '.'
+
+
+def _runs_xml(rng, text, run_chars):
+    """Découpe le texte en runs d'environ `run_chars` caractères (mise en forme alternée)."""
+    runs, pos = [], 0
+    while pos < len(text):
+        size = max(1, int(rng.expovariate(1 / run_chars))) if run_chars else len(text)
+        chunk = text[pos:pos + size]
+        pos += size
+        props = '<w:rPr><w:b/></w:rPr>' if len(runs) % 2 else ''
+        runs.append(f'<w:r>{props}<w:t xml:space="preserve">{escape(chunk)}</w:t></w:r>')
+    return ''.join(runs)
+
+
+def _paragraph_xml(rng, params, terms, with_terms):
+    hit = with_terms and rng.random() < 0.3
+    return f'<w:p>{_runs_xml(rng, _sentence(rng, terms, hit), params["run_chars"])}</w:p>'
+
+
+def _table_xml(rng, params, terms, with_terms):
+    rows = []
+    for _ in range(rng.randint(2, 6)):
+        cells = ''.join(f'<w:tc>{_paragraph_xml(rng, params, terms, with_terms)}</w:tc>' for _ in range(3))
+        rows.append(f'<w:tr>{cells}</w:tr>')
+    return f'<w:tbl><w:tblPr/>{"".join(rows)}</w:tbl>'
+
+
+def make_docx(path, rng, params, terms):
+    """Écrit un .docx minimal (zip brut, dates figées) : paragraphes, tableaux, image éventuelle."""
+    with_terms = rng.random() < params['match_ratio']
+    blocks = []
+    for _ in range(params['paragraphs']):
+        if rng.random() < params['tables']:
+            blocks.append(_table_xml(rng, params, terms, with_terms))
+        else:
+            blocks.append(_paragraph_xml(rng, params, terms, with_terms))
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}"><w:body>{"".join(blocks)}'
+        '<w:sectPr/></w:body></w:document>'
+    )
+    rels = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">']
+    media = None
+    if params['media_kb']:
+        rels.append('<Relationship Id="rId1" '
+                    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" '
+                    'Target="media/image1.png"/>')
+        media = rng.randbytes(params['media_kb'] * 1024)
+    rels.append('</Relationships>')
+
+    def write(zf, name, data, compress=zipfile.ZIP_DEFLATED):
+        info = zipfile.ZipInfo(name, FIXED_ZIP_DATE)
+        info.compress_type = compress
+        zf.writestr(info, data)
+
+    with zipfile.ZipFile(path, 'w') as zf:
+        write(zf, '[Content_Types].xml', CONTENT_TYPES)
+        write(zf, '_rels/.rels', ROOT_RELS)
+        write(zf, 'word/document.xml', document)
+        write(zf, 'word/_rels/document.xml.rels', ''.join(rels))
+        if media is not None:
+            write(zf, 'word/media/image1.png', media, zipfile.ZIP_STORED)
+
+
+def make_lots(rng, count):
+    lots = []
+    for i in range(1, count + 1):
+        size = rng.choice((300, 500, 750, 1000, 1500))
+        duration = rng.choice((12, 24, 30, 36))
+        price = size * rng.choice((800, 1000, 1200))
+        lots.append({'id': i, 'title': f'Lot {i} - {size}m²', 'location': rng.choice(('Soa', 'Mbankomo', 'Nkolfoulou')),
+                     'size_m2': size, 'price': price, 'monthly_amount': -(-price // duration),
+                     'duration_months': duration, 'icon': '🏡', 'features': [], 'status': 'available',
+                     'display_order': i, 'updated_at': None})
+    return lots
+
+
+def make_reservations(rng, lots, count, payments_per_res, res_path, pay_path):
+    freqs = ('quotidien', 'hebdomadaire', 'bimensuel', 'mensuel', 'semestriel')
+    with open(res_path, 'w', newline='', encoding='utf-8') as fh_res, \
+            open(pay_path, 'w', newline='', encoding='utf-8') as fh_pay:
+        res = csv.writer(fh_res)
+        pay = csv.writer(fh_pay)
+        res.writerow(['id', 'lead_name', 'lot_type', 'lot_price', 'duration_months', 'monthly_amount',
+                      'daily_amount', 'payment_frequency', 'created_at'])
+        pay.writerow(['id', 'reservation_id', 'amount', 'paid_at', 'method', 'status'])
+        pay_id = 0
+        for rid in range(1, count + 1):
+            lot = rng.choice(lots)
+            start = f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+            res.writerow([rid, f'Client {rid}', lot['title'], lot['price'], lot['duration_months'],
+                          lot['monthly_amount'], 1500, rng.choice(freqs), start])
+            for _ in range(rng.randint(0, payments_per_res * 2)):
+                pay_id += 1
+                pay.writerow([pay_id, rid, rng.choice((1500, 3000, 10500, lot['monthly_amount'])),
+                              f'2026-{rng.randint(1, 2):02d}-{rng.randint(1, 28):02d}', 'momo',
+                              'paid' if rng.random() < 0.95 else 'failed'])
+
+
+def corpus_params(args):
+    return {
+        'v': CORPUS_VERSION, 'seed': args.seed, 'docs': args.docs, 'paragraphs': args.paragraphs,
+        'tables': args.tables, 'run_chars': args.run_chars, 'media_kb': args.media_kb,
+        'match_ratio': args.match_ratio, 'lots': args.lots, 'reservations': args.reservations,
+        'payments_per_res': args.payments_per_res, 'quotes': args.quotes,
+    }
+
+
+def build_corpus(work: Path, params: dict) -> Path:
+    """Crée (ou réutilise) le corpus correspondant à `params` ; renvoie son dossier."""
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+    corpus = work / f'corpus-{digest}'
+    if (corpus / 'params.json').exists():
+        return corpus
+    if corpus.exists():
+        shutil.rmtree(corpus)
+    from update_documents import FLAG_TERMS, TEXT_REPLACEMENTS
+    terms = [old for old, _, _ in TEXT_REPLACEMENTS] + FLAG_TERMS
+
+    rng = random.Random(params['seed'])
+    docs = corpus / 'docs'
+    docs.mkdir(parents=True)
+    for i in range(params['docs']):
+        sub = docs / f'dossier_{i % 10:02d}'
+        sub.mkdir(exist_ok=True)
+        make_docx(sub / f'ancien_{i:05d}.docx', rng, params, terms)
+    lots = make_lots(rng, params['lots'])
+    (corpus / 'lots.json').write_text(json.dumps({'lots': lots}, ensure_ascii=False), encoding='utf-8')
+    make_reservations(rng, lots, params['reservations'], params['payments_per_res'],
+                      corpus / 'reservations.csv', corpus / 'payments.csv')
+    (corpus / 'params.json').write_text(json.dumps(params, indent=1), encoding='utf-8')
+    return corpus
+
+
+# ── Phases (exécutées dans un processus neuf) ─────────────────────────────────
+def _peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _fresh_copy(src: Path, scratch: Path) -> Path:
+    if scratch.exists():
+        shutil.rmtree(scratch)
+    shutil.copytree(src, scratch)
+    return scratch
+
+
+def _count_pages(pdf_path):
+    import re
+    return len(re.findall(rb'/Type\s*/Page\b', Path(pdf_path).read_bytes()))
+
+
+def run_phase(name, corpus: Path, scratch: Path, jobs: int):
+    """Prépare puis chronomètre une phase ; renvoie ses métriques."""
+    sys.path.insert(0, str(SCRIPT_DIR))
+    params = json.loads((corpus / 'params.json').read_text(encoding='utf-8'))
+    sink = io.StringIO()
+    result = {'items': 0, 'unit': 'docs'}
+
+    if name.startswith('update_'):
+        import update_documents as ud
+        target = _fresh_copy(corpus / 'docs', scratch / 'target')
+        backend = 'stream' if name == 'update_stream' else 'docx'
+        if name == 'update_incremental':
+            with contextlib.redirect_stdout(sink):
+                ud.update_existing_word_docs(target, jobs=jobs, backend=backend)
+
+        def work():
+            return ud.update_existing_word_docs(target, jobs=jobs, backend=backend)
+        result['items'] = params['docs']
+
+    elif name.startswith('copy_'):
+        import update_documents as ud
+        names = sorted(p.name for p in (corpus / 'docs' / 'dossier_00').glob('*.docx'))
+        target = scratch / 'copy'
+        if target.exists():
+            shutil.rmtree(target)
+        target.mkdir(parents=True)
+        if name == 'copy_warm':
+            with contextlib.redirect_stdout(sink):
+                ud.copy_to_target(target, source_dir=corpus / 'docs' / 'dossier_00', names=names)
+
+        def work():
+            return ud.copy_to_target(target, source_dir=corpus / 'docs' / 'dossier_00', names=names)
+        result['items'] = len(names)
+
+    elif name == 'prospectus':
+        import generate_prospectus as gp
+        lots = json.loads((corpus / 'lots.json').read_text(encoding='utf-8'))['lots']
+        scratch.mkdir(parents=True, exist_ok=True)
+        out = scratch / 'prospectus.pdf'
+
+        def work():
+            return gp.build_prospectus({'lots': lots}, out=str(out))
+        result['items'] = 1
+        result['unit'] = 'pages'
+
+    elif name == 'quotes_batch':
+        import generate_prospectus as gp
+        rows = list(gp.iter_rows(str(corpus / 'reservations.csv'), 'csv'))[:params['quotes']]
+        out_dir = scratch / 'devis'
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+
+        def work():
+            return gp.run_batch(rows, str(out_dir), jobs=jobs)
+        result['items'] = len(rows)
+
+    elif name == 'releves':
+        import numpy as np
+        import releves
+        res = releves.load_reservations(str(corpus / 'reservations.csv'))
+        pay = releves.load_payments(str(corpus / 'payments.csv'))
+
+        def work():
+            return releves.reconcile(res, pay, np.datetime64('2026-03-01'))
+        result['items'] = len(res['id'])
+        result['unit'] = 'réservations'
+
+    elif name == CALIBRATION:
+        rng = random.Random(0)
+        text = ' '.join(rng.choice(WORDS) for _ in range(20000))
+
+        def work():
+            for i in range(CALIBRATION_ROUNDS):
+                xml = ''.join(f'<w:t>{escape(word)}</w:t>' for word in text.split())
+                zlib.compress(xml.encode('utf-8'), 6)
+                hashlib.sha256(xml.encode('utf-8')).hexdigest()
+                sorted(set(text.split()), key=lambda word: (len(word), word))
+        result['items'] = CALIBRATION_ROUNDS
+        result['unit'] = 'tours'
+
+    else:
+        raise SystemExit(f'Phase inconnue : {name}')
+
+    t0, c0 = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(sink):
+        work()
+    seconds = time.perf_counter() - t0
+    result['cpu_seconds'] = round(time.process_time() - c0, 4)
+    if name == 'prospectus':
+        result['items'] = _count_pages(scratch / 'prospectus.pdf')
+    result['seconds'] = round(seconds, 4)
+    result['rate'] = round(result['items'] / seconds, 2) if seconds else 0.0
+    result['peak_rss_kb'] = _peak_rss_kb()
+    return result
+
+
+def run_phase_isolated(name, corpus, work, jobs, timeout=3600):
+    """Lance une phase dans un interpréteur neuf (mesure de RSS non faussée)."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), '--run-phase', name,
+           '--corpus', str(corpus), '--work', str(work), '--jobs', str(jobs)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f'{name} : aucune mesure (code {proc.returncode})\n{proc.stderr[-2000:]}')
+
+
+def run_phase_repeated(name, corpus, work, jobs, repeat=DEFAULT_REPEAT):
+    """Lance une phase `repeat` fois, chacune précédée de l'étalon ; garde la plus rapide,
+    avec le RSS maximal observé et l'étalon le plus rapide."""
+    runs, calibrations = [], []
+    for _ in range(max(1, repeat)):
+        calibrations.append(run_phase_isolated(CALIBRATION, corpus, work, 1)['seconds'])
+        runs.append(run_phase_isolated(name, corpus, work, jobs))
+    best = dict(min(runs, key=lambda run: run['seconds']))
+    rss = [run['peak_rss_kb'] for run in runs if run.get('peak_rss_kb')]
+    best['peak_rss_kb'] = max(rss) if rss else None
+    best['runs'] = len(runs)
+    best[CALIBRATION] = min(calibrations)
+    return best
+
+
+# ── Référence et régressions ──────────────────────────────────────────────────
+def _floored(metrics: dict, key: str, min_seconds: float, speed: float = 1.0):
+    """Valeur comparée : durée (et débit qui en découle) ramenée au plancher `min_seconds`.
+
+    Les durées sont d'abord divisées par `speed`, rapport des étalons des deux machines.
+    """
+    value = metrics.get(key)
+    if key == 'seconds' and value is not None:
+        return max(value / speed, min_seconds)
+    if key == 'rate' and metrics.get('seconds') is not None and metrics.get('items'):
+        return metrics['items'] / max(metrics['seconds'] / speed, min_seconds)
+    return value
+
+
+def calibration_seconds(run: dict):
+    """Durée de l'étalon le plus rapide d'une exécution (None pour une référence antérieure à l'étalon)."""
+    seconds = [m[CALIBRATION] for m in run.get('phases', {}).values() if m.get(CALIBRATION)]
+    return min(seconds) if seconds else None
+
+
+def _python_minor(run: dict):
+    return '.'.join(str(run.get('machine', {}).get('python', '')).split('.')[:2])
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_seconds: float = DEFAULT_MIN_SECONDS) -> list:
+    """Liste des régressions [(phase, métrique, référence, mesure, écart relatif)].
+
+    Quand la phase porte un étalon des deux côtés, ses durées sont exprimées en
+    unités d'étalon : la comparaison ne dépend plus de la machine. Le RSS n'est
+    comparé qu'entre exécutions d'une même version de Python.
+    Les durées (et débits) sous `min_seconds` sont relevées au plancher : deux
+    mesures toutes deux plus courtes que le plancher sont considérées égales.
+    """
+    same_python = _python_minor(current) == _python_minor(baseline)
+    regressions = []
+    for phase, metrics in current['phases'].items():
+        ref = baseline.get('phases', {}).get(phase)
+        if not ref:
+            continue
+        speed = metrics[CALIBRATION] / ref[CALIBRATION] if metrics.get(CALIBRATION) and ref.get(CALIBRATION) else 1.0
+        for key, direction in TRACKED:
+            if key == 'peak_rss_kb' and not same_python:
+                continue
+            old, new = _floored(ref, key, min_seconds), _floored(metrics, key, min_seconds, speed)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if direction * change < -threshold:
+                regressions.append((phase, key, old, new, change))
+    return regressions
+
+
+def print_table(current: dict, baseline: dict):
+    print(f"\n  {'phase':<20}{'durée (s)':>11}{'CPU (s)':>10}{'débit':>24}{'RSS max':>12}{'réf. (s)':>11}{'étalon (s)':>12}")
+    for phase, m in current['phases'].items():
+        ref = baseline.get('phases', {}).get(phase, {}) if baseline else {}
+        rate = f"{m['rate']:.1f} {m['unit']}/s"
+        rss = f"{m['peak_rss_kb'] // 1024} Mo" if m.get('peak_rss_kb') else '—'
+        ref_s = f"{ref['seconds']:.3f}" if ref.get('seconds') else '—'
+        calibration = f"{m[CALIBRATION]:.3f}" if m.get(CALIBRATION) else '—'
+        print(f"  {phase:<20}{m['seconds']:>11.3f}{m['cpu_seconds']:>10.3f}{rate:>24}{rss:>12}{ref_s:>11}{calibration:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TERRASOCIAL — Banc de performance de la chaîne documentaire')
+    parser.add_argument('--docs', type=int, default=200, help='Nombre de .docx du corpus (défaut : 200)')
+    parser.add_argument('--paragraphs', type=int, default=40, help='Blocs (paragraphes/tableaux) par document')
+    parser.add_argument('--tables', type=float, default=0.2, help='Part des blocs qui sont des tableaux (0-1)')
+    parser.add_argument('--run-chars', type=int, default=12,
+                        help='Longueur moyenne des runs : plus petit = texte plus fragmenté (0 = un run par paragraphe)')
+    parser.add_argument('--media-kb', type=int, default=0, help='Taille de l\'image embarquée par document, en Ko')
+    parser.add_argument('--match-ratio', type=float, default=0.2, help='Part des documents contenant des termes')
+    parser.add_argument('--lots', type=int, default=60, help='Lots disponibles (prospectus)')
+    parser.add_argument('--reservations', type=int, default=20000, help='Réservations (relevés, devis)')
+    parser.add_argument('--payments-per-res', type=int, default=10, help='Paiements moyens par réservation')
+    parser.add_argument('--quotes', type=int, default=100, help='Devis rendus par quotes_batch')
+    parser.add_argument('--seed', type=int, default=2026)
+    parser.add_argument('--phases', help=f"Phases à exécuter, séparées par des virgules (défaut : {','.join(PHASES)})")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Processus pour les phases parallélisables')
+    parser.add_argument('--work', default=str(DEFAULT_WORK), help='Dossier de travail (corpus en cache)')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Fichier JSON de référence')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Dégradation tolérée, en fraction (défaut : {DEFAULT_THRESHOLD})')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Exécutions par phase, la plus rapide est retenue (défaut : {DEFAULT_REPEAT})')
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help=f'Plancher des durées comparées, en secondes (défaut : {DEFAULT_MIN_SECONDS})')
+    parser.add_argument('--save-baseline', action='store_true', help='Enregistrer la mesure comme nouvelle référence')
+    parser.add_argument('--output', help='Écrire aussi la mesure courante dans ce fichier JSON')
+    parser.add_argument('--run-phase', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    work = Path(args.work)
+    if args.run_phase:
+        result = run_phase(args.run_phase, Path(args.corpus), work / 'scratch' / args.run_phase, args.jobs)
+        print(RESULT_MARKER + json.dumps(result))
+        return 0
+
+    phases = args.phases.split(',') if args.phases else PHASES
+    unknown = [p for p in phases if p not in PHASES]
+    if unknown:
+        parser.error(f"phase(s) inconnue(s) : {', '.join(unknown)}")
+
+    params = corpus_params(args)
+    t0 = time.perf_counter()
+    corpus = build_corpus(work, params)
+    print(f'✅ Corpus : {corpus} ({time.perf_counter() - t0:.1f} s)')
+
+    current = {
+        'version': BASELINE_VERSION,
+        'params': params,
+        'jobs': args.jobs,
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'cpus': os.cpu_count()},
+        'phases': {},
+    }
+    for name in phases:
+        print(f'  … {name}', flush=True)
+        current['phases'][name] = run_phase_repeated(name, corpus, work, args.jobs, args.repeat)
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    print_table(current, baseline)
+    cur_speed, ref_speed = calibration_seconds(current), calibration_seconds(baseline)
+    if cur_speed and ref_speed:
+        print(f'\n  Étalon : {cur_speed:.3f} s (réf. {ref_speed:.3f} s), '
+              f'soit une machine {ref_speed / cur_speed:.2f} fois plus rapide que la référence')
+    if baseline and _python_minor(current) != _python_minor(baseline):
+        print(f'  ⚠️  Python {_python_minor(current)} (réf. {_python_minor(baseline)}) : RSS non comparé')
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=1, ensure_ascii=False), encoding='utf-8')
+
+    status = 0
+    if not baseline and not args.save_baseline:
+        print(f'\n❌ Référence absente : {baseline_path} (relancez avec --save-baseline pour la créer)')
+        status = 2
+    elif not args.save_baseline:
+        if baseline.get('params') != params or baseline.get('jobs') != args.jobs:
+            print('\n⚠️  Paramètres différents de la référence : comparaison impossible '
+                  '(relancez avec les mêmes options ou --save-baseline)')
+            status = 2
+        elif not calibration_seconds(baseline):
+            print('\n❌ Référence sans étalon : durées non comparables entre machines '
+                  '(réenregistrez-la avec --save-baseline)')
+            status = 2
+        else:
+            regressions = compare(current, baseline, args.threshold, args.min_seconds)
+            for phase, key, old, new, change in regressions:
+                print(f'❌ {phase} — {key} : {old} → {new} ({change:+.0%})')
+            if regressions:
+                status = 1
+            else:
+                print(f'\n✅ Aucune régression au-delà de {args.threshold:.0%} '
+                      f'(durées sous {args.min_seconds} s au plancher)')
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        current['recorded_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        baseline_path.write_text(json.dumps(current, indent=1, ensure_ascii=False), encoding='utf-8')
+        print(f'\n✅ Référence enregistrée : {baseline_path}')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
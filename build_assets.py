@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Empreintes, précompression et manifeste de précache du site
+
+Pour chaque ressource statique (pages HTML, js/, css/, locales/, assets/,
+manifest.webmanifest), écrit dans build/ une copie nommée par son contenu
+(build/js/app-api.<hash>.js) et ses variantes précompressées .gz (et .br
+si le module brotli est installé), en parallèle. Une copie déjà présente
+n'est pas réécrite : à contenu identique, même nom, même date. Les
+fichiers des générations antérieures à la précédente sont supprimés.
+
+Le manifeste build/precache-manifest.<hash>.json associe chaque URL du
+site à sa copie empreintée ; service-worker.js le référence (constante
+PRECACHE_MANIFEST, réécrite ici). Le service worker met en cache les
+copies par empreinte : après un déploiement, seules les ressources dont
+l'empreinte a changé sont retéléchargées.
+
+Les pages HTML sont d'abord minifiées (minify_pages.py) dans
+build/pages/<page>.html et empreintées pour le service worker ; une page
+dont la taille dépasse son budget (deploy/budgets.json) fait échouer le
+build.
+
+build/pages-sources.json associe chaque page à l'empreinte de la source
+dont sa copie minifiée est issue. nginx (infra/nginx.conf) sert
+build/pages/ à la place des pages sources. Vercel sert un fichier existant
+avant d'appliquer les rewrites : le build Vercel (scripts/vercel-output.js)
+assemble donc dans dist/ un site où chaque page est remplacée par sa copie
+minifiée, si celle-ci correspond encore à la source.
+
+Usage :
+    python3 build_assets.py [--jobs N] [--no-brotli] [--no-minify] [--budgets FICHIER]
+"""
+
+import re
+import sys
+import json
+import gzip
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from minify_pages import build_page, load_budgets
+
+try:
+    import brotli
+except ImportError:  # module optionnel : variantes .br omises
+    brotli = None
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BUILD_DIR = SCRIPT_DIR / 'build'
+SERVICE_WORKER = SCRIPT_DIR / 'service-worker.js'
+BUDGETS = SCRIPT_DIR / 'deploy' / 'budgets.json'
+PAGES_DIR = 'pages'  # build/pages/<page>.html : pages minifiées servies sous leur URL d'origine
+PAGE_SOURCES = 'pages-sources.json'  # build/pages-sources.json : {page : empreinte de la source minifiée}
+MANIFEST_PREFIX = 'precache-manifest'
+MANIFEST_VERSION = 1
+
+# Ressources empreintées (motifs relatifs à la racine du site)
+ASSET_GLOBS = ('*.html', 'manifest.webmanifest', 'js/*.js', 'css/*.css', 'locales/site-*.json', 'locales/pages/*.json', 'assets/*')
+# Préchargées à l'installation du service worker ; les autres sont mises en cache au premier accès
+PRECACHE = {
+    'index.html', '404.html', 'manifest.webmanifest',
+    'css/app.css', 'css/index.css',
+    'js/app-api.js', 'js/runtime-config.js', 'js/utils.js', 'js/site-i18n.js',
+    'js/pwa-install.js', 'js/chatbot-widget.js',
+    'locales/pages/index.fr.json', 'assets/favicon.svg',
+}
+# Déjà compressés : pas de variante
+NO_COMPRESS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.ico', '.woff', '.woff2'}
+MIN_GAIN = 0.9  # variante écrite seulement si elle fait moins de 90 % de l'original
+
+_SW_MANIFEST_RE = re.compile(r"^(const PRECACHE_MANIFEST = ).*?;$", re.M)
+
+
+def rev(data):
+    """Empreinte courte (12 caractères hexadécimaux) d'un contenu."""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def hashed_name(rel, digest):
+    """js/app-api.js → js/app-api.<empreinte>.js"""
+    p = Path(rel)
+    return (p.parent / f'{p.stem}.{digest}{p.suffix}').as_posix()
+
+
+def _write_if_missing(path, data):
+    if path.exists():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name('.~' + path.name)
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return True
+
+
+def _compressors(use_brotli):
+    variants = [('gzip', '.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if use_brotli and brotli is not None:
+        variants.append(('br', '.br', lambda d: brotli.compress(d, quality=11)))
+    return variants
+
+
+def write_page(path, data, use_brotli=True):
+    """Écrit une page minifiée et ses variantes seulement si son contenu change ; renvoie le nombre de fichiers écrits."""
+    if path.exists() and path.read_bytes() == data:
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for _, suffix, compress in [(None, '', lambda d: d)] + _compressors(use_brotli):
+        target = path.with_name(path.name + suffix)
+        packed = compress(data)
+        if suffix and len(packed) >= len(data) * MIN_GAIN:
+            target.unlink(missing_ok=True)
+            continue
+        tmp = target.with_name('.~' + target.name)
+        tmp.write_bytes(packed)
+        tmp.replace(target)
+        written += 1
+    return written
+
+
+def build_asset(rel, root=SCRIPT_DIR, build_dir=BUILD_DIR, use_brotli=True, data=None):
+    """
+    Copie empreintée et variantes compressées d'une ressource (`data` :
+    contenu à utiliser à la place du fichier, par exemple la page minifiée).
+    Renvoie l'entrée du manifeste ({'url', 'rev', 'path', 'size', 'gzip', 'br',
+    'precache'}) et le nombre de fichiers écrits.
+    """
+    if data is None:
+        data = (root / rel).read_bytes()
+    digest = rev(data)
+    out_rel = hashed_name(rel, digest)
+    out = build_dir / out_rel
+    entry = {'url': '/' + rel, 'rev': digest, 'path': f'/{build_dir.name}/{out_rel}',
+             'size': len(data), 'gzip': None, 'br': None, 'precache': rel in PRECACHE}
+    written = int(_write_if_missing(out, data))
+    if Path(rel).suffix.lower() in NO_COMPRESS:
+        return entry, written
+
+    for key, suffix, compress in _compressors(use_brotli):
+        variant = out.with_name(out.name + suffix)
+        if variant.exists():
+            entry[key] = variant.stat().st_size
+            continue
+        packed = compress(data)
+        if len(packed) < len(data) * MIN_GAIN:
+            written += int(_write_if_missing(variant, packed))
+            entry[key] = len(packed)
+    return entry, written
+
+
+def discover(root=SCRIPT_DIR, globs=ASSET_GLOBS):
+    """Ressources du site, triées, sans doublon."""
+    found = set()
+    for pattern in globs:
+        found.update(p.relative_to(root).as_posix() for p in root.glob(pattern) if p.is_file())
+    return sorted(found)
+
+
+def _manifest_outputs(manifest):
+    """Fichiers de build/ listés par un manifeste (copies, variantes et manifeste lui-même)."""
+    try:
+        assets = json.loads(manifest.read_text(encoding='utf-8')).get('assets', [])
+    except (OSError, ValueError):
+        assets = []
+    outputs = {manifest.name}
+    for a in assets:
+        rel = a['path'].split('/', 2)[-1]
+        outputs.update({rel, rel + '.gz', rel + '.br'})
+    return outputs
+
+
+def stale_outputs(build_dir, current):
+    """
+    Fichiers des anciens manifestes à supprimer. La génération précédente
+    est conservée : les pages encore servies par l'ancien service worker
+    continuent de trouver leurs ressources pendant la mise à jour.
+    """
+    previous = sorted((m for m in build_dir.glob(f'{MANIFEST_PREFIX}.*.json') if m.name != current.name),
+                      key=lambda m: m.stat().st_mtime, reverse=True)
+    keep = _manifest_outputs(current)
+    for m in previous[:1]:
+        keep |= _manifest_outputs(m)
+    stale = set()
+    for m in previous[1:]:
+        stale |= _manifest_outputs(m)
+    return stale - keep
+
+
+def write_precache_manifest(entries, build_dir=BUILD_DIR):
+    """Écrit build/precache-manifest.<hash>.json ; renvoie (chemin, URL)."""
+    text = json.dumps({'v': MANIFEST_VERSION, 'assets': entries}, ensure_ascii=False,
+                      separators=(',', ':'), sort_keys=True)
+    name = f'{MANIFEST_PREFIX}.{rev(text.encode("utf-8"))}.json'
+    path = build_dir / name
+    _write_if_missing(path, text.encode('utf-8'))
+    return path, f'/{build_dir.name}/{name}'
+
+
+def point_service_worker(manifest_url, sw_path=SERVICE_WORKER):
+    """Réécrit PRECACHE_MANIFEST dans service-worker.js ; n'écrit que si la valeur change."""
+    js = sw_path.read_text(encoding='utf-8')
+    if not _SW_MANIFEST_RE.search(js):
+        raise ValueError(f'Constante PRECACHE_MANIFEST absente de {sw_path.name}')
+    updated = _SW_MANIFEST_RE.sub(lambda m: m.group(1) + json.dumps(manifest_url) + ';', js, count=1)
+    if updated == js:
+        return False
+    sw_path.write_text(updated, encoding='utf-8')
+    return True
+
+
+def build_pages(rels, root=SCRIPT_DIR, build_dir=BUILD_DIR, jobs=4, use_brotli=True, budgets=None, check_js=True):
+    """
+    Minifie les pages HTML dans build/pages/ (minify_pages.build_page),
+    supprime les pages qui n'existent plus et écrit build/pages-sources.json.
+    Renvoie ({page : octets minifiés}, rapports par page, fichiers écrits).
+    """
+    pages = [rel for rel in rels if rel.endswith('.html')]
+    pages_dir = build_dir / PAGES_DIR
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        built = list(pool.map(lambda rel: build_page(rel, root, check_js=check_js, budgets=budgets), pages))
+    written = sum(write_page(pages_dir / rel, data, use_brotli) for rel, (data, _) in zip(pages, built))
+    if pages_dir.is_dir():
+        live = set(pages)
+        for old in pages_dir.rglob('*'):
+            name = old.relative_to(pages_dir).as_posix()
+            if old.is_file() and re.sub(r'\.(gz|br)$', '', name) not in live:
+                old.unlink()
+    sources = json.dumps({rel: rev((root / rel).read_bytes()) for rel in pages}, indent=1, sort_keys=True)
+    sources_path = build_dir / PAGE_SOURCES
+    if not sources_path.exists() or sources_path.read_text(encoding='utf-8') != sources:
+        sources_path.parent.mkdir(parents=True, exist_ok=True)
+        sources_path.write_text(sources, encoding='utf-8')
+        written += 1
+    return {rel: data for rel, (data, _) in zip(pages, built)}, [report for _, report in built], written
+
+
+def build(root=SCRIPT_DIR, build_dir=BUILD_DIR, jobs=4, use_brotli=True, sw_path=SERVICE_WORKER,
+          minify=True, budgets_path=BUDGETS, check_js=True):
+    """
+    Étape de build complète : pages minifiées (si `minify`), copies
+    empreintées, manifeste. Renvoie {'entries', 'pages', 'over_budget',
+    'written', 'removed', 'manifest', 'sw_updated'}.
+    """
+    rels = discover(root)
+    minified, pages, written = {}, [], 0
+    if minify:
+        minified, pages, written = build_pages(rels, root, build_dir, jobs, use_brotli,
+                                               load_budgets(budgets_path), check_js)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(
+            lambda rel: build_asset(rel, root, build_dir, use_brotli, minified.get(rel)), rels))
+    entries = [entry for entry, _ in results]
+    manifest_path, manifest_url = write_precache_manifest(entries, build_dir)
+
+    removed = 0
+    for rel in stale_outputs(build_dir, manifest_path):
+        try:
+            (build_dir / rel).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    return {
+        'entries': entries,
+        'pages': pages,
+        'over_budget': [r['page'] for r in pages if r['over']],
+        'written': written + sum(n for _, n in results),
+        'removed': removed,
+        'manifest': manifest_path,
+        'sw_updated': point_service_worker(manifest_url, sw_path),
+    }
+
+
+def page_report(pages):
+    """Lignes du rapport de minification : taille avant/après, gzip, budget."""
+    lines = []
+    for r in pages:
+        budget = r['budget']
+        limits = ' / '.join(f"{budget[k] // 1024} Ko{' gz' if k == 'gzip' else ''}" for k in ('bytes', 'gzip') if budget.get(k))
+        icon = '❌' if r['over'] else '✅'
+        saved = 100 - 100 * r['after'] // max(1, r['before'])
+        line = (f"{icon} {r['page']:<28} {r['before'] / 1024:7.1f} Ko → {r['after'] / 1024:7.1f} Ko (-{saved} %)"
+                f", {r['gzip'] / 1024:5.1f} Ko gz" + (f"  budget {limits}" if limits else ''))
+        if r['critical']:
+            line += f"  CSS critique {r['critical']['critical_bytes'] / 1024:.1f}/{r['critical']['full_bytes'] / 1024:.1f} Ko"
+        if r['scripts_kept']:
+            line += f"  ⚠️  {r['scripts_kept']} script(s) non minifié(s)"
+        lines.append(line)
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TERRASOCIAL — Empreintes et précompression des ressources')
+    parser.add_argument('--jobs', '-j', type=int, default=4, help='Ressources traitées en parallèle (défaut : 4)')
+    parser.add_argument('--no-brotli', action='store_true', help='Ne pas produire de variantes .br')
+    parser.add_argument('--no-minify', action='store_true', help='Empreinter les pages telles quelles, sans minification')
+    parser.add_argument('--budgets', type=Path, default=BUDGETS, metavar='FICHIER',
+                        help='Budgets par page en octets (défaut : deploy/budgets.json)')
+    args = parser.parse_args(argv)
+
+    result = build(jobs=args.jobs, use_brotli=not args.no_brotli, minify=not args.no_minify,
+                   budgets_path=args.budgets)
+    for line in page_report(result['pages']):
+        print(line)
+    entries = result['entries']
+    raw = sum(e['size'] for e in entries)
+    gz = sum(e['gzip'] or e['size'] for e in entries)
+    pre = [e for e in entries if e['precache']]
+    print(f"✅ {len(entries)} ressources empreintées — {raw // 1024} Ko, {gz // 1024} Ko en gzip"
+          + ('' if brotli is None or args.no_brotli else
+             f", {sum(e['br'] or e['gzip'] or e['size'] for e in entries) // 1024} Ko en brotli"))
+    if brotli is None and not args.no_brotli:
+        print('⚠️  Module brotli absent : variantes .br omises (pip install brotli)')
+    print(f"✅ Précache : {len(pre)} ressources, {sum(e['gzip'] or e['size'] for e in pre) // 1024} Ko transférés (gzip)")
+    print(f"✅ {result['written']} fichier(s) écrit(s), {result['removed']} obsolète(s) supprimé(s) dans build/")
+    print(f"✅ {result['manifest'].relative_to(SCRIPT_DIR)} — service-worker.js "
+          f"{'mis à jour' if result['sw_updated'] else 'déjà à jour'}")
+    if result['over_budget']:
+        print(f"❌ Budget dépassé : {', '.join(result['over_budget'])}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
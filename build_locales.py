@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Traductions par page (locales/pages/)
+
+js/site-i18n.js chargeait locales/site-<langue>.json en entier sur chaque
+page. Ce build relève, pour chaque page qui charge site-i18n.js, les clés
+qu'elle utilise réellement :
+
+- attributs data-i18n, data-i18n-html, -placeholder, -title, -aria ;
+- appels i18n.t('…') / translate('…') des scripts de la page (en ligne
+  et js/*.js locaux) ;
+- meta.title et meta.description, appliqués à toutes les pages.
+
+Il écrit un paquet par page et par langue, locales/pages/<page>.<langue>.json,
+limité à ces clés ; site-i18n.js le charge en priorité et se rabat sur le
+fichier complet si le paquet manque ou si une clé demandée n'y figure pas
+(paquet périmé, clé construite à l'exécution). Une clé utilisée mais
+absente d'une langue fait échouer le build (--check : en CI et à chaque
+déploiement) ; les clés qu'aucune page n'utilise sont signalées, et
+retirées des fichiers complets avec --prune.
+
+Usage :
+    python3 build_locales.py [--check] [--prune]
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+LOCALES_DIR = SCRIPT_DIR / 'locales'
+BUNDLE_DIR = LOCALES_DIR / 'pages'
+SOURCE_PREFIX = 'site-'
+# Clés lues par updatePageContent() sur toutes les pages
+ALWAYS_KEYS = ('meta.title', 'meta.description')
+
+_I18N_SCRIPT_RE = re.compile(r'<script\b[^>]*\bsrc="(?:\./)?js/site-i18n\.js"', re.I)
+_ATTR_KEY_RE = re.compile(r'\bdata-i18n(?:-html|-placeholder|-title|-aria)?\s*=\s*"([^"]+)"')
+_CALL_KEY_RE = re.compile(r'\b(?:i18n\.t|translate)\(\s*([\'"])([\w.-]+)\1')
+_SCRIPT_SRC_RE = re.compile(r'<script\b[^>]*\bsrc="(?:\./)?(js/[\w.-]+\.js)"', re.I)
+
+_MISSING = object()
+
+
+def languages(locales_dir=LOCALES_DIR):
+    """{langue : arbre de traductions} des fichiers complets site-<langue>.json."""
+    return {p.stem[len(SOURCE_PREFIX):]: json.loads(p.read_text(encoding='utf-8'))
+            for p in sorted(locales_dir.glob(f'{SOURCE_PREFIX}*.json'))}
+
+
+def i18n_pages(root=SCRIPT_DIR):
+    """Pages HTML qui chargent js/site-i18n.js."""
+    return [p.name for p in sorted(root.glob('*.html'))
+            if _I18N_SCRIPT_RE.search(p.read_text(encoding='utf-8'))]
+
+
+def page_keys(html, root=SCRIPT_DIR):
+    """Clés de traduction utilisées par une page (attributs et appels des scripts)."""
+    keys = set(ALWAYS_KEYS)
+    keys.update(_ATTR_KEY_RE.findall(html))
+    sources = [html]
+    for src in _SCRIPT_SRC_RE.findall(html):
+        if src != 'js/site-i18n.js' and (root / src).exists():
+            sources.append((root / src).read_text(encoding='utf-8'))
+    for text in sources:
+        keys.update(key for _, key in _CALL_KEY_RE.findall(text))
+    return keys
+
+
+def _child(node, part):
+    if isinstance(node, dict):
+        return node.get(part, _MISSING)
+    if isinstance(node, list) and part.isdigit() and int(part) < len(node):
+        return node[int(part)]
+    return _MISSING
+
+
+def lookup(tree, key):
+    """Valeur de `key` ('hero.stats.lots.label', 'howItWorks.steps.0.title') ou _MISSING."""
+    node = tree
+    for part in key.split('.'):
+        node = _child(node, part)
+        if node is _MISSING:
+            return _MISSING
+    return node
+
+
+def subset(tree, keys):
+    """
+    Sous-arbre limité à `keys`. Les listes deviennent des objets indexés
+    ({"0": …}) : site-i18n.js les parcourt de la même façon.
+    """
+    out = {}
+    for key in sorted(keys):
+        value = lookup(tree, key)
+        if value is _MISSING:
+            continue
+        parts = key.split('.')
+        node = out
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    return out
+
+
+def leaf_keys(node, prefix=''):
+    """Chemins de toutes les chaînes de l'arbre."""
+    items = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else None
+    if items is None:
+        return [prefix]
+    paths = []
+    for k, v in items:
+        paths.extend(leaf_keys(v, f'{prefix}.{k}' if prefix else str(k)))
+    return paths
+
+
+def _used(path, used):
+    """Vrai si `path` est une clé utilisée, ou se trouve sous/au-dessus d'une clé utilisée."""
+    return any(path == k or path.startswith(k + '.') or k.startswith(path + '.') for k in used)
+
+
+def prune(node, used, prefix=''):
+    """
+    Copie de l'arbre sans les clés inutilisées. Une liste dont un élément
+    est utilisé est gardée entière : retirer des éléments décalerait les
+    indices des clés (howItWorks.steps.3.title).
+    """
+    if isinstance(node, dict):
+        out = {}
+        for k, v in node.items():
+            path = f'{prefix}.{k}' if prefix else k
+            if _used(path, used):
+                out[k] = prune(v, used, path)
+        return out
+    return node
+
+
+def missing_keys(trees, keys):
+    """{langue : [clés absentes ou qui ne sont pas du texte]}."""
+    missing = {}
+    for lang, tree in trees.items():
+        absent = sorted(k for k in keys if not isinstance(lookup(tree, k), (str, int, float)))
+        if absent:
+            missing[lang] = absent
+    return missing
+
+
+def _write_if_changed(path, data):
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name('.~' + path.name)
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return True
+
+
+def _dump(tree, compact):
+    if compact:
+        return json.dumps(tree, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return (json.dumps(tree, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+
+
+def build_bundles(root=SCRIPT_DIR, locales_dir=LOCALES_DIR, bundle_dir=BUNDLE_DIR, write=True, prune_sources=False):
+    """
+    Paquets par page et par langue. Renvoie {'pages': {page: nb de clés},
+    'bundles': [(chemin, octets, octets du fichier complet)], 'missing':
+    {page: {langue: [clés]}}, 'dead': [clés inutilisées], 'written',
+    'removed', 'pruned'}. Rien n'est écrit si une clé manque.
+    """
+    trees = languages(locales_dir)
+    full_sizes = {lang: (locales_dir / f'{SOURCE_PREFIX}{lang}.json').stat().st_size for lang in trees}
+    result = {'pages': {}, 'bundles': [], 'missing': {}, 'dead': [], 'written': 0, 'removed': 0, 'pruned': []}
+    planned = {}
+    used = set()
+    for page in i18n_pages(root):
+        keys = page_keys((root / page).read_text(encoding='utf-8'), root)
+        used |= keys
+        result['pages'][page] = len(keys)
+        missing = missing_keys(trees, keys)
+        if missing:
+            result['missing'][page] = missing
+        for lang, tree in trees.items():
+            planned[bundle_dir / f'{Path(page).stem}.{lang}.json'] = (_dump(subset(tree, keys), True), full_sizes[lang])
+
+    result['dead'] = sorted({path for tree in trees.values() for path in leaf_keys(tree) if not _used(path, used)})
+    result['bundles'] = [(path, len(data), full) for path, (data, full) in planned.items()]
+    if not write or result['missing']:
+        return result
+
+    for path, (data, _) in planned.items():
+        result['written'] += _write_if_changed(path, data)
+    if bundle_dir.is_dir():
+        for old in bundle_dir.glob('*.json'):
+            if old not in planned:
+                old.unlink()
+                result['removed'] += 1
+    if prune_sources and result['dead']:
+        for lang, tree in trees.items():
+            path = locales_dir / f'{SOURCE_PREFIX}{lang}.json'
+            if _write_if_changed(path, _dump(prune(tree, used), False)):
+                result['pruned'].append(path.name)
+    return result
+
+
+def report(result):
+    """Lignes du rapport : paquets, clés manquantes, clés inutilisées."""
+    lines = []
+    for path, size, full in result['bundles']:
+        lines.append(f"✅ {path.relative_to(SCRIPT_DIR).as_posix():<32} {size / 1024:5.1f} Ko "
+                     f"(fichier complet {full / 1024:.1f} Ko)")
+    for page, langs in result['missing'].items():
+        for lang, keys in langs.items():
+            lines.append(f"❌ {page} [{lang}] : {len(keys)} clé(s) manquante(s) — {', '.join(keys[:8])}"
+                         + (' …' if len(keys) > 8 else ''))
+    if result['dead']:
+        lines.append(f"⚠️  {len(result['dead'])} clé(s) utilisée(s) par aucune page"
+                     + (f" — retirées de {', '.join(result['pruned'])}" if result['pruned'] else ' (--prune pour les retirer)'))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Paquets de traductions par page et par langue')
+    parser.add_argument('--check', action='store_true', help="Vérifier les clés sans rien écrire")
+    parser.add_argument('--prune', action='store_true',
+                        help='Retirer des fichiers locales/site-*.json les clés utilisées par aucune page')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Lister les clés inutilisées')
+    args = parser.parse_args(argv)
+
+    result = build_bundles(write=not args.check, prune_sources=args.prune)
+    for line in report(result):
+        print(line)
+    if args.verbose:
+        for key in result['dead']:
+            print(f"   • {key}")
+    if result['missing']:
+        print("❌ Clés manquantes : aucun paquet écrit")
+        return 1
+    if not args.check:
+        print(f"✅ {len(result['pages'])} page(s), {result['written']} paquet(s) écrit(s), "
+              f"{result['removed']} obsolète(s) supprimé(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Grille précalculée du simulateur de paiement (index.html)
+
+Calcule au build, avec les mêmes formules que simulatorFigures() dans
+index.html, toutes les combinaisons lot disponible × fréquence de versement
+(montant du versement, mensualité, versements journaliers par mois,
+équivalent journalier). La durée est celle du contrat de chaque lot
+(duration_months) : la page n'en propose pas d'autre pour un lot donné. La grille est écrite en JSON compact et empreinté
+(build/simulator-grid.<hash>.json) et, avec --inline, injectée dans la balise
+<script id="simulator-grid"> de index.html : le simulateur s'affiche alors
+sans attendre /api/public/lots. L'injection exige une source explicite
+(--lots : export ou base de la table available_lots) : les lots initiaux du
+backend remplaceraient sinon les options statiques du simulateur. Sans
+grille injectée, la page garde ses options statiques.
+
+--check compare chaque cellule au code JavaScript de la page exécuté sous
+Node.js (bloc <simulator-formulas>) et échoue à la moindre divergence ; la
+grille n'est alors pas injectée. DEPLOY.py --build-assets --lots SOURCE lance
+les deux (--inline --check) avant build_assets.py.
+
+Usage :
+    python3 build_simulator_grid.py [--lots SOURCE] [--inline] [--check]
+    python3 build_simulator_grid.py --lots SOURCE --inline --check
+"""
+
+import re
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+from pricing import MIN_DAILY, SIM_FREQ_MULTIPLIERS, mensualite, versements_par_mois
+from lots_source import DEFAULT_MAX_AGE, load_lots
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BUILD_DIR = SCRIPT_DIR / 'build'
+INDEX_HTML = SCRIPT_DIR / 'index.html'
+GRID_PREFIX = 'simulator-grid'
+GRID_VERSION = 2
+
+_INLINE_RE = re.compile(r'(<script type="application/json" id="simulator-grid">)(.*?)(</script>)', re.S)
+_FORMULAS_RE = re.compile(r'// <simulator-formulas>[^\n]*\n(.*?)// </simulator-formulas>', re.S)
+
+
+def figures(lot, freq):
+    """Miroir Python de simulatorFigures() : [montant, mensualité, versements/mois, équivalent journalier]."""
+    monthly = mensualite(lot['price'], lot['duration_months'], lot['monthly_amount'])
+    daily = lot['daily'] or MIN_DAILY
+    return [
+        daily * SIM_FREQ_MULTIPLIERS.get(freq, 1),
+        monthly,
+        versements_par_mois(monthly),
+        -(-monthly // 30),
+    ]
+
+
+def build_grid(lots):
+    """Grille complète : grid[lot][fréquence] = figures(...)."""
+    grid_lots = [{
+        'id': lot['id'],
+        'title': lot['title'],
+        'price': lot['price'],
+        # Comme les options construites depuis /api/public/lots : pas de data-daily, base minimale
+        'daily': MIN_DAILY,
+        'monthly_amount': lot['monthly_amount'] or 0,
+        'duration_months': lot['duration_months'] or 24,
+    } for lot in lots]
+    frequencies = list(SIM_FREQ_MULTIPLIERS)
+    return {
+        'v': GRID_VERSION,
+        'frequencies': frequencies,
+        'lots': grid_lots,
+        'grid': [[figures(lot, f) for f in frequencies] for lot in grid_lots],
+    }
+
+
+def serialize(grid):
+    """JSON compact et déterministe ; renvoie (texte, empreinte sur 12 caractères hexadécimaux)."""
+    text = json.dumps(grid, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return text, hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+
+def write_fingerprinted(text, digest, build_dir=BUILD_DIR):
+    """Écrit build/simulator-grid.<hash>.json et supprime les anciennes versions."""
+    build_dir.mkdir(parents=True, exist_ok=True)
+    target = build_dir / f'{GRID_PREFIX}.{digest}.json'
+    for stale in build_dir.glob(f'{GRID_PREFIX}.*.json'):
+        if stale != target:
+            stale.unlink()
+    if not target.exists():
+        target.write_text(text, encoding='utf-8')
+    return target
+
+
+def inline_into(html_path, text):
+    """Injecte la grille dans index.html ; n'écrit le fichier que s'il change."""
+    html = html_path.read_text(encoding='utf-8')
+    if not _INLINE_RE.search(html):
+        raise ValueError(f'Balise <script id="simulator-grid"> absente de {html_path.name}')
+    safe = text.replace('</', '<\\/')
+    updated = _INLINE_RE.sub(lambda m: m.group(1) + safe + m.group(3), html, count=1)
+    if updated == html:
+        return False
+    html_path.write_text(updated, encoding='utf-8')
+    return True
+
+
+_NODE_CHECK = r"""
+const grid = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+%s
+const mismatches = [];
+grid.lots.forEach((lot, li) => grid.frequencies.forEach((f, fi) => {
+    const js = simulatorFigures(lot, f);
+    const got = [js.amount, js.monthly, js.versementsParMois, js.dailyEquivalent];
+    const want = grid.grid[li][fi];
+    if (got.some((v, k) => v !== want[k])) mismatches.push({ lot: lot.id, freq: f, js: got, python: want });
+}));
+process.stdout.write(JSON.stringify(mismatches));
+"""
+
+
+def check_parity(text, html_path=INDEX_HTML):
+    """Exécute les formules JS de la page sous Node.js et renvoie la liste des divergences."""
+    m = _FORMULAS_RE.search(html_path.read_text(encoding='utf-8'))
+    if not m:
+        raise ValueError(f'Bloc // <simulator-formulas> absent de {html_path.name}')
+    result = subprocess.run(['node', '-e', _NODE_CHECK % m.group(1)], input=text,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def build(source=None, inline=False, check=False, max_age=DEFAULT_MAX_AGE,
+          html_path=INDEX_HTML, build_dir=BUILD_DIR):
+    """Grille des lots de `source` → build/simulator-grid.<hash>.json, contrôle de parité et injection.
+
+    `inline` exige une `source` (voir lots_source.py) : une grille des lots
+    initiaux du backend n'est jamais injectée (ValueError). Le contrôle
+    (Node.js) passe avant l'injection : une grille qui diverge du JavaScript
+    de la page n'est jamais écrite dans index.html. Renvoie un dict (target,
+    cells, bytes, mismatches, inlined : None si non demandé).
+    """
+    if inline and not source:
+        raise ValueError("Grille non injectée : précisez la source des lots (--lots), "
+                         "les lots par défaut remplaceraient les options statiques du simulateur")
+    grid = build_grid(load_lots(source, max_age=max_age))
+    text, digest = serialize(grid)
+    result = {
+        'target': write_fingerprinted(text, digest, build_dir),
+        'cells': len(grid['lots']) * len(grid['frequencies']),
+        'bytes': len(text.encode('utf-8')),
+        'mismatches': check_parity(text, html_path) if check else [],
+        'inlined': None,
+    }
+    if inline and not result['mismatches']:
+        result['inlined'] = inline_into(html_path, text)
+    return result
+
+
+def report(result):
+    """Lignes de compte rendu (CLI et DEPLOY.py --build-assets)."""
+    lines = [f"✅ {result['target'].relative_to(SCRIPT_DIR)} — {result['cells']} combinaisons, {result['bytes']} octets"]
+    for m in result['mismatches'][:20]:
+        lines.append(f"❌ lot {m['lot']} / {m['freq']} : JS {m['js']} ≠ Python {m['python']}")
+    if result['inlined'] is not None:
+        lines.append(f"✅ index.html {'mis à jour' if result['inlined'] else 'déjà à jour'}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TERRASOCIAL — Grille précalculée du simulateur')
+    parser.add_argument('--lots', metavar='SOURCE',
+                        help='Lots disponibles : export JSON, base SQLite ou dump .sql (défaut : lots du backend)')
+    parser.add_argument('--lots-max-age', type=int, default=DEFAULT_MAX_AGE)
+    parser.add_argument('--inline', action='store_true', help='Injecter la grille dans index.html')
+    parser.add_argument('--check', action='store_true', help='Contrôle de parité avec le JavaScript de la page (Node.js)')
+    args = parser.parse_args(argv)
+
+    if args.inline and not args.lots:
+        parser.error('--inline : --lots SOURCE requis (lots réels de la table available_lots)')
+    result = build(args.lots, inline=args.inline, check=args.check, max_age=args.lots_max_age)
+    for line in report(result):
+        print(line)
+    if result['mismatches']:
+        return 1
+    if args.check:
+        print(f"✅ Parité JS/Python vérifiée ({result['cells']} combinaisons)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
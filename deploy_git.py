@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Étape git du déploiement (DEPLOY.py)
+
+Commandes de plomberie groupées, dans cet ordre :
+
+1. `git ls-remote` : si la branche distante pointe déjà sur HEAD (ou sur
+   un ancêtre de HEAD), pas de `git pull --rebase`.
+2. Les fichiers déployés sont indexés dans une copie de l'index, écrite
+   sous .git/index.lock (le verrou de git : aucune autre commande ne peut
+   modifier l'index pendant ce temps), puis `git write-tree`.
+3. Si l'arbre obtenu est celui de HEAD, rien n'est commité ; sinon
+   `git commit-tree` + `git update-ref`, et la copie remplace l'index.
+4. `git push` seulement si la branche distante ne pointe pas déjà sur HEAD.
+
+Le dépôt distant est un paramètre (nom de remote, chemin ou URL) : un dépôt
+nu local peut le remplacer pour tester le déploiement.
+"""
+
+import os
+import time
+import shutil
+import subprocess
+from pathlib import Path
+
+STALE_LOCK_SECONDS = 600
+
+
+class GitError(RuntimeError):
+    """Commande git en échec ou dépôt dans un état inattendu."""
+
+
+class Git:
+    """Exécute git dans `repo` et chronomètre chaque commande."""
+
+    def __init__(self, repo):
+        self.repo = Path(repo)
+        self.timings = []  # [(commande, secondes)]
+
+    def _run(self, args, env=None):
+        t0 = time.perf_counter()
+        r = subprocess.run(['git', *args], cwd=self.repo, env=env, capture_output=True, text=True)
+        self.timings.append((f'git {args[0]}', time.perf_counter() - t0))
+        return r
+
+    def run(self, *args, env=None):
+        """Sortie de la commande ; GitError si elle échoue."""
+        r = self._run(args, env)
+        if r.returncode != 0:
+            raise GitError(f'git {args[0]} : {(r.stderr or r.stdout).strip()[:300]}')
+        return r.stdout.strip()
+
+    def ok(self, *args, env=None):
+        """Vrai si la commande réussit (code de sortie 0)."""
+        return self._run(args, env).returncode == 0
+
+
+def check_index_lock(git, git_dir, max_age=STALE_LOCK_SECONDS):
+    """
+    Supprime .git/index.lock s'il est plus ancien que `max_age` secondes
+    (commande git interrompue) ; un verrou récent signale une commande git
+    en cours : GitError. Renvoie l'âge du verrou supprimé, ou None.
+    """
+    lock = git_dir / 'index.lock'
+    try:
+        age = time.time() - lock.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if age < max_age:
+        raise GitError(f'index.lock récent ({age:.0f} s) : une autre commande git est peut-être en cours')
+    lock.unlink()
+    return age
+
+
+def sync_with_remote(git, remote, branch, head):
+    """
+    Rebase sur la branche distante seulement si elle a avancé.
+    Renvoie (action, sha distant) ; action vaut 'à jour', 'en avance',
+    'rebasé' ou 'absente' (branche inexistante sur le dépôt distant).
+    """
+    out = git.run('ls-remote', remote, f'refs/heads/{branch}')
+    remote_sha = out.split()[0] if out else None
+    if remote_sha is None:
+        return 'absente', None
+    if remote_sha == head:
+        return 'à jour', remote_sha
+    if git.ok('merge-base', '--is-ancestor', remote_sha, 'HEAD'):
+        return 'en avance', remote_sha
+    git.run('pull', '--rebase', remote, branch)
+    return 'rebasé', remote_sha
+
+
+def commit_paths(git, git_dir, paths, message):
+    """
+    Commite `paths` (et ce qui est déjà indexé) si l'arbre résultant diffère
+    de celui de HEAD. Renvoie (sha du nouveau commit ou None si rien ne
+    change, HEAD après l'opération).
+    """
+    head, head_tree = git.run('rev-parse', 'HEAD', 'HEAD^{tree}').split()
+    index = git_dir / 'index'
+    lock = git_dir / 'index.lock'
+    fd = os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        with os.fdopen(fd, 'wb') as fh, open(index, 'rb') as src:
+            shutil.copyfileobj(src, fh)
+        env = {**os.environ, 'GIT_INDEX_FILE': str(lock)}
+        git.run('add', '--', *paths, env=env)
+        tree = git.run('write-tree', env=env)
+        if tree == head_tree:
+            lock.unlink()
+            return None, head
+        commit = git.run('commit-tree', tree, '-p', head, '-m', message)
+        git.run('update-ref', '-m', f'deploy: {message.splitlines()[0]}', 'HEAD', commit, head)
+        os.replace(lock, index)
+        return commit, commit
+    except BaseException:
+        try:
+            lock.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def start_deploy(repo, remote='origin', branch=None):
+    """
+    Avant les correctifs : verrou périmé, puis rebase sur la branche distante
+    si elle a avancé. Renvoie le contexte à passer à finish_deploy() ; un
+    rebase impossible (copie de travail modifiée…) est noté dans 'sync_error'.
+    """
+    git = Git(repo)
+    git_dir, head, ref = git.run('rev-parse', '--absolute-git-dir', 'HEAD', '--symbolic-full-name', 'HEAD').split('\n')
+    git_dir = Path(git_dir)
+    if not branch and not ref.startswith('refs/heads/'):
+        raise GitError('HEAD détachée : précisez la branche distante')
+    ctx = {'git': git, 'git_dir': git_dir, 'remote': remote,
+           'branch': branch or ref[len('refs/heads/'):],
+           'lock': check_index_lock(git, git_dir), 'sync_error': None}
+    try:
+        ctx['sync'], ctx['remote_sha'] = sync_with_remote(git, remote, ctx['branch'], head)
+    except GitError as e:
+        ctx['sync'], ctx['remote_sha'], ctx['sync_error'] = 'échec', None, str(e)
+    return ctx
+
+
+def finish_deploy(ctx, paths, message, push=True):
+    """
+    Après les correctifs : commit si l'arbre change, push si la branche
+    distante n'est pas déjà sur HEAD. Renvoie {'commit', 'pushed'} ;
+    'commit' vaut None lorsque le déploiement ne change rien.
+    """
+    git = ctx['git']
+    commit, head = commit_paths(git, ctx['git_dir'], paths, message)
+    pushed = False
+    if push and head != ctx['remote_sha']:
+        git.run('push', ctx['remote'], f'HEAD:refs/heads/{ctx["branch"]}')
+        pushed = True
+    return {'commit': commit, 'pushed': pushed}
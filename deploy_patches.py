@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Moteur de correctifs de déploiement (DEPLOY.py)
+
+Les correctifs sont décrits dans un jeu de correctifs JSON
+(deploy/patches.json) : chaque correctif remplace un texte exact, son
+« ancre », par un nouveau texte dans un ou plusieurs fichiers (chemins ou
+motifs glob relatifs à la racine du dépôt). "old" et "new" s'écrivent en
+chaîne ou en liste de lignes.
+
+Pour chaque fichier, toutes les ancres qui le concernent sont compilées en
+une seule expression régulière : le fichier est lu et parcouru une seule
+fois, quel que soit le nombre de correctifs. Une ancre doit apparaître
+exactement "count" fois (1 par défaut), sinon le fichier n'est pas modifié.
+
+Idempotence : un correctif est « déjà appliqué » lorsque son nouveau texte
+est présent et que son ancre ne l'est plus (comparaison exacte). L'empreinte
+sha256 de chaque fichier après passage est mémorisée dans un fichier d'état
+(deploy/.patch_state.json) : un fichier inchangé depuis le dernier passage,
+pour le même jeu de correctifs, n'est pas réanalysé.
+"""
+
+import os
+import re
+import json
+import difflib
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ENGINE_VERSION = 1
+STATE_VERSION = 1
+
+# Statuts d'un correctif dans un fichier
+APPLIED = 'appliqué'
+ALREADY = 'déjà appliqué'
+MISSING = 'introuvable'
+AMBIGUOUS = 'ambigu'
+CONFLICT = 'conflit'
+
+
+class PatchError(ValueError):
+    """Jeu de correctifs invalide."""
+
+
+def _joined(value):
+    return '\n'.join(value) if isinstance(value, list) else (value or '')
+
+
+def load_patchset(path):
+    """Lit et valide un jeu de correctifs ; renvoie la liste des correctifs normalisés."""
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    patches = []
+    seen = set()
+    for i, raw in enumerate(data.get('patches', []), 1):
+        pid = raw.get('id') or f'#{i}'
+        if pid in seen:
+            raise PatchError(f'Identifiant de correctif en double : {pid}')
+        seen.add(pid)
+        files = raw.get('files') or ([raw['file']] if raw.get('file') else [])
+        old, new = _joined(raw.get('old')), _joined(raw.get('new'))
+        if not files or not old:
+            raise PatchError(f'{pid} : "files" et "old" sont obligatoires')
+        if old == new:
+            raise PatchError(f'{pid} : "old" et "new" sont identiques')
+        patches.append({
+            'id': pid,
+            'description': raw.get('description', ''),
+            'files': files,
+            'old': old,
+            'new': new,
+            'count': int(raw.get('count', 1)),
+        })
+    return patches
+
+
+def resolve_files(patches, root):
+    """{chemin relatif : [correctifs]} ; motifs glob développés, ordre du jeu de correctifs conservé."""
+    by_file = {}
+    for patch in patches:
+        for pattern in patch['files']:
+            if any(ch in pattern for ch in '*?['):
+                matches = sorted(p.relative_to(root).as_posix() for p in root.glob(pattern) if p.is_file())
+            else:
+                matches = [pattern]
+            for rel in matches:
+                targets = by_file.setdefault(rel, [])
+                if patch not in targets:
+                    targets.append(patch)
+    return by_file
+
+
+def fingerprint(patches):
+    """Empreinte des correctifs visant un fichier : change dès qu'une ancre ou un remplacement change."""
+    h = hashlib.sha256(f'v{ENGINE_VERSION}\n'.encode('utf-8'))
+    for p in patches:
+        h.update(json.dumps([p['id'], p['old'], p['new'], p['count']], ensure_ascii=False).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def apply_to_text(text, patches):
+    """
+    Applique `patches` à `text` en un seul balayage.
+    Renvoie (nouveau texte, {id : statut}) ; le texte est renvoyé inchangé
+    si une ancre est ambiguë (nombre d'occurrences différent de "count").
+    """
+    statuses = {}
+    active = {}
+    for p in patches:
+        if p['old'] in p['new'] and p['new'] in text:
+            # L'ancre fait partie du nouveau texte : le nouveau texte présent suffit à conclure
+            statuses[p['id']] = ALREADY
+        elif p['old'] in active:
+            statuses[p['id']] = CONFLICT
+        else:
+            active[p['old']] = p
+    if not active:
+        return text, statuses
+
+    pattern = re.compile('|'.join(re.escape(old) for old in sorted(active, key=len, reverse=True)))
+    matches = list(pattern.finditer(text))
+    counts = dict.fromkeys(active, 0)
+    for m in matches:
+        counts[m.group(0)] += 1
+
+    for old, p in active.items():
+        n = counts[old]
+        if n == 0:
+            statuses[p['id']] = ALREADY if p['new'] in text else MISSING
+        elif n != p['count']:
+            statuses[p['id']] = AMBIGUOUS
+        else:
+            statuses[p['id']] = APPLIED
+    if AMBIGUOUS in statuses.values() or not matches:
+        return text, statuses
+
+    pieces, pos = [], 0
+    for m in matches:
+        pieces.append(text[pos:m.start()])
+        pieces.append(active[m.group(0)]['new'])
+        pos = m.end()
+    pieces.append(text[pos:])
+    return ''.join(pieces), statuses
+
+
+def write_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(prefix='.~', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def patch_file(root, rel, patches, previous=None, dry_run=False):
+    """
+    Applique les correctifs d'un fichier. Renvoie {'file', 'status', 'patches',
+    'diff', 'state'} ; status vaut 'modifié', 'sans changement', 'inchangé'
+    (empreinte identique au dernier passage), 'absent' ou 'erreur'.
+    """
+    result = {'file': rel, 'status': 'sans changement', 'patches': {}, 'diff': '', 'state': None}
+    path = root / rel
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        result['status'] = 'absent'
+        return result
+    digest = hashlib.sha256(data).hexdigest()
+    patchset = fingerprint(patches)
+    if previous and previous.get('patchset') == patchset and previous.get('sha256') == digest:
+        result.update(status='inchangé', patches=previous.get('patches', {}), state=previous)
+        return result
+
+    text = data.decode('utf-8')
+    new_text, statuses = apply_to_text(text, patches)
+    result['patches'] = statuses
+    if AMBIGUOUS in statuses.values() or CONFLICT in statuses.values():
+        result['status'] = 'erreur'
+        return result
+
+    if new_text != text:
+        result['status'] = 'modifié'
+        new_data = new_text.encode('utf-8')
+        if dry_run:
+            result['diff'] = ''.join(difflib.unified_diff(
+                text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+                f'a/{rel}', f'b/{rel}'))
+        else:
+            write_atomic(path, new_data)
+        digest = hashlib.sha256(new_data).hexdigest()
+    # Au prochain passage, les correctifs appliqués ici seront en place
+    recorded = {pid: ALREADY if status == APPLIED else status for pid, status in statuses.items()}
+    result['state'] = {'patchset': patchset, 'sha256': digest, 'patches': recorded}
+    return result
+
+
+def load_state(path):
+    try:
+        state = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return state.get('files', {}) if state.get('version') == STATE_VERSION else {}
+
+
+def save_state(path, files):
+    Path(path).write_text(json.dumps({'version': STATE_VERSION, 'files': files}, indent=1, sort_keys=True),
+                          encoding='utf-8')
+
+
+def apply_patchset(patchset_path, root, state_path=None, jobs=4, dry_run=False):
+    """
+    Applique un jeu de correctifs aux fichiers de `root`, un fichier par
+    tâche. Renvoie les résultats de patch_file() dans l'ordre des fichiers ;
+    l'état n'est mis à jour que hors --dry-run.
+    """
+    root = Path(root)
+    by_file = resolve_files(load_patchset(patchset_path), root)
+    state = load_state(state_path) if state_path else {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(
+            lambda item: patch_file(root, item[0], item[1], state.get(item[0]), dry_run),
+            by_file.items()))
+    if state_path and not dry_run:
+        for r in results:
+            if r['state']:
+                state[r['file']] = r['state']
+        save_state(state_path, state)
+    return results
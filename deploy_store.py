@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Magasin adressé par contenu des fichiers déployés (DEPLOY.py)
+
+Les pages livrées telles quelles par le déploiement sont rangées dans
+deploy/store/<sha256>. Le manifeste deploy/files.json associe chaque
+chemin cible à l'empreinte de son contenu :
+
+    {"version": 1, "files": {"cgv.html": "5120ad8c…", …}}
+
+Au déploiement, un fichier n'est réécrit (fichier temporaire puis
+renommage) que si l'empreinte du fichier en place diffère de celle du
+manifeste : les fichiers inchangés gardent leur date de modification et
+les caches (CDN, service worker) restent valides.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+
+from deploy_patches import write_atomic
+
+MANIFEST_VERSION = 1
+
+
+class StoreError(ValueError):
+    """Manifeste invalide ou objet du magasin absent ou corrompu."""
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(path):
+    """{chemin cible : sha256} du manifeste."""
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+    if data.get('version') != MANIFEST_VERSION:
+        raise StoreError(f'{Path(path).name} : version de manifeste non prise en charge')
+    return data.get('files', {})
+
+
+def save_manifest(path, files):
+    Path(path).write_text(json.dumps({'version': MANIFEST_VERSION, 'files': dict(sorted(files.items()))},
+                                     indent=2) + '\n', encoding='utf-8')
+
+
+def read_object(store, digest):
+    """Contenu de l'objet `digest`, vérifié contre son empreinte."""
+    try:
+        data = (Path(store) / digest).read_bytes()
+    except FileNotFoundError:
+        raise StoreError(f'Objet {digest[:12]} absent du magasin') from None
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise StoreError(f'Objet {digest[:12]} corrompu')
+    return data
+
+
+def sync_from_store(store, manifest_path, root, dry_run=False):
+    """
+    Écrit sous `root` les fichiers du manifeste dont le contenu diffère.
+    Renvoie [(chemin, 'écrit' | 'à écrire' (dry_run) | 'identique')] dans
+    l'ordre du manifeste.
+    """
+    root = Path(root)
+    results = []
+    for rel, digest in load_manifest(manifest_path).items():
+        target = root / rel
+        if target.exists() and sha256_file(target) == digest:
+            results.append((rel, 'identique'))
+            continue
+        data = read_object(store, digest)
+        if dry_run:
+            results.append((rel, 'à écrire'))
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            write_atomic(target, data)
+        else:
+            target.write_bytes(data)
+        results.append((rel, 'écrit'))
+    return results
+
+
+def capture(store, manifest_path, root, names):
+    """
+    Range le contenu actuel de `names` (chemins relatifs à `root`) dans le
+    magasin et met le manifeste à jour ; un objet déjà présent mais corrompu
+    est réécrit, les objets qui ne sont plus référencés sont supprimés.
+    Renvoie {chemin : sha256} des fichiers capturés.
+    """
+    store, root = Path(store), Path(root)
+    store.mkdir(parents=True, exist_ok=True)
+    files = load_manifest(manifest_path)
+    captured = {}
+    for rel in names:
+        data = (root / rel).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        obj = store / digest
+        if not obj.exists():
+            obj.write_bytes(data)
+        elif sha256_file(obj) != digest:
+            write_atomic(obj, data)
+        files[rel] = captured[rel] = digest
+    save_manifest(manifest_path, files)
+    referenced = set(files.values())
+    for obj in store.iterdir():
+        if obj.is_file() and obj.name not in referenced:
+            obj.unlink()
+    return captured
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Moteur de substitution des anciens documents Word
+
+Compile une fois la table TEXT_REPLACEMENTS (et les FLAG_TERMS) de
+update_documents.py en une seule expression régulière insensible à la casse,
+construite en arbre de préfixes : un seul balayage du texte d'un paragraphe
+trouve toutes les règles, la plus longue l'emportant à position égale, quel
+que soit le nombre de règles.
+
+Les occurrences sont ensuite replacées sur les « runs » Word, y compris
+lorsqu'un terme est coupé entre plusieurs runs (mise en forme, correcteur
+orthographique…) : le texte de remplacement prend la mise en forme du run
+où commence l'occurrence, la suite de l'occurrence est retirée des runs
+suivants.
+
+Casse du remplacement : texte identique à la règle → remplacement tel quel ;
+tout en minuscules → remplacement en minuscules ; tout en majuscules →
+remplacement en majuscules ; sinon, première lettre alignée.
+"""
+
+import re
+import hashlib
+import zipfile
+from xml.etree.ElementTree import ParseError, iterparse
+
+FLAG_MESSAGE = 'Terme "{}" trouvé (vérification manuelle conseillée)'
+
+W_URI = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_NS = '{' + W_URI + '}'
+# Parties XML portant le texte d'un document Word
+TEXT_PARTS_RE = re.compile(r'word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$')
+
+
+def _trie_pattern(terms):
+    """Expression régulière en arbre de préfixes pour `terms` (déjà en minuscules).
+
+    Les quantificateurs gourmands font que l'occurrence la plus longue
+    l'emporte à une position donnée, comme une alternance triée par longueur,
+    sans essayer chaque terme un par un.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+def match_case(matched, old, new):
+    """Remplacement de `old` par `new`, ajusté à la casse du texte trouvé."""
+    if matched == old:
+        return new
+    if matched == matched.lower():
+        return new.lower()
+    if matched == matched.upper():
+        return new.upper()
+    if matched[:1].isupper():
+        return new[:1].upper() + new[1:]
+    return new
+
+
+class RuleSet:
+    """Règles de substitution et termes à signaler, compilés une fois."""
+
+    def __init__(self, replacements, flag_terms=()):
+        self.replacements = list(replacements)
+        self.flag_terms = list(flag_terms)
+
+        # (ancien, nouveau, description) par ancien texte en minuscules ; la première règle l'emporte
+        self._rules = {}
+        for old, new, desc in self.replacements:
+            self._rules.setdefault(old.lower(), (old, new, desc))
+        self._replace_re = re.compile(_trie_pattern(self._rules), re.IGNORECASE) if self._rules else None
+
+        # Termes à signaler : premier terme déclaré par forme en minuscules
+        self._flags = {}
+        for term in self.flag_terms:
+            self._flags.setdefault(term.lower(), term)
+        # Un terme trouvé implique tous les termes qu'il contient (même s'ils se chevauchent)
+        self._implied = {
+            key: [other for other in self._flags if other in key]
+            for key in self._flags
+        }
+        self._flag_re = re.compile('(?=(' + _trie_pattern(self._flags) + '))', re.IGNORECASE) if self._flags else None
+
+        # Terme quelconque (remplacement ou signalement) : pré-analyse des documents
+        terms = set(self._rules) | set(self._flags)
+        self._any_re = re.compile(_trie_pattern(terms), re.IGNORECASE) if terms else None
+
+    @property
+    def version(self):
+        """Empreinte de la table de règles : change dès qu'une règle est ajoutée ou modifiée."""
+        h = hashlib.sha256()
+        for old, new, desc in self.replacements:
+            h.update(f'R\0{old}\0{new}\0{desc}\n'.encode('utf-8'))
+        for term in self.flag_terms:
+            h.update(f'F\0{term}\n'.encode('utf-8'))
+        return h.hexdigest()[:16]
+
+    def find(self, text):
+        """Occurrences [(début, fin, remplacement, description)] dans `text`, sans chevauchement."""
+        if self._replace_re is None:
+            return []
+        hits = []
+        for m in self._replace_re.finditer(text):
+            rule = self._rules.get(m.group(0).lower())
+            if rule is None:
+                continue
+            old, new, desc = rule
+            hits.append((m.start(), m.end(), match_case(m.group(0), old, new), desc))
+        return hits
+
+    def rewrite(self, texts):
+        """
+        Applique les règles à une suite de runs (leurs textes).
+        Renvoie (nouveaux textes ou None si rien ne change, descriptions
+        des règles appliquées dans l'ordre d'apparition).
+        """
+        joined = ''.join(texts)
+        hits = self.find(joined)
+        if not hits:
+            return None, []
+
+        starts = []
+        pos = 0
+        for text in texts:
+            starts.append(pos)
+            pos += len(text)
+
+        new_texts = []
+        h = 0
+        for text, a in zip(texts, starts):
+            b = a + len(text)
+            pieces, pos = [], a
+            while h < len(hits) and hits[h][0] < b:
+                s, e, repl, _ = hits[h]
+                if s >= pos:
+                    # L'occurrence commence dans ce run : il reçoit le remplacement
+                    pieces.append(joined[pos:s])
+                    pieces.append(repl)
+                if e > b:
+                    # Elle se poursuit dans le run suivant
+                    pos = b
+                    break
+                pos = max(pos, e)
+                h += 1
+            pieces.append(joined[pos:b])
+            new_texts.append(''.join(pieces))
+
+        descs = list(dict.fromkeys(hit[3] for hit in hits))
+        return new_texts, descs
+
+    def flags(self, text):
+        """Termes à signaler présents dans `text`, dans l'ordre de FLAG_TERMS."""
+        if self._flag_re is None:
+            return []
+        found = set()
+        for m in self._flag_re.finditer(text):
+            found.update(self._implied.get(m.group(1).lower(), ()))
+        return [term for key, term in self._flags.items() if key in found]
+
+    def can_match(self, text):
+        """Vrai si `text` contient au moins un terme (remplacement ou signalement)."""
+        return self._any_re is not None and self._any_re.search(text) is not None
+
+
+def paragraph_texts(stream):
+    """Texte de chaque paragraphe (w:t, tabulations et sauts de ligne des runs) d'une partie XML, lue en flux."""
+    stack = []
+    runs = 0
+    for event, elem in iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == W_NS + 'p':
+                stack.append([])
+            elif tag == W_NS + 'r':
+                runs += 1
+            continue
+        if tag == W_NS + 'p':
+            yield ''.join(stack.pop())
+            elem.clear()
+        elif tag == W_NS + 'r':
+            runs -= 1
+        elif stack and runs:
+            if tag == W_NS + 't':
+                if elem.text:
+                    stack[-1].append(elem.text)
+            elif tag == W_NS + 'tab':
+                stack[-1].append('\t')
+            elif tag in (W_NS + 'br', W_NS + 'cr'):
+                stack[-1].append('\n')
+
+
+def docx_may_match(path, rules):
+    """
+    Pré-analyse d'un .docx sans le charger dans python-docx : parcourt en flux
+    word/document.xml, les en-têtes/pieds de page et les notes, paragraphe par paragraphe,
+    et s'arrête au premier terme trouvé. Faux seulement si aucun paragraphe ne
+    peut correspondre ; un fichier illisible renvoie Vrai pour que l'erreur
+    soit signalée par le traitement complet.
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                if not TEXT_PARTS_RE.match(name):
+                    continue
+                with zf.open(name) as part:
+                    for text in paragraph_texts(part):
+                        if rules.can_match(text):
+                            return True
+    except (OSError, zipfile.BadZipFile, ParseError, KeyError):
+        return True
+    return False
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Réécriture en flux des anciens documents Word (--backend stream)
+
+Alternative à python-docx pour update_documents.py : seules les parties XML
+contenant du texte (document, en-têtes, pieds de page, notes) et où une
+règle de substitution s'applique sont relues par un analyseur SAX
+incrémental et réécrites au fil de l'eau. Les événements ne sont mis en
+mémoire que le temps d'un paragraphe (w:p). Tous les autres membres du zip
+(images, styles, polices…) sont recopiés octet pour octet, sans
+décompression ni recompression : la mémoire reste bornée quelle que soit la
+taille du document. Cette copie brute passe par des attributs internes de
+zipfile (fp, start_dir, NameToInfo, ZipInfo.FileHeader) ; s'ils manquent
+dans la version de Python, le membre est recopié par l'API publique
+(décompression puis recompression).
+
+Les commentaires XML et instructions de traitement des parties réécrites
+sont conservés (LexicalHandler, processingInstruction).
+
+Les règles appliquées sont celles de docx_rules.RuleSet, sur les mêmes
+textes de paragraphe que le moteur python-docx (w:t des runs, tabulations
+et sauts de ligne compris).
+"""
+
+import os
+import shutil
+import struct
+import zipfile
+import tempfile
+from xml.sax import make_parser
+from xml.sax.handler import (ContentHandler, LexicalHandler, feature_namespaces, feature_external_ges,
+                             property_lexical_handler)
+from xml.sax.saxutils import escape, quoteattr
+
+from docx_rules import FLAG_MESSAGE, TEXT_PARTS_RE, W_URI, paragraph_texts
+
+CHUNK = 1 << 16
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_DATA_DESCRIPTOR_FLAG = 0x08
+_SEPARATORS = {'tab': '\t', 'br': '\n', 'cr': '\n'}
+
+
+class _Segment:
+    """Texte d'un w:t (modifiable) ou d'un séparateur tab/br (figé) dans un paragraphe."""
+    __slots__ = ('text', 'event')
+
+    def __init__(self, text, event=None):
+        self.text = text
+        self.event = event  # événement 'start' du w:t ; None pour un séparateur
+
+
+class _RewriteHandler(ContentHandler, LexicalHandler):
+    """Recopie une partie XML en appliquant les règles paragraphe par paragraphe."""
+
+    def __init__(self, write, rules):
+        super().__init__()
+        self.write = write
+        self.rules = rules
+        self.names = None
+        self.separators = None
+        self.pending_start = False
+        self.events = None       # événements du paragraphe de premier niveau en cours
+        self.paragraphs = []     # segments des paragraphes ouverts (imbrication : zones de texte)
+        self.run_depth = 0
+        self.text_segment = None
+        self.modifications = []
+        self.flagged = []
+        self.changed = False
+
+    # ── Écriture ──────────────────────────────────────────────────────────
+    def _close_start(self):
+        if self.pending_start:
+            self.write('>')
+            self.pending_start = False
+
+    def _emit(self, event):
+        kind = event[0]
+        if kind == 'start':
+            self._close_start()
+            self.write('<' + event[1] + ''.join(f' {k}={quoteattr(v)}' for k, v in event[2].items()))
+            self.pending_start = True
+        elif kind == 'end':
+            if self.pending_start:
+                self.write('/>')
+                self.pending_start = False
+            else:
+                self.write(f'</{event[1]}>')
+        elif kind == 'raw':
+            self._close_start()
+            self.write(event[1])
+        else:
+            text = event[1].text if kind == 'segment' else event[1]
+            if text:
+                self._close_start()
+                self.write(escape(text))
+
+    def _push(self, event):
+        if self.events is not None:
+            self.events.append(event)
+        else:
+            self._emit(event)
+
+    # ── Noms qualifiés de WordprocessingML ────────────────────────────────
+    def _resolve_names(self, attrs):
+        prefix = next((k[6:] for k, v in attrs.items() if k.startswith('xmlns:') and v == W_URI), None)
+        if prefix is None and attrs.get('xmlns') == W_URI:
+            prefix = ''
+        q = (prefix + ':') if prefix else ''
+        self.names = {'p': q + 'p', 'r': q + 'r', 't': q + 't'}
+        self.separators = {q + tag: text for tag, text in _SEPARATORS.items()}
+
+    # ── Événements SAX ────────────────────────────────────────────────────
+    def startDocument(self):
+        self.write(XML_DECLARATION)
+
+    def startElement(self, name, attrs):
+        if self.names is None:
+            self._resolve_names(attrs)
+        names = self.names
+        event = ['start', name, dict(attrs.items())]
+        if name == names['p']:
+            if self.events is None:
+                self.events = []
+            self.paragraphs.append([])
+        elif name == names['r']:
+            self.run_depth += 1
+        elif name == names['t'] and self.paragraphs and self.run_depth:
+            self.text_segment = _Segment('', event)
+            self.paragraphs[-1].append(self.text_segment)
+        elif name in self.separators and self.paragraphs and self.run_depth:
+            self.paragraphs[-1].append(_Segment(self.separators[name]))
+        self._push(event)
+
+    def characters(self, content):
+        if self.text_segment is not None:
+            if not self.text_segment.text:
+                self._push(('segment', self.text_segment))
+            self.text_segment.text += content
+        else:
+            self._push(('text', content))
+
+    def endElement(self, name):
+        names = self.names
+        if name == names['t'] and self.text_segment is not None:
+            self.text_segment = None
+        elif name == names['r']:
+            self.run_depth -= 1
+        self._push(('end', name))
+        if name == names['p']:
+            self._end_paragraph(self.paragraphs.pop())
+            if not self.paragraphs:
+                events, self.events = self.events, None
+                for event in events:
+                    self._emit(event)
+
+    def ignorableWhitespace(self, content):
+        self._push(('text', content))
+
+    def processingInstruction(self, target, data):
+        self._push(('raw', f'<?{target} {data}?>' if data else f'<?{target}?>'))
+
+    def comment(self, content):
+        self._push(('raw', f'<!--{content}-->'))
+
+    # ── Règles ───────────────────────────────────────────────────────────
+    def _end_paragraph(self, segments):
+        new_texts, descs = self.rules.rewrite([seg.text for seg in segments])
+        if new_texts is not None:
+            for seg, text in zip(segments, new_texts):
+                if seg.event is None or seg.text == text:
+                    continue
+                if not seg.text:
+                    # w:t vide jusque-là : son texte n'était pas encore un événement
+                    self._insert_segment(seg)
+                seg.text = text
+                if text != text.strip():
+                    seg.event[2]['xml:space'] = 'preserve'
+            self.changed = True
+            self.modifications.extend(d for d in descs if d not in self.modifications)
+        for term in self.rules.flags(''.join(seg.text for seg in segments)):
+            if term not in self.flagged:
+                self.flagged.append(term)
+
+    def _insert_segment(self, seg):
+        index = next(i for i, event in enumerate(self.events) if event is seg.event)
+        self.events.insert(index + 1, ('segment', seg))
+
+
+def _rewrite_part(src, dst, rules):
+    """Réécrit une partie XML de `src` (flux binaire) vers `dst` (flux binaire)."""
+    out = []
+    out_size = 0
+
+    def write(text):
+        nonlocal out_size
+        out.append(text)
+        out_size += len(text)
+        if out_size >= CHUNK:
+            dst.write(''.join(out).encode('utf-8'))
+            out.clear()
+            out_size = 0
+
+    handler = _RewriteHandler(write, rules)
+    parser = make_parser()
+    parser.setFeature(feature_namespaces, False)
+    parser.setFeature(feature_external_ges, False)
+    parser.setContentHandler(handler)
+    parser.setProperty(property_lexical_handler, handler)
+    for chunk in iter(lambda: src.read(CHUNK), b''):
+        parser.feed(chunk)
+    parser.close()
+    dst.write(''.join(out).encode('utf-8'))
+    return handler
+
+
+def _part_needs_rewrite(zf, info, rules):
+    """(une règle s'applique ?, termes signalés) pour une partie, lue en flux."""
+    flagged = []
+    with zf.open(info) as part:
+        for text in paragraph_texts(part):
+            if rules.find(text):
+                return True, []
+            flagged.extend(t for t in rules.flags(text) if t not in flagged)
+    return False, flagged
+
+
+def raw_copy_supported(dst_zf):
+    """Les internes de zipfile utilisés par copy_member_raw existent-ils dans cette version ?"""
+    return (all(hasattr(dst_zf, name) for name in ('fp', 'start_dir', 'filelist', 'NameToInfo'))
+            and callable(getattr(zipfile.ZipInfo, 'FileHeader', None)))
+
+
+def copy_member(src_zf, info, dst_zf):
+    """Recopie un membre par l'API publique de zipfile (décompression puis recompression)."""
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.create_system = info.create_system
+    zinfo.external_attr = info.external_attr
+    with src_zf.open(info) as part_in, dst_zf.open(zinfo, 'w') as part_out:
+        shutil.copyfileobj(part_in, part_out, CHUNK)
+
+
+def copy_member_raw(src_zf, src_fp, info, dst_zf):
+    """Recopie un membre compressé tel quel (en-tête local réécrit, données brutes)."""
+    src_fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(src_fp.read(_LOCAL_HEADER.size))
+    src_fp.seek(header[-2] + header[-1], os.SEEK_CUR)  # nom et champ extra du membre source
+
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.create_system = info.create_system
+    zinfo.external_attr = info.external_attr
+    zinfo.flag_bits = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG  # tailles connues : pas de descripteur
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+
+    dst_fp = dst_zf.fp
+    dst_fp.seek(dst_zf.start_dir)
+    zinfo.header_offset = dst_fp.tell()
+    dst_fp.write(zinfo.FileHeader())
+    remaining = info.compress_size
+    while remaining:
+        chunk = src_fp.read(min(CHUNK, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f'{info.filename} : données tronquées')
+        dst_fp.write(chunk)
+        remaining -= len(chunk)
+    dst_zf.start_dir = dst_fp.tell()
+    dst_zf.filelist.append(zinfo)
+    dst_zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def rewrite_docx(src_path, dst_path, rules):
+    """
+    Applique `rules` à un .docx en flux. N'écrit `dst_path` (fichier
+    temporaire puis renommage) que si au moins une règle s'applique.
+    Renvoie {'changed', 'modifications', 'flagged'} ; flagged contient les
+    messages de termes à signaler, comme le moteur python-docx.
+    """
+    with zipfile.ZipFile(src_path) as src_zf:
+        infos = src_zf.infolist()
+        plan = {}
+        flagged = []
+        for info in infos:
+            if TEXT_PARTS_RE.match(info.filename):
+                needed, terms = _part_needs_rewrite(src_zf, info, rules)
+                plan[info.filename] = needed
+                flagged.extend(t for t in terms if t not in flagged)
+        if not any(plan.values()):
+            return {'changed': False, 'modifications': [],
+                    'flagged': [FLAG_MESSAGE.format(t) for t in flagged]}
+
+        dst_dir = os.path.dirname(os.path.abspath(dst_path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.~', suffix='.docx', dir=dst_dir)
+        modifications = []
+        try:
+            with os.fdopen(fd, 'w+b') as tmp_fp, open(src_path, 'rb') as src_fp, \
+                    zipfile.ZipFile(tmp_fp, 'w') as dst_zf:
+                raw = raw_copy_supported(dst_zf)
+                for info in infos:
+                    if not plan.get(info.filename):
+                        if raw:
+                            copy_member_raw(src_zf, src_fp, info, dst_zf)
+                        else:
+                            copy_member(src_zf, info, dst_zf)
+                        continue
+                    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+                    zinfo.compress_type = zipfile.ZIP_DEFLATED
+                    zinfo.external_attr = info.external_attr
+                    with src_zf.open(info) as part_in, dst_zf.open(zinfo, 'w') as part_out:
+                        handler = _rewrite_part(part_in, part_out, rules)
+                    modifications.extend(d for d in handler.modifications if d not in modifications)
+                    flagged.extend(t for t in handler.flagged if t not in flagged)
+            os.replace(tmp_path, dst_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    return {'changed': True, 'modifications': modifications,
+            'flagged': [FLAG_MESSAGE.format(t) for t in flagged]}
+
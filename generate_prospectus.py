@@ -3,12 +3,49 @@
 TERRASOCIAL — Prospectus Commercial mis à jour (Février 2026)
 Nouveau modèle : Frais dossier 10 000 FCFA + versements mensuel/journalier
 Slogan : 2 bières par jour pour votre terrain titré !
+
+Usage :
+    python3 generate_prospectus.py [DOSSIER_SORTIE] [--lots export_lots.json|terrasocial.db|dump.sql]
+
+Langues (textes dans locales/prospectus-<langue>.json, un PDF par langue) :
+    python3 generate_prospectus.py DOSSIER --langs fr,en,es,de,zh [--jobs N]
+    python3 generate_prospectus.py DOSSIER --langs all
+Sans --jobs, toutes les langues sont rendues dans le même processus (ReportLab,
+styles et polices chargés une fois) ; avec --jobs N, sur N processus.
+
+Polices : famille TTF Unicode (DejaVu, Noto… ou Vera de ReportLab) enregistrée
+une fois par processus, métriques en cache disque (pdf_fonts.py, cache dans
+~/.cache/terrasocial/fonts) ; seuls les glyphes utilisés sont embarqués.
+
+Catalogue complet des lots (un bloc par lot, rendu en flux depuis un curseur,
+découpé en volumes de N pages) :
+    python3 generate_prospectus.py DOSSIER --catalogue --lots terrasocial.db [--volume-pages 200]
+
+Mode lot (devis personnalisés, un PDF par ligne, sur tous les cœurs) :
+    python3 generate_prospectus.py --batch reservations.csv --out-dir devis/ [--jobs N]
+    export.jsonl | python3 generate_prospectus.py --batch - --format json --out-dir devis/
+
+Utilisation en tant que module (processus « chaud », ReportLab importé une
+seule fois) :
+    from generate_prospectus import build_prospectus
+    build_prospectus(out='/tmp/Prospectus.pdf')
+    build_prospectus({'lots': [...]}, out='/tmp/Prospectus_lots.pdf')
+    build_prospectus(out='/tmp/Prospectus_en.pdf', lang='en')
 """
 
-import sys, os
+import sys, os, argparse, csv, functools, hashlib, itertools, json, re, time
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
-OUT_DIR = sys.argv[1] if len(sys.argv) > 1 else '/sessions/nice-quirky-tesla/mnt/Code_source'
-OUT_FILE = os.path.join(OUT_DIR, 'Prospectus_TERRASOCIAL_Fev2026.pdf')
+DEFAULT_OUT_DIR = '/sessions/nice-quirky-tesla/mnt/Code_source'
+OUT_NAME = 'Prospectus_TERRASOCIAL_Fev2026.pdf'
+OUT_DIR = DEFAULT_OUT_DIR
+OUT_FILE = os.path.join(OUT_DIR, OUT_NAME)
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+DEFAULT_LANG = 'fr'
+# Chinois : police TTF CJK installée (pdf_fonts.cjk_font) ou, à défaut, police CID
+# STSong-Light de ReportLab (non embarquée : rendue par la visionneuse)
+LANG_FONTS = {'zh': 'STSong-Light'}
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm, cm
@@ -18,7 +55,11 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer, Table,
                                  TableStyle, HRFlowable, PageBreak, KeepTogether)
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+
+import pdf_fonts
+from pricing import FRAIS_DOSSIER, MIN_DAILY, fcfa, mensualite, versements_par_mois
+from lots_source import DEFAULT_LOTS, DEFAULT_MAX_AGE, iter_lots, load_lots
 
 # ── Couleurs ────────────────────────────────────────────────────────────────
 GREEN       = colors.HexColor('#2E7D32')
@@ -40,9 +81,25 @@ MARGIN = 15 * mm
 CONTENT_W = W - 2 * MARGIN
 
 # ── Styles ───────────────────────────────────────────────────────────────────
+# Construits une seule fois à l'import : build_prospectus() les réutilise pour
+# chaque document rendu dans le même processus.
 styles = getSampleStyleSheet()
 
+# Police TTF Unicode (accents, symboles) à la place de chaque police standard,
+# enregistrée une fois par processus (pdf_fonts) ; {} : Helvetica conservée
+FONTS = pdf_fonts.text_fonts()
+EMOJI_FONT = pdf_fonts.emoji_font()
+if not EMOJI_FONT:
+    print(f"⚠️  Aucune police d'emoji trouvée ({', '.join(pdf_fonts.EMOJI_FONTS[:3])}…) : les emoji des titres "
+          "de section seront retirés du PDF. Déposez une police d'emoji TTF (Noto Emoji, licence OFL) "
+          "dans fonts/ ou $TERRASOCIAL_FONT_DIRS.", file=sys.stderr)
+
+def F(name):
+    return FONTS.get(name, name)
+
 def S(name, **kwargs):
+    if 'fontName' in kwargs:
+        kwargs['fontName'] = F(kwargs['fontName'])
     return ParagraphStyle(name, **kwargs)
 
 TITLE_STYLE = S('title', fontName='Helvetica-Bold', fontSize=28, textColor=WHITE,
@@ -76,8 +133,16 @@ SLOGAN_SUB = S('slogan_sub', fontName='Helvetica-Oblique', fontSize=11, textColo
 WARNING_STYLE = S('warn', fontName='Helvetica', fontSize=8, textColor=colors.HexColor('#555500'),
                   alignment=TA_LEFT, leading=11)
 
+MODE_MENSUEL_STYLE = S('mh', fontName='Helvetica-Bold', fontSize=13, textColor=GREEN, alignment=TA_CENTER)
+MODE_JOURNALIER_STYLE = S('mh2', fontName='Helvetica-Bold', fontSize=13, textColor=ORANGE_DARK, alignment=TA_CENTER)
+STEP_NUM_STYLE = S('step_num', fontName='Helvetica-Bold', fontSize=16, textColor=WHITE, alignment=TA_CENTER)
+
 def ts(*args):
-    return TableStyle(list(args))
+    commands = [(cmd[0], cmd[1], cmd[2], F(cmd[3]), *cmd[4:]) if cmd[0] == 'FONTNAME' else cmd for cmd in args]
+    if FONTS:
+        # Texte brut des cellules : Helvetica par défaut dans Table
+        commands.insert(0, ('FONTNAME', (0,0), (-1,-1), F('Helvetica')))
+    return TableStyle(commands)
 
 def box_table(content_rows, bg=GRAY_LIGHT, border_color=GRAY_MID):
     t = Table(content_rows, colWidths=[CONTENT_W])
@@ -94,97 +159,16 @@ def box_table(content_rows, bg=GRAY_LIGHT, border_color=GRAY_MID):
 def hr(color=GREEN_MID, thickness=1):
     return HRFlowable(width='100%', thickness=thickness, color=color, spaceAfter=4, spaceBefore=4)
 
-# ── Callbacks de page ────────────────────────────────────────────────────────
-def on_first_page(canvas, doc):
-    W, H = A4
-    # Fond header
-    canvas.setFillColor(GREEN_DARK)
-    canvas.rect(0, H - 60*mm, W, 60*mm, fill=1, stroke=0)
-    # Bande orange
-    canvas.setFillColor(ORANGE)
-    canvas.rect(0, H - 64*mm, W, 4*mm, fill=1, stroke=0)
-    # Logo texte
-    canvas.setFont('Helvetica-Bold', 32)
-    canvas.setFillColor(WHITE)
-    canvas.drawCentredString(W/2, H - 22*mm, 'TERRASOCIAL')
-    canvas.setFont('Helvetica', 12)
-    canvas.setFillColor(ORANGE_MID)
-    canvas.drawCentredString(W/2, H - 30*mm, 'par MANO VERDE INC SA')
-    # Slogan principal
-    canvas.setFont('Helvetica-Bold', 15)
-    canvas.setFillColor(WHITE)
-    canvas.drawCentredString(W/2, H - 42*mm, 'Devenez proprietaire de votre terrain au Cameroun')
-    canvas.setFont('Helvetica', 11)
-    canvas.setFillColor(ORANGE_MID)
-    canvas.drawCentredString(W/2, H - 50*mm, 'Paiement echelonne sur 12 a 36 mois | Des 1 500 FCFA/jour')
-    # Pied de page
-    canvas.setFillColor(GREEN_DARK)
-    canvas.rect(0, 0, W, 8*mm, fill=1, stroke=0)
-    canvas.setFont('Helvetica', 7)
-    canvas.setFillColor(WHITE)
-    canvas.drawCentredString(W/2, 2.5*mm,
-        'TERRASOCIAL - MANO VERDE INC SA | Yaounde, Cameroun | direction@manovende.com | +237 651 98 28 78')
-
-def on_later_page(canvas, doc):
-    W, H = A4
-    # Header compact
-    canvas.setFillColor(GREEN)
-    canvas.rect(0, H - 12*mm, W, 12*mm, fill=1, stroke=0)
-    canvas.setFont('Helvetica-Bold', 9)
-    canvas.setFillColor(WHITE)
-    canvas.drawString(MARGIN, H - 8*mm, 'TERRASOCIAL — MANO VERDE INC SA')
-    canvas.drawRightString(W - MARGIN, H - 8*mm, f'Page {doc.page}')
-    # Pied de page
-    canvas.setFillColor(GREEN_DARK)
-    canvas.rect(0, 0, W, 8*mm, fill=1, stroke=0)
-    canvas.setFont('Helvetica', 7)
-    canvas.setFillColor(WHITE)
-    canvas.drawCentredString(W/2, 2.5*mm,
-        'direction@manovende.com | +237 651 98 28 78 | Fevrier 2026')
-
-# ── Contenu ───────────────────────────────────────────────────────────────────
-story = []
-story.append(Spacer(1, 60*mm))  # espace pour le header first page
-
-# AVERTISSEMENT
-warning_data = [[Paragraph(
-    '<b>AVERTISSEMENT LEGAL :</b> TERRASOCIAL est un service de vente de terrains a paiement echelonne. '
-    'Ce service N\'est NI une banque, NI une microfinance, NI une tontine. Nous ne collectons pas d\'epargne '
-    'et n\'accordons pas de credit. (Reglement COBAC R-2021/01)',
-    WARNING_STYLE
-)]]
-warn_t = Table(warning_data, colWidths=[CONTENT_W])
-warn_t.setStyle(ts(
+# ── Styles de tableaux (partagés entre documents) ────────────────────────────
+WARN_TS = ts(
     ('BACKGROUND', (0,0), (-1,-1), colors.HexColor('#FFFDE7')),
     ('BOX', (0,0), (-1,-1), 1, colors.HexColor('#F9A825')),
     ('TOPPADDING', (0,0), (-1,-1), 6),
     ('BOTTOMPADDING', (0,0), (-1,-1), 6),
     ('LEFTPADDING', (0,0), (-1,-1), 10),
     ('RIGHTPADDING', (0,0), (-1,-1), 10),
-))
-story.append(warn_t)
-story.append(Spacer(1, 6*mm))
-
-# ── SECTION 1 : FRAIS DE DOSSIER MIS EN AVANT ────────────────────────────────
-story.append(hr(GREEN))
-story.append(Paragraph('📋  Ouverture de Dossier', H2_STYLE))
-
-dossier_data = [[
-    Table([[
-        [Paragraph('10 000 FCFA', BIG_ORANGE)],
-        [Paragraph('Frais d\'ouverture de dossier', BIG_GREEN)],
-        [Paragraph('Paiement unique a la souscription — aucun acompte en %', CENTER_BODY)],
-    ]], colWidths=[CONTENT_W * 0.48]),
-    Table([[
-        [Paragraph('Inclus :', H3_STYLE)],
-        [Paragraph('✅  Ouverture et traitement du dossier', BODY_STYLE)],
-        [Paragraph('✅  Blocage du lot a votre nom', BODY_STYLE)],
-        [Paragraph('✅  Remboursable sous 7 jours (droit de retractation)', BODY_STYLE)],
-        [Paragraph('✅  Aucun autre frais avant le debut des versements', BODY_STYLE)],
-    ]], colWidths=[CONTENT_W * 0.48]),
-]]
-dt = Table(dossier_data, colWidths=[CONTENT_W * 0.48, CONTENT_W * 0.52])
-dt.setStyle(ts(
+)
+DOSSIER_TS = ts(
     ('BACKGROUND', (0,0), (0,0), GREEN_LIGHT),
     ('BACKGROUND', (1,0), (1,0), GRAY_LIGHT),
     ('BOX', (0,0), (-1,-1), 0.5, GREEN_MID),
@@ -194,21 +178,8 @@ dt.setStyle(ts(
     ('LEFTPADDING', (0,0), (-1,-1), 10),
     ('RIGHTPADDING', (0,0), (-1,-1), 10),
     ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-))
-story.append(dt)
-story.append(Spacer(1, 6*mm))
-
-# ── SECTION 2 : SLOGAN 2 BIERES ──────────────────────────────────────────────
-slogan_data = [[
-    Paragraph('🍺🍺', BIG_ORANGE),
-    Paragraph(
-        '« Le prix de 2 bieres par jour\npour votre terrain titre ! »',
-        SLOGAN_STYLE
-    ),
-    Paragraph('2 bieres ≈ 1 500 FCFA/jour\nversement minimum journalier', SLOGAN_SUB),
-]]
-sl_t = Table([slogan_data], colWidths=[CONTENT_W * 0.12, CONTENT_W * 0.56, CONTENT_W * 0.32])
-sl_t.setStyle(ts(
+)
+SLOGAN_TS = ts(
     ('BACKGROUND', (0,0), (-1,-1), ORANGE_DARK),
     ('ROUNDEDCORNERS', [8,8,8,8]),
     ('TOPPADDING', (0,0), (-1,-1), 14),
@@ -217,31 +188,8 @@ sl_t.setStyle(ts(
     ('RIGHTPADDING', (0,0), (-1,-1), 8),
     ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
     ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-))
-story.append(sl_t)
-story.append(Spacer(1, 6*mm))
-
-# ── SECTION 3 : MODES DE VERSEMENT ───────────────────────────────────────────
-story.append(hr(GREEN))
-story.append(Paragraph('💳  Deux Modes de Versement au Choix', H2_STYLE))
-
-modes_data = [
-    [
-        Paragraph('📅  Mode MENSUEL', S('mh', fontName='Helvetica-Bold', fontSize=13, textColor=GREEN, alignment=TA_CENTER)),
-        Paragraph('🗓️  Mode JOURNALIER', S('mh2', fontName='Helvetica-Bold', fontSize=13, textColor=ORANGE_DARK, alignment=TA_CENTER)),
-    ],
-    [
-        Paragraph('Payez une fois par mois\nla mensualite convenue au contrat.', CENTER_BODY),
-        Paragraph('Versez chaque jour a partir de\n1 500 FCFA — sans attendre la fin du mois.', CENTER_BODY),
-    ],
-    [
-        Paragraph('✅  Mensualites sur 12, 24 ou 36 mois\n✅  Prelevement regulier\n✅  Calendrier precis', BODY_STYLE),
-        Paragraph('✅  A partir de 1 500 FCFA/jour\n✅  Paiements en avance acceptes\n✅  Orange Money / MTN MoMo 24h/7j', BODY_STYLE),
-    ],
-]
-mt = Table(modes_data, colWidths=[CONTENT_W * 0.49, CONTENT_W * 0.49],
-           spaceBefore=2, spaceAfter=2)
-mt.setStyle(ts(
+)
+MODES_TS = ts(
     ('BACKGROUND', (0,0), (0,-1), GREEN_LIGHT),
     ('BACKGROUND', (1,0), (1,-1), ORANGE_LIGHT),
     ('BOX', (0,0), (0,-1), 1, GREEN),
@@ -253,23 +201,8 @@ mt.setStyle(ts(
     ('VALIGN', (0,0), (-1,-1), 'TOP'),
     ('LINEBELOW', (0,0), (-1,-2), 0.5, GRAY_MID),
     ('LINEABOVE', (0,1), (-1,-1), 0.5, GRAY_MID),
-))
-story.append(mt)
-story.append(Spacer(1, 5*mm))
-
-# ── SECTION 4 : NOS LOTS ─────────────────────────────────────────────────────
-story.append(hr(GREEN))
-story.append(Paragraph('🏡  Nos Lots Disponibles', H2_STYLE))
-
-lots_header = ['Lot', 'Superficie', 'Prix Total', 'Mensualite (24m)', 'Journalier min.', 'Versements/mois']
-lots_data = [
-    ['Standard', '500 m²', '500 000 FCFA', '~21 000 FCFA', '1 500 FCFA', '14 j'],
-    ['Confort',  '750 m²', '750 000 FCFA', '~25 000 FCFA', '1 500 FCFA', '17 j'],
-    ['Premium', '1 000 m²','1 000 000 FCFA','~28 000 FCFA','1 500 FCFA', '19 j'],
-]
-col_w = [CONTENT_W * f for f in [0.14, 0.12, 0.19, 0.19, 0.18, 0.18]]
-lots_t = Table([lots_header] + lots_data, colWidths=col_w)
-lots_t.setStyle(ts(
+)
+LOTS_TS = ts(
     ('BACKGROUND', (0,0), (-1,0), GREEN),
     ('TEXTCOLOR', (0,0), (-1,0), WHITE),
     ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
@@ -281,28 +214,8 @@ lots_t.setStyle(ts(
     ('INNERGRID', (0,0), (-1,-1), 0.3, GRAY_MID),
     ('BOX', (0,0), (-1,-1), 0.5, GREEN),
     ('ROWBACKGROUNDS', (0,1), (-1,-1), [WHITE, GRAY_LIGHT]),
-))
-story.append(lots_t)
-story.append(Paragraph(
-    '<i>Les mensualites sont indicatives (lot standard, duree 24 mois). '
-    'Le versement journalier minimum de 1 500 FCFA est valable pour tous les lots.</i>',
-    ITALIC_STYLE
-))
-story.append(Spacer(1, 5*mm))
-
-# ── SECTION 5 : EXEMPLE CONCRET ──────────────────────────────────────────────
-story.append(hr(ORANGE))
-story.append(Paragraph('💡  Exemple Concret — Lot Standard 500m²', H2_STYLE))
-
-ex_data = [
-    ['Frais d\'ouverture de dossier (unique):', '10 000 FCFA'],
-    ['Prix total du lot:', '500 000 FCFA'],
-    ['Mensualite (plan 24 mois):', '~21 000 FCFA/mois'],
-    ['En mode journalier :', '14 versements de 1 500 FCFA = 1 mois paye'],
-    ['Paiement en avance :', '3 000 FCFA = 2 jours | 10 500 FCFA = 7 jours'],
-]
-ex_t = Table(ex_data, colWidths=[CONTENT_W * 0.55, CONTENT_W * 0.45])
-ex_t.setStyle(ts(
+)
+EXEMPLE_TS = ts(
     ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
     ('FONTNAME', (1,0), (1,-1), 'Helvetica'),
     ('FONTSIZE', (0,0), (-1,-1), 10),
@@ -316,51 +229,18 @@ ex_t.setStyle(ts(
     ('RIGHTPADDING', (0,0), (-1,-1), 10),
     ('INNERGRID', (0,0), (-1,-1), 0.3, GRAY_MID),
     ('BOX', (0,0), (-1,-1), 0.5, GREEN),
-))
-story.append(ex_t)
-story.append(Spacer(1, 5*mm))
-
-# ── SECTION 6 : PROCESSUS ────────────────────────────────────────────────────
-story.append(hr(GREEN))
-story.append(Paragraph('✅  Processus en 5 Etapes', H2_STYLE))
-
-steps = [
-    ('1', 'Choisissez votre lot', 'Parcourez nos lots disponibles sur le site ou sur demande a notre equipe.'),
-    ('2', 'Reservez en ligne', 'Remplissez le formulaire et payez 10 000 FCFA de frais de dossier pour bloquer votre lot.'),
-    ('3', 'Signez le contrat', 'Validez votre contrat de reservation avec le mode de versement et la duree choisis.'),
-    ('4', 'Payez a votre rythme', 'Versez chaque mois ou chaque jour via Orange Money / MTN MoMo — meme en avance !'),
-    ('5', 'Recevez votre titre', 'Apres paiement integral, recevez votre acte de cession et titre foncier.'),
-]
-for num, title, desc in steps:
-    step_data = [[
-        Paragraph(num, S(f's{num}', fontName='Helvetica-Bold', fontSize=16, textColor=WHITE, alignment=TA_CENTER)),
-        Table([
-            [Paragraph(title, H3_STYLE)],
-            [Paragraph(desc, BODY_STYLE)],
-        ], colWidths=[CONTENT_W * 0.82]),
-    ]]
-    st = Table(step_data, colWidths=[CONTENT_W * 0.10, CONTENT_W * 0.88], spaceBefore=2, spaceAfter=2)
-    st.setStyle(ts(
-        ('BACKGROUND', (0,0), (0,0), GREEN),
-        ('BACKGROUND', (1,0), (1,0), WHITE),
-        ('BOX', (0,0), (-1,-1), 0.3, GREEN_MID),
-        ('TOPPADDING', (0,0), (-1,-1), 6),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-        ('LEFTPADDING', (0,0), (-1,-1), 8),
-        ('RIGHTPADDING', (0,0), (-1,-1), 8),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-    ))
-    story.append(st)
-
-story.append(Spacer(1, 5*mm))
-
-# ── SECTION 7 : MOYENS DE PAIEMENT ───────────────────────────────────────────
-story.append(hr(GREEN))
-story.append(Paragraph('💳  Moyens de Paiement Acceptes', H2_STYLE))
-
-pay_data = [['🟠 Orange Money', '🟡 MTN Mobile Money', '🏦 Virement Bancaire', '💳 Carte Bancaire', '💵 Especes']]
-pay_t = Table(pay_data, colWidths=[CONTENT_W / 5] * 5)
-pay_t.setStyle(ts(
+)
+STEP_TS = ts(
+    ('BACKGROUND', (0,0), (0,0), GREEN),
+    ('BACKGROUND', (1,0), (1,0), WHITE),
+    ('BOX', (0,0), (-1,-1), 0.3, GREEN_MID),
+    ('TOPPADDING', (0,0), (-1,-1), 6),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+    ('LEFTPADDING', (0,0), (-1,-1), 8),
+    ('RIGHTPADDING', (0,0), (-1,-1), 8),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+)
+PAY_TS = ts(
     ('FONTNAME', (0,0), (-1,-1), 'Helvetica-Bold'),
     ('FONTSIZE', (0,0), (-1,-1), 9),
     ('ALIGN', (0,0), (-1,-1), 'CENTER'),
@@ -370,23 +250,8 @@ pay_t.setStyle(ts(
     ('INNERGRID', (0,0), (-1,-1), 0.5, GRAY_MID),
     ('BOX', (0,0), (-1,-1), 0.5, GREEN),
     ('ROWBACKGROUNDS', (0,0), (-1,-1), [GRAY_LIGHT]),
-))
-story.append(pay_t)
-story.append(Spacer(1, 5*mm))
-
-# ── SECTION 8 : CONTACT ──────────────────────────────────────────────────────
-story.append(hr(ORANGE))
-story.append(Paragraph('📞  Nous Contacter', H2_STYLE))
-
-contact_data = [
-    [Paragraph('Site web', H3_STYLE), Paragraph('social.manovende.com', BODY_STYLE)],
-    [Paragraph('Email', H3_STYLE), Paragraph('direction@manovende.com | infos@manoverde.com', BODY_STYLE)],
-    [Paragraph('Telephone', H3_STYLE), Paragraph('+237 651 98 28 78 | +237 696 87 58 95', BODY_STYLE)],
-    [Paragraph('WhatsApp', H3_STYLE), Paragraph('+237 651 98 28 78', BODY_STYLE)],
-    [Paragraph('Adresse', H3_STYLE), Paragraph('Yaounde, Cameroun — Quartier Odza', BODY_STYLE)],
-]
-ct = Table(contact_data, colWidths=[CONTENT_W * 0.25, CONTENT_W * 0.75])
-ct.setStyle(ts(
+)
+CONTACT_TS = ts(
     ('TOPPADDING', (0,0), (-1,-1), 5),
     ('BOTTOMPADDING', (0,0), (-1,-1), 5),
     ('LEFTPADDING', (0,0), (-1,-1), 8),
@@ -394,37 +259,962 @@ ct.setStyle(ts(
     ('LINEBELOW', (0,0), (-1,-2), 0.3, GRAY_MID),
     ('BACKGROUND', (0,0), (-1,-1), GRAY_LIGHT),
     ('BOX', (0,0), (-1,-1), 0.5, GREEN_MID),
-))
-story.append(ct)
-story.append(Spacer(1, 8*mm))
-
-# ── FOOTER LEGAL ─────────────────────────────────────────────────────────────
-legal_data = [[Paragraph(
-    '<b>AVERTISSEMENT LEGAL :</b> TERRASOCIAL est exploite par MANO VERDE INC SA, societe anonyme de droit camerounais. '
-    'Ce service est une vente immobiliere a paiement echelonne (credit-vendeur). Il ne constitue pas une '
-    'operation de banque, de credit ou de microfinance. Document produit en Fevrier 2026.',
-    WARNING_STYLE
-)]]
-fl = Table(legal_data, colWidths=[CONTENT_W])
-fl.setStyle(ts(
+)
+DEVIS_TS = ts(
+    ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 10),
+    ('TEXTCOLOR', (1,0), (1,-1), GREEN_DARK),
+    ('BACKGROUND', (0,0), (-1,-1), GREEN_LIGHT),
+    ('BACKGROUND', (0,3), (-1,4), ORANGE_LIGHT),
+    ('TOPPADDING', (0,0), (-1,-1), 6),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+    ('LEFTPADDING', (0,0), (-1,-1), 10),
+    ('RIGHTPADDING', (0,0), (-1,-1), 10),
+    ('INNERGRID', (0,0), (-1,-1), 0.3, GRAY_MID),
+    ('BOX', (0,0), (-1,-1), 1, ORANGE),
+)
+LEGAL_TS = ts(
     ('BACKGROUND', (0,0), (-1,-1), colors.HexColor('#F9F9E8')),
     ('BOX', (0,0), (-1,-1), 0.5, colors.HexColor('#CCCC88')),
     ('TOPPADDING', (0,0), (-1,-1), 6),
     ('BOTTOMPADDING', (0,0), (-1,-1), 6),
     ('LEFTPADDING', (0,0), (-1,-1), 10),
     ('RIGHTPADDING', (0,0), (-1,-1), 10),
-))
-story.append(fl)
-
-# ── CONSTRUCTION ─────────────────────────────────────────────────────────────
-doc = SimpleDocTemplate(
-    OUT_FILE,
-    pagesize=A4,
-    leftMargin=MARGIN, rightMargin=MARGIN,
-    topMargin=65*mm, bottomMargin=12*mm,
-    title='Prospectus TERRASOCIAL - Fevrier 2026',
-    author='MANO VERDE INC SA',
-    subject='Vente de terrains a paiement echelonne - Cameroun',
 )
-doc.build(story, onFirstPage=on_first_page, onLaterPages=on_later_page)
-print(f'✅ Prospectus_TERRASOCIAL_Fev2026.pdf ({round(os.path.getsize(OUT_FILE)/1024)} Ko)')
+CATALOGUE_TS = ts(
+    ('SPAN', (0,0), (-1,0)),
+    ('BACKGROUND', (0,0), (-1,0), GREEN_LIGHT),
+    ('FONTNAME', (0,1), (0,-1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,1), (-1,-1), 9),
+    ('TEXTCOLOR', (1,1), (1,-1), GREEN_DARK),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('TOPPADDING', (0,0), (-1,-1), 4),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+    ('LEFTPADDING', (0,0), (-1,-1), 8),
+    ('RIGHTPADDING', (0,0), (-1,-1), 8),
+    ('INNERGRID', (0,1), (-1,-1), 0.3, GRAY_MID),
+    ('BOX', (0,0), (-1,-1), 0.5, GREEN),
+)
+
+# ── Langues ──────────────────────────────────────────────────────────────────
+# Tous les textes du prospectus viennent de locales/prospectus-<langue>.json ;
+# une clé absente d'une traduction reprend le texte français.
+def available_langs():
+    """Langues dont le catalogue locales/prospectus-<langue>.json existe."""
+    return sorted(name[len('prospectus-'):-len('.json')] for name in os.listdir(LOCALES_DIR)
+                  if name.startswith('prospectus-') and name.endswith('.json'))
+
+
+def _merge(base, over):
+    merged = dict(base)
+    for key, value in over.items():
+        merged[key] = _merge(base[key], value) if isinstance(value, dict) and isinstance(base.get(key), dict) else value
+    return merged
+
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(lang):
+    """Catalogue de textes d'une langue, complété par le catalogue français."""
+    path = os.path.join(LOCALES_DIR, f'prospectus-{lang}.json')
+    try:
+        with open(path, encoding='utf-8') as fh:
+            catalog = json.load(fh)
+    except FileNotFoundError:
+        raise ValueError(f"Langue '{lang}' : {os.path.relpath(path)} introuvable") from None
+    if lang != DEFAULT_LANG:
+        catalog = _merge(load_catalog(DEFAULT_LANG), catalog)
+    return catalog
+
+
+def out_name(lang=DEFAULT_LANG):
+    """Prospectus_TERRASOCIAL_Fev2026.pdf en français, …_Fev2026_<langue>.pdf sinon."""
+    if lang == DEFAULT_LANG:
+        return OUT_NAME
+    stem, ext = os.path.splitext(OUT_NAME)
+    return f'{stem}_{lang}{ext}'
+
+
+# ── Callbacks de page ────────────────────────────────────────────────────────
+# Le décor fixe (bandeaux, logo texte, pied de page) est dessiné une seule fois
+# par document dans un Form XObject PDF, puis tamponné sur chaque page : seul
+# le numéro de page est tracé à chaque fois.
+CHROME_FIRST = 'TSChromeFirst'
+CHROME_LATER = 'TSChromeLater'
+
+def stamp_form(canvas, name, draw):
+    """Tamponne le Form XObject `name`, en le définissant via `draw` au premier usage dans le document."""
+    if not canvas.hasForm(name):
+        canvas.beginForm(name)
+        draw(canvas)
+        canvas.endForm()
+    canvas.doForm(name)
+
+
+class Lang:
+    """Textes, polices, styles et décor de page d'une langue.
+
+    Une instance par langue et par processus (voir get_lang) : les documents
+    suivants dans la même langue réutilisent styles, tableaux et callbacks.
+    En français (et dans les langues à alphabet latin), les styles du module
+    sont utilisés tels quels.
+    """
+
+    def __init__(self, code):
+        self.code = code
+        self.catalog = load_catalog(code)
+        self.cjk_font = None
+        if code in LANG_FONTS:
+            self.cjk_font = pdf_fonts.cjk_font()
+            if not self.cjk_font:
+                self.cjk_font = LANG_FONTS[code]
+                print(f"⚠️  [{code}] Aucune police CJK TTF trouvée ({', '.join(pdf_fonts.CJK_FONTS[:3])}…) : "
+                      f"{self.cjk_font}, police CID non embarquée, sera dessinée par la visionneuse du lecteur. "
+                      "Déposez une police CJK TTF dans fonts/ ou $TERRASOCIAL_FONT_DIRS.", file=sys.stderr)
+        if self.cjk_font and self.cjk_font not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(UnicodeCIDFont(self.cjk_font))
+            # Police CID sans gras ni italique : <b> et <i> gardent la même police
+            pdfmetrics.registerFontFamily(self.cjk_font, normal=self.cjk_font, bold=self.cjk_font,
+                                          italic=self.cjk_font, boldItalic=self.cjk_font)
+        self._styles = {}
+        self._table_styles = {}
+
+    def text(self, key, **values):
+        """Texte du catalogue ('quote.monthly_value'), formaté avec `values`."""
+        node = self.catalog
+        for part in key.split('.'):
+            node = node[part]
+        return node.format(**values) if values else node
+
+    def font(self, name):
+        return self.cjk_font or F(name)
+
+    def para(self, text, style):
+        """Paragraph dans le style de la langue ; glyphes absents : police d'emoji, ou retirés."""
+        style = self.style(style)
+        return Paragraph(pdf_fonts.with_fallback(text, style.fontName, EMOJI_FONT), style)
+
+    def plain(self, text, font='Helvetica'):
+        """Texte brut (cellule, décor de page) sans les glyphes absents de la police."""
+        return pdf_fonts.drop_missing(text, self.font(font))
+
+    def style(self, base):
+        """`base` avec la police de la langue (les styles du module sinon)."""
+        if not self.cjk_font:
+            return base
+        if base.name not in self._styles:
+            self._styles[base.name] = ParagraphStyle(f'{base.name}_{self.code}', parent=base,
+                                                     fontName=self.cjk_font, wordWrap='CJK')
+        return self._styles[base.name]
+
+    def table_style(self, base):
+        """TableStyle `base` avec la police de la langue pour le texte brut des cellules."""
+        if not self.cjk_font:
+            return base
+        key = id(base)
+        if key not in self._table_styles:
+            commands = [('FONTNAME', (0,0), (-1,-1), self.cjk_font)]
+            commands += [(cmd[0], cmd[1], cmd[2], self.cjk_font, *cmd[4:]) if cmd[0] == 'FONTNAME' else cmd
+                         for cmd in base.getCommands()]
+            self._table_styles[key] = (base, TableStyle(commands))
+        return self._table_styles[key][1]
+
+    def _draw_first_chrome(self, canvas):
+        # Fond header
+        canvas.setFillColor(GREEN_DARK)
+        canvas.rect(0, H - 60*mm, W, 60*mm, fill=1, stroke=0)
+        # Bande orange
+        canvas.setFillColor(ORANGE)
+        canvas.rect(0, H - 64*mm, W, 4*mm, fill=1, stroke=0)
+        # Logo texte
+        canvas.setFont(self.font('Helvetica-Bold'), 32)
+        canvas.setFillColor(WHITE)
+        canvas.drawCentredString(W/2, H - 22*mm, 'TERRASOCIAL')
+        canvas.setFont(self.font('Helvetica'), 12)
+        canvas.setFillColor(ORANGE_MID)
+        canvas.drawCentredString(W/2, H - 30*mm, self.plain(self.text('chrome.by')))
+        # Slogan principal
+        canvas.setFont(self.font('Helvetica-Bold'), 15)
+        canvas.setFillColor(WHITE)
+        canvas.drawCentredString(W/2, H - 42*mm, self.plain(self.text('chrome.headline'), 'Helvetica-Bold'))
+        canvas.setFont(self.font('Helvetica'), 11)
+        canvas.setFillColor(ORANGE_MID)
+        canvas.drawCentredString(W/2, H - 50*mm, self.plain(self.text('chrome.tagline')))
+        # Pied de page
+        canvas.setFillColor(GREEN_DARK)
+        canvas.rect(0, 0, W, 8*mm, fill=1, stroke=0)
+        canvas.setFont(self.font('Helvetica'), 7)
+        canvas.setFillColor(WHITE)
+        canvas.drawCentredString(W/2, 2.5*mm, self.plain(self.text('chrome.footer_first')))
+
+    def _draw_later_chrome(self, canvas):
+        # Header compact
+        canvas.setFillColor(GREEN)
+        canvas.rect(0, H - 12*mm, W, 12*mm, fill=1, stroke=0)
+        canvas.setFont(self.font('Helvetica-Bold'), 9)
+        canvas.setFillColor(WHITE)
+        canvas.drawString(MARGIN, H - 8*mm, self.plain(self.text('chrome.header_later'), 'Helvetica-Bold'))
+        # Pied de page
+        canvas.setFillColor(GREEN_DARK)
+        canvas.rect(0, 0, W, 8*mm, fill=1, stroke=0)
+        canvas.setFont(self.font('Helvetica'), 7)
+        canvas.setFillColor(WHITE)
+        canvas.drawCentredString(W/2, 2.5*mm, self.plain(self.text('chrome.footer_later')))
+
+    def on_first_page(self, canvas, doc):
+        stamp_form(canvas, CHROME_FIRST, self._draw_first_chrome)
+
+    def on_later_page(self, canvas, doc):
+        stamp_form(canvas, CHROME_LATER, self._draw_later_chrome)
+        canvas.setFont(self.font('Helvetica-Bold'), 9)
+        canvas.setFillColor(WHITE)
+        canvas.drawRightString(W - MARGIN, H - 8*mm, self.plain(self.text('chrome.page', page=doc.page), 'Helvetica-Bold'))
+
+
+_langs = {}
+
+
+def get_lang(code=DEFAULT_LANG):
+    """Instance Lang de `code`, construite au premier usage dans le processus."""
+    if code not in _langs:
+        _langs[code] = Lang(code)
+    return _langs[code]
+
+
+# Callbacks français, utilisés aussi par les relevés (releves.py)
+def on_first_page(canvas, doc):
+    get_lang().on_first_page(canvas, doc)
+
+def on_later_page(canvas, doc):
+    get_lang().on_later_page(canvas, doc)
+
+# ── Données par défaut ───────────────────────────────────────────────────────
+# build_prospectus(data) fusionne `data` par-dessus ce dictionnaire et les
+# textes de la langue (titre, sujet, note des lots, étapes) : seules les clés
+# fournies par l'appelant remplacent le contenu standard.
+DEFAULT_DATA = {
+    # Lots au format de /api/public/lots (voir lots_source.py)
+    'lots': DEFAULT_LOTS,
+    'author': 'MANO VERDE INC SA',
+}
+
+
+def default_data(lang=DEFAULT_LANG):
+    """DEFAULT_DATA complété par les textes de la langue."""
+    L = get_lang(lang)
+    return dict(DEFAULT_DATA,
+                title=L.text('document.title'),
+                subject=L.text('document.subject'),
+                lots_note=L.text('document.lots_note'),
+                steps=[tuple(step) for step in L.text('steps.items')])
+
+# ── Contenu ───────────────────────────────────────────────────────────────────
+def _section_avertissement(L):
+    warning_data = [[L.para(L.text('warning'), WARNING_STYLE)]]
+    warn_t = Table(warning_data, colWidths=[CONTENT_W])
+    warn_t.setStyle(L.table_style(WARN_TS))
+    return [warn_t, Spacer(1, 6*mm)]
+
+
+def _section_devis(client, L):
+    """Encadré « Votre devis » des prospectus personnalisés (mode --batch)."""
+    monthly = mensualite(client['price'], client['duration_months'], client.get('monthly_amount'))
+    jours = versements_par_mois(monthly)
+    devis_data = [
+        [L.text('quote.client'), client['name']],
+        [L.text('quote.lot'), f"{client['lot']} — {fcfa(client['price'])}"],
+        [L.text('quote.duration'), L.text('quote.duration_value', months=client['duration_months'])],
+        [L.text('quote.monthly'), L.text('quote.monthly_value', amount=fcfa(monthly))],
+        [L.text('quote.daily'), L.text('quote.daily_value', count=jours, amount=fcfa(MIN_DAILY))],
+        [L.text('quote.fee'), fcfa(FRAIS_DOSSIER)],
+    ]
+    if client.get('reference'):
+        devis_data.append([L.text('quote.reference'), client['reference']])
+    dv = Table(devis_data, colWidths=[CONTENT_W * 0.40, CONTENT_W * 0.60])
+    dv.setStyle(L.table_style(DEVIS_TS))
+    return [
+        L.para(L.text('quote.title'), H2_STYLE),
+        dv,
+        Spacer(1, 6*mm),
+    ]
+
+
+def _section_dossier(L):
+    dossier_data = [[
+        Table([[
+            [L.para(fcfa(FRAIS_DOSSIER), BIG_ORANGE)],
+            [L.para(L.text('dossier.label'), BIG_GREEN)],
+            [L.para(L.text('dossier.note'), CENTER_BODY)],
+        ]], colWidths=[CONTENT_W * 0.48]),
+        Table([[
+            [L.para(L.text('dossier.included'), H3_STYLE)],
+            *[[L.para(item, BODY_STYLE)] for item in L.text('dossier.items')],
+        ]], colWidths=[CONTENT_W * 0.48]),
+    ]]
+    dt = Table(dossier_data, colWidths=[CONTENT_W * 0.48, CONTENT_W * 0.52])
+    dt.setStyle(L.table_style(DOSSIER_TS))
+    return [
+        hr(GREEN),
+        L.para(L.text('dossier.title'), H2_STYLE),
+        dt,
+        Spacer(1, 6*mm),
+    ]
+
+
+def _section_slogan(L):
+    slogan_data = [[
+        L.para('🍺🍺', BIG_ORANGE),
+        L.para(L.text('slogan.text'), SLOGAN_STYLE),
+        L.para(L.text('slogan.sub'), SLOGAN_SUB),
+    ]]
+    sl_t = Table([slogan_data], colWidths=[CONTENT_W * 0.12, CONTENT_W * 0.56, CONTENT_W * 0.32])
+    sl_t.setStyle(L.table_style(SLOGAN_TS))
+    return [sl_t, Spacer(1, 6*mm)]
+
+
+def _section_modes(L):
+    modes_data = [
+        [
+            L.para(L.text('modes.monthly_title'), MODE_MENSUEL_STYLE),
+            L.para(L.text('modes.daily_title'), MODE_JOURNALIER_STYLE),
+        ],
+        [
+            L.para(L.text('modes.monthly_text'), CENTER_BODY),
+            L.para(L.text('modes.daily_text'), CENTER_BODY),
+        ],
+        [
+            L.para(L.text('modes.monthly_items'), BODY_STYLE),
+            L.para(L.text('modes.daily_items'), BODY_STYLE),
+        ],
+    ]
+    mt = Table(modes_data, colWidths=[CONTENT_W * 0.49, CONTENT_W * 0.49],
+               spaceBefore=2, spaceAfter=2)
+    mt.setStyle(L.table_style(MODES_TS))
+    return [
+        hr(GREEN),
+        L.para(L.text('modes.title'), H2_STYLE),
+        mt,
+        Spacer(1, 5*mm),
+    ]
+
+
+def lot_label(lot):
+    """Nom court d'un lot pour les tableaux : 'Lot Standard - 500m²' → 'Standard'."""
+    name = lot['title'].split(' - ')[0].strip()
+    return name[4:] if name.lower().startswith('lot ') else name
+
+
+def lot_figures(lot):
+    """Montants affichés pour un lot : (mensualité, durée, versements journaliers par mois)."""
+    duration = lot.get('duration_months') or 24
+    monthly = mensualite(lot['price'], duration, lot.get('monthly_amount'))
+    return monthly, duration, versements_par_mois(monthly)
+
+
+def lots_rows(lots, L=None):
+    L = L or get_lang()
+    rows = []
+    for lot in lots:
+        monthly, duration, jours = lot_figures(lot)
+        rows.append([
+            lot_label(lot),
+            f"{lot['size_m2']:,} m²".replace(',', ' '),
+            fcfa(lot['price']),
+            L.text('lots.monthly', amount=fcfa(monthly), months=duration),
+            fcfa(MIN_DAILY),
+            L.text('lots.days', count=jours),
+        ])
+    return rows
+
+
+def exemple_rows(lot, L=None):
+    L = L or get_lang()
+    monthly, duration, jours = lot_figures(lot)
+    return [
+        [L.text('example.fee'), fcfa(FRAIS_DOSSIER)],
+        [L.text('example.price'), fcfa(lot['price'])],
+        [L.text('example.monthly', months=duration), L.text('example.monthly_value', amount=fcfa(monthly))],
+        [L.text('example.daily'), L.text('example.daily_value', count=jours, amount=fcfa(MIN_DAILY))],
+        [L.text('example.advance'), L.text('example.advance_value', two=fcfa(2 * MIN_DAILY), seven=fcfa(7 * MIN_DAILY))],
+    ]
+
+
+def _section_lots(data, L):
+    col_w = [CONTENT_W * f for f in [0.14, 0.12, 0.19, 0.19, 0.18, 0.18]]
+    lots_t = Table([L.text('lots.header')] + lots_rows(data['lots'], L), colWidths=col_w)
+    lots_t.setStyle(L.table_style(LOTS_TS))
+    return [
+        hr(GREEN),
+        L.para(L.text('lots.title'), H2_STYLE),
+        lots_t,
+        L.para(data['lots_note'], ITALIC_STYLE),
+        Spacer(1, 5*mm),
+    ]
+
+
+def _section_exemple(data, L):
+    if not data['lots']:
+        return []
+    lot = data['lots'][0]
+    ex_t = Table(exemple_rows(lot, L), colWidths=[CONTENT_W * 0.55, CONTENT_W * 0.45])
+    ex_t.setStyle(L.table_style(EXEMPLE_TS))
+    return [
+        hr(ORANGE),
+        L.para(L.text('example.title', lot=lot_label(lot), size=lot['size_m2']), H2_STYLE),
+        ex_t,
+        Spacer(1, 5*mm),
+    ]
+
+
+def _section_processus(data, L):
+    flow = [
+        hr(GREEN),
+        L.para(L.text('steps.title'), H2_STYLE),
+    ]
+    for num, title, desc in data['steps']:
+        step_data = [[
+            L.para(num, STEP_NUM_STYLE),
+            Table([
+                [L.para(title, H3_STYLE)],
+                [L.para(desc, BODY_STYLE)],
+            ], colWidths=[CONTENT_W * 0.82]),
+        ]]
+        st = Table(step_data, colWidths=[CONTENT_W * 0.10, CONTENT_W * 0.88], spaceBefore=2, spaceAfter=2)
+        st.setStyle(L.table_style(STEP_TS))
+        flow.append(st)
+    flow.append(Spacer(1, 5*mm))
+    return flow
+
+
+def _section_paiement(L):
+    pay_data = [[L.plain(method, 'Helvetica-Bold') for method in L.text('payment.methods')]]
+    pay_t = Table(pay_data, colWidths=[CONTENT_W / 5] * 5)
+    pay_t.setStyle(L.table_style(PAY_TS))
+    return [
+        hr(GREEN),
+        L.para(L.text('payment.title'), H2_STYLE),
+        pay_t,
+        Spacer(1, 5*mm),
+    ]
+
+
+def _section_contact(L):
+    contact_data = [
+        [L.para(label, H3_STYLE), L.para(value, BODY_STYLE)]
+        for label, value in L.text('contact.rows')
+    ]
+    ct = Table(contact_data, colWidths=[CONTENT_W * 0.25, CONTENT_W * 0.75])
+    ct.setStyle(L.table_style(CONTACT_TS))
+    return [
+        hr(ORANGE),
+        L.para(L.text('contact.title'), H2_STYLE),
+        ct,
+        Spacer(1, 8*mm),
+    ]
+
+
+def _section_legal(L):
+    legal_data = [[L.para(L.text('legal'), WARNING_STYLE)]]
+    fl = Table(legal_data, colWidths=[CONTENT_W])
+    fl.setStyle(L.table_style(LEGAL_TS))
+    return [fl]
+
+
+def build_story(data, lang=DEFAULT_LANG):
+    """Construit la liste de flowables du prospectus.
+
+    Les flowables ReportLab gardent un état après rendu : une nouvelle liste
+    est donc créée pour chaque document, seuls les styles sont partagés.
+    """
+    L = get_lang(lang)
+    story = [Spacer(1, 60*mm)]  # espace pour le header first page
+    story += _section_avertissement(L)
+    if data.get('client'):
+        story += _section_devis(data['client'], L)
+    story += _section_dossier(L)
+    story += _section_slogan(L)
+    story += _section_modes(L)
+    story += _section_lots(data, L)
+    story += _section_exemple(data, L)
+    story += _section_processus(data, L)
+    story += _section_paiement(L)
+    story += _section_contact(L)
+    story += _section_legal(L)
+    return story
+
+
+# ── Construction ─────────────────────────────────────────────────────────────
+def build_prospectus(data=None, out=None, lang=DEFAULT_LANG):
+    """Rend un prospectus PDF dans `out` (fichier ou objet binaire) et renvoie `out`.
+
+    `data` surcharge tout ou partie de default_data(lang). Styles, polices et
+    callbacks de page sont construits une seule fois par processus et par
+    langue : appeler cette fonction en boucle évite de relancer
+    l'interpréteur et ReportLab.
+    """
+    merged = default_data(lang)
+    if data:
+        merged.update(data)
+    if out is None:
+        out = os.path.join(OUT_DIR, out_name(lang))
+    L = get_lang(lang)
+    doc = SimpleDocTemplate(
+        out,
+        pagesize=A4,
+        leftMargin=MARGIN, rightMargin=MARGIN,
+        topMargin=65*mm, bottomMargin=12*mm,
+        title=merged['title'],
+        author=merged['author'],
+        subject=merged['subject'],
+        # Sortie reproductible : ni horodatage ni identifiant aléatoire, afin
+        # qu'un même contenu donne les mêmes octets (cache de build)
+        invariant=1,
+    )
+    doc.build(build_story(merged, lang), onFirstPage=L.on_first_page, onLaterPages=L.on_later_page)
+    return out
+
+
+def _render_lang(task):
+    """Rend le prospectus d'une langue : (langue, fichier, octets, secondes)."""
+    lang, out_dir, data = task
+    start = time.perf_counter()
+    out = os.path.join(out_dir, out_name(lang))
+    build_prospectus(data, out=out, lang=lang)
+    return lang, out, os.path.getsize(out), time.perf_counter() - start
+
+
+def build_prospectuses(langs, out_dir, data=None, jobs=1):
+    """Rend un prospectus par langue dans `out_dir` (un fichier par langue).
+
+    Avec `jobs` = 1, toutes les langues sont rendues dans le processus
+    courant, qui ne charge ReportLab, les styles et les polices qu'une fois ;
+    au-delà, les langues sont réparties sur un pool de processus. Renvoie
+    [(langue, fichier, octets, secondes)] dans l'ordre de `langs`.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(lang, out_dir, data) for lang in langs]
+    jobs = max(1, min(jobs or 1, len(tasks)))
+    if jobs == 1:
+        return [_render_lang(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_render_lang, tasks))
+
+
+# ── Catalogue complet des lots ───────────────────────────────────────────────
+# Un bloc par lot de `available_lots`, rendu en flux : les flowables sont
+# produits à la demande depuis un itérateur (lots_source.iter_lots) au lieu
+# d'une liste construite d'avance, et un volume est fermé toutes les N pages.
+CATALOGUE_NAME = 'Catalogue_TERRASOCIAL_Lots.pdf'
+
+
+def catalogue_name(lang=DEFAULT_LANG, volume=None):
+    """Catalogue_TERRASOCIAL_Lots[_<langue>][_vol02].pdf"""
+    stem, ext = os.path.splitext(CATALOGUE_NAME)
+    if lang != DEFAULT_LANG:
+        stem += f'_{lang}'
+    if volume is not None:
+        stem += f'_vol{volume:02d}'
+    return stem + ext
+
+
+class LazyStory:
+    """Story « paresseuse » pour doc.build : les flowables sont tirés de
+    l'itérateur au fur et à mesure que ReportLab les consomme.
+
+    doc.build ne manipule sa liste que par le début (story[0], del story[0],
+    story[0:0] = parties découpées, insert(0, …)) : seule une fenêtre de
+    quelques flowables est donc en mémoire. len() ne compte que cette
+    fenêtre, allongée tant que le dernier flowable est keepWithNext pour que
+    handle_keepWithNext voie tout le groupe.
+    """
+
+    def __init__(self, flowables):
+        self._iter = iter(flowables)
+        self._buf = []
+        self._done = False
+
+    def _fill(self, n):
+        while len(self._buf) < n and not self._done:
+            try:
+                self._buf.append(next(self._iter))
+            except StopIteration:
+                self._done = True
+
+    def __len__(self):
+        self._fill(1)
+        while not self._done and getattr(self._buf[-1], 'getKeepWithNext', lambda: False)():
+            self._fill(len(self._buf) + 1)
+        return len(self._buf)
+
+    def __getitem__(self, index):
+        if isinstance(index, int):
+            self._fill(index + 1)
+        return self._buf[index]
+
+    def __setitem__(self, index, value):
+        self._buf[index] = value
+
+    def __delitem__(self, index):
+        del self._buf[index]
+
+    def insert(self, index, flowable):
+        self._buf.insert(index, flowable)
+
+    def stop(self):
+        """Termine la story sans tirer l'itérateur ; renvoie les flowables déjà en fenêtre."""
+        rest, self._buf, self._done = self._buf, [], True
+        for flowable in rest:
+            # Reporté sur une page pleine : repart à neuf dans le volume suivant
+            flowable.__dict__.pop('_postponed', None)
+        return rest
+
+
+class CatalogueDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate qui ferme le volume après `max_pages` pages.
+
+    Le canvas garde chaque page rendue jusqu'à l'écriture du fichier : borner
+    les volumes borne aussi la mémoire. Les flowables restants (`carry`)
+    ouvrent le volume suivant.
+    """
+
+    def __init__(self, filename, story, max_pages=None, on_page=None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.story = story
+        self.max_pages = max_pages
+        self.on_page = on_page
+        self.carry = []
+
+    def afterPage(self):
+        if self.on_page:
+            self.on_page()
+        if self.max_pages and self.page >= self.max_pages:
+            self.carry += self.story.stop()
+
+
+def catalogue_block(lot, L):
+    """Bloc d'un lot : localisation, superficie, prix, mensualité et atouts."""
+    monthly, duration, jours = lot_figures(lot)
+    rows = [
+        [L.para(escape(f"{lot['icon']}  {lot['title']}"), H3_STYLE), ''],
+        [L.plain(L.text('catalogue.location')), L.plain(lot['location'] or '—')],
+        [L.plain(L.text('catalogue.size')), f"{lot['size_m2']:,} m²".replace(',', ' ')],
+        [L.plain(L.text('catalogue.price')), fcfa(lot['price'])],
+        [L.plain(L.text('catalogue.monthly')),
+         L.plain(L.text('catalogue.monthly_value', amount=fcfa(monthly), months=duration))],
+        [L.plain(L.text('catalogue.daily')),
+         L.plain(L.text('catalogue.daily_value', amount=fcfa(MIN_DAILY), count=jours))],
+    ]
+    if lot['features']:
+        rows.append([L.plain(L.text('catalogue.features')),
+                     L.para(escape(' • '.join(map(str, lot['features']))), BODY_STYLE)])
+    t = Table(rows, colWidths=[CONTENT_W * 0.30, CONTENT_W * 0.70], spaceAfter=4*mm)
+    t.setStyle(L.table_style(CATALOGUE_TS))
+    return KeepTogether([t])
+
+
+def _catalogue_heading(L, volume=None):
+    heading = [L.para(L.text('catalogue.title'), H2_STYLE)]
+    if volume is not None:
+        heading.append(L.para(L.text('catalogue.volume', volume=volume), SMALL_STYLE))
+    return heading + [hr(GREEN), Spacer(1, 3*mm)]
+
+
+def build_catalogue(lots, out_dir, lang=DEFAULT_LANG, volume_pages=None, progress_every=2.0):
+    """Rend le catalogue complet des lots dans `out_dir`, en flux.
+
+    `lots` est un itérable (ex. lots_source.iter_lots) parcouru une seule
+    fois : un bloc par lot est construit au moment où ReportLab en a besoin,
+    puis libéré une fois dessiné. Avec `volume_pages`, un nouveau fichier
+    (…_vol01.pdf, …_vol02.pdf) est ouvert toutes les `volume_pages` pages.
+    Renvoie un dict de statistiques.
+    """
+    L = get_lang(lang)
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    last_report = start
+    counts = {'lots': 0, 'pages': 0}
+    volumes = []
+
+    def report(final=False):
+        elapsed = time.perf_counter() - start
+        rate = counts['pages'] / elapsed if elapsed else 0.0
+        end = '\n' if final else '\r'
+        print(f"  {counts['pages']} pages, {counts['lots']} lots — {rate:.1f} pages/s — {elapsed:.1f} s",
+              end=end, flush=True)
+
+    def on_page():
+        nonlocal last_report
+        counts['pages'] += 1
+        now = time.perf_counter()
+        if now - last_report >= progress_every:
+            report()
+            last_report = now
+
+    def blocks():
+        for lot in lots:
+            counts['lots'] += 1
+            yield catalogue_block(lot, L)
+
+    pending = blocks()
+    carry = []
+    while True:
+        volume = len(volumes) + 1 if volume_pages else None
+        if not carry:
+            carry = list(itertools.islice(pending, 1))
+            if not carry and volumes:
+                break
+        if not carry:
+            carry = [L.para(L.text('catalogue.empty'), BODY_STYLE)]
+        story = LazyStory(itertools.chain(_catalogue_heading(L, volume), carry, pending))
+        out = os.path.join(out_dir, catalogue_name(lang, volume))
+        title = L.text('catalogue.document_title')
+        doc = CatalogueDocTemplate(
+            out, story, max_pages=volume_pages, on_page=on_page,
+            pagesize=A4,
+            leftMargin=MARGIN, rightMargin=MARGIN,
+            topMargin=18*mm, bottomMargin=12*mm,
+            title=f'{title} — {L.text("catalogue.volume", volume=volume)}' if volume else title,
+            author=DEFAULT_DATA['author'],
+            subject=L.text('document.subject'),
+            invariant=1,
+        )
+        doc.build(story, onFirstPage=L.on_later_page, onLaterPages=L.on_later_page)
+        volumes.append((out, doc.page, os.path.getsize(out)))
+        carry = doc.carry
+        if not volume_pages:
+            break
+    report(final=True)
+    elapsed = time.perf_counter() - start
+    return {
+        'lots': counts['lots'],
+        'pages': counts['pages'],
+        'volumes': volumes,
+        'bytes': sum(size for _, _, size in volumes),
+        'seconds': elapsed,
+        'pages_per_second': counts['pages'] / elapsed if elapsed else 0.0,
+    }
+
+
+# ── Mode lot : devis personnalisés ───────────────────────────────────────────
+def _first(row, *keys, default=''):
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ''):
+            return value
+    return default
+
+
+def quote_data(row, lang=DEFAULT_LANG):
+    """Convertit une ligne d'export `reservations` (CSV/JSON) en données de prospectus."""
+    price = int(float(_first(row, 'lot_price', 'price', default=0)))
+    duration = int(float(_first(row, 'duration_months', default=0))) or 24
+    monthly = _first(row, 'monthly_amount', default=None)
+    client = {
+        'name': str(_first(row, 'client_name', 'lead_name', 'full_name', default='Client TERRASOCIAL')),
+        'lot': str(_first(row, 'lot_title', 'lot_type', 'title', default='Lot')),
+        'price': price,
+        'duration_months': duration,
+        'monthly_amount': int(float(monthly)) if monthly else None,
+        'reference': str(_first(row, 'reference', 'id', default='')),
+    }
+    return {
+        'client': client,
+        'title': get_lang(lang).text('document.quote_title', name=client['name']),
+    }
+
+
+def iter_rows(source, fmt=None):
+    """Lit les lignes en flux depuis un fichier ou '-' (stdin) : CSV, JSON (tableau) ou JSON Lines."""
+    if fmt is None:
+        ext = os.path.splitext(source)[1].lower()
+        fmt = 'csv' if ext == '.csv' else 'json'
+    stream = sys.stdin if source == '-' else open(source, encoding='utf-8', newline='')
+    try:
+        if fmt == 'csv':
+            yield from csv.DictReader(stream)
+            return
+        first = ''
+        while not first.strip():
+            first = stream.readline()
+            if not first:
+                return
+        if first.lstrip().startswith('['):
+            # Tableau JSON : pas de parseur incrémental en stdlib, on charge le tout
+            yield from json.loads(first + stream.read())
+            return
+        yield json.loads(first)
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', text).strip('_')[:60] or 'devis'
+
+
+def shard_path(out_dir, key, prefix='Devis_TERRASOCIAL'):
+    """Répartit les fichiers dans 256 sous-dossiers (2 premiers hex du SHA-1 de la clé)."""
+    shard = hashlib.sha1(key.encode('utf-8')).hexdigest()[:2]
+    return os.path.join(out_dir, shard, f'{prefix}_{_slug(key)}.pdf')
+
+
+# Données communes aux devis d'un worker (lots, langue…), fixées par _init_batch_worker
+_batch_base = {}
+
+
+def _init_batch_worker(base):
+    global _batch_base
+    _batch_base = base
+
+
+def _render_quote(task):
+    """Tâche d'un worker : rend un devis. Les erreurs sont renvoyées, jamais levées."""
+    index, row, out_dir = task
+    try:
+        data = dict(_batch_base)
+        lang = data.pop('lang', DEFAULT_LANG)
+        data.update(quote_data(row, lang))
+        key = data['client']['reference'] or f"{index:06d}_{data['client']['name']}"
+        out = shard_path(out_dir, key)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        build_prospectus(data, out=out, lang=lang)
+        return index, out, os.path.getsize(out), None
+    except Exception as e:
+        return index, None, 0, f'{type(e).__name__}: {e}'
+
+
+def run_batch(rows, out_dir, jobs=None, base=None, progress_every=2.0):
+    """Rend un devis par ligne sur un pool de processus.
+
+    Chaque worker importe ReportLab et construit les styles une seule fois,
+    puis enchaîne les documents. Les lignes sont soumises au fil de l'eau
+    (au plus 4 tâches en attente par worker) pour garder une mémoire bornée
+    sur de très gros exports. `base` (ex. {'lots': [...]}) est transmis une
+    seule fois à chaque worker ; sa clé 'lang' choisit la langue des devis.
+    Renvoie un dict de statistiques.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    last_report = start
+    done = failed = total_bytes = 0
+    errors = []
+    pending = set()
+    rows = iter(enumerate(rows))
+
+    def report(final=False):
+        elapsed = time.perf_counter() - start
+        rate = done / elapsed if elapsed else 0.0
+        end = '\n' if final else '\r'
+        print(f'  {done} devis ({failed} erreur(s)) — {rate:.1f} docs/s — {elapsed:.1f} s', end=end, flush=True)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                             initargs=(base or {},)) as pool:
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < jobs * 4:
+                try:
+                    index, row = next(rows)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_render_quote, (index, row, out_dir)))
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, out, size, error = future.result()
+                done += 1
+                if error:
+                    failed += 1
+                    errors.append((index, error))
+                else:
+                    total_bytes += size
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                report()
+                last_report = now
+    report(final=True)
+    elapsed = time.perf_counter() - start
+    return {
+        'documents': done,
+        'errors': errors,
+        'bytes': total_bytes,
+        'seconds': elapsed,
+        'docs_per_second': done / elapsed if elapsed else 0.0,
+        'jobs': jobs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TERRASOCIAL — Prospectus commercial et devis personnalisés')
+    parser.add_argument('out_dir', nargs='?', default=DEFAULT_OUT_DIR,
+                        help='Dossier de sortie du prospectus standard')
+    parser.add_argument('--batch', metavar='FICHIER',
+                        help="Export reservations/leads (CSV, JSON ou JSON Lines ; '-' = stdin) : un devis par ligne")
+    parser.add_argument('--format', choices=['csv', 'json'],
+                        help="Format de l'export (défaut : d'après l'extension)")
+    parser.add_argument('--out-dir', dest='batch_dir',
+                        help='Dossier racine des devis, réparti en sous-dossiers (défaut : DOSSIER_SORTIE/devis)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Nombre de processus (défaut : tous les cœurs)')
+    parser.add_argument('--lots', metavar='SOURCE',
+                        help='Lots disponibles : export JSON, base SQLite ou dump .sql (défaut : lots du backend)')
+    parser.add_argument('--lots-max-age', type=int, default=DEFAULT_MAX_AGE,
+                        help=f"Validité de l'instantané des lots en secondes (défaut : {DEFAULT_MAX_AGE})")
+    parser.add_argument('--catalogue', action='store_true',
+                        help='Catalogue complet des lots (un bloc par lot, rendu en flux) au lieu du prospectus')
+    parser.add_argument('--volume-pages', type=int, default=None, metavar='N',
+                        help='--catalogue : nouveau volume toutes les N pages (défaut : un seul fichier)')
+    parser.add_argument('--langs', default=DEFAULT_LANG, metavar='fr,en,…',
+                        help="Langues du prospectus, séparées par des virgules, ou 'all' "
+                             f"(catalogues locales/prospectus-*.json ; défaut : {DEFAULT_LANG})")
+    args = parser.parse_args(argv)
+
+    available = available_langs()
+    langs = available if args.langs == 'all' else [lang.strip() for lang in args.langs.split(',') if lang.strip()]
+    unknown = [lang for lang in langs if lang not in available]
+    if unknown or not langs:
+        parser.error(f"langue(s) sans catalogue : {', '.join(unknown) or '(aucune)'} "
+                     f"(disponibles : {', '.join(available)})")
+
+    if args.volume_pages is not None and (not args.catalogue or args.volume_pages < 1):
+        parser.error('--volume-pages : entier positif, avec --catalogue')
+
+    if args.catalogue:
+        for lang in langs:
+            # Une lecture de la source par langue : le curseur ne garde aucun lot en mémoire
+            stats = build_catalogue(iter_lots(args.lots, max_age=args.lots_max_age), args.out_dir,
+                                    lang=lang, volume_pages=args.volume_pages)
+            for out, pages, size in stats['volumes']:
+                print(f'✅ {os.path.basename(out)} ({pages} pages, {round(size/1024)} Ko)')
+            print(f"✅ Catalogue {lang} : {stats['lots']} lots, {stats['pages']} pages, "
+                  f"{len(stats['volumes'])} volume(s) — {stats['pages_per_second']:.1f} pages/s")
+        return 0
+
+    if args.batch:
+        if len(langs) > 1:
+            parser.error('--batch : une seule langue à la fois')
+        out_dir = args.batch_dir or os.path.join(args.out_dir, 'devis')
+        base = {'lots': load_lots(args.lots, max_age=args.lots_max_age), 'lang': langs[0]}
+        stats = run_batch(iter_rows(args.batch, args.format), out_dir, jobs=args.jobs, base=base)
+        print(f"✅ {stats['documents'] - len(stats['errors'])} devis générés dans {out_dir} "
+              f"({round(stats['bytes']/1024)} Ko, {stats['docs_per_second']:.1f} docs/s, {stats['jobs']} processus)")
+        for index, error in stats['errors'][:20]:
+            print(f'❌ Ligne {index + 1} : {error}')
+        return 1 if stats['errors'] else 0
+
+    data = {'lots': load_lots(args.lots, max_age=args.lots_max_age)}
+    start = time.perf_counter()
+    results = build_prospectuses(langs, args.out_dir, data, jobs=args.jobs or 1)
+    for lang, out, size, seconds in results:
+        print(f'✅ {os.path.basename(out)} ({round(size/1024)} Ko, {seconds:.2f} s)')
+    if len(results) > 1:
+        print(f'✅ {len(results)} langues en {time.perf_counter() - start:.2f} s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,8 @@ class I18nManager {
             'de': { name: 'Deutsch', flag: '🇩🇪' }
         };
         this.translations = {};
+        this.fromBundle = {};
+        this.fullLoads = {};
         this.currentLanguage = this.getDefaultLanguage();
     }
 
@@ -37,7 +39,17 @@ class I18nManager {
     }
 
     /**
-     * Load translations for a specific language
+     * Per-page bundle (locales/pages/<page>.<lang>.json, written by
+     * build_locales.py) holding only the keys this page uses
+     */
+    getBundleUrl(language) {
+        const page = (window.location.pathname.split('/').pop() || 'index.html').replace(/\.html$/, '');
+        return `locales/pages/${page}.${language}.json`;
+    }
+
+    /**
+     * Load translations for a specific language: page bundle first,
+     * full locale file if the page has no bundle
      */
     async loadTranslations(language) {
         if (this.translations[language]) {
@@ -45,7 +57,11 @@ class I18nManager {
         }
 
         try {
-            const response = await fetch(`locales/site-${language}.json`);
+            let response = await fetch(this.getBundleUrl(language));
+            this.fromBundle[language] = response.ok;
+            if (!response.ok) {
+                response = await fetch(`locales/site-${language}.json`);
+            }
             if (!response.ok) {
                 throw new Error(`Failed to load ${language} translations`);
             }
@@ -61,6 +77,35 @@ class I18nManager {
         }
     }
 
+    /**
+     * Full locale file, loaded once when a key is missing from the page
+     * bundle (stale bundle, key built at runtime); the page is then updated
+     * and languageChanged fired again so other scripts re-render
+     */
+    loadFullTranslations(language) {
+        if (!this.fullLoads[language]) {
+            this.fullLoads[language] = fetch(`locales/site-${language}.json`)
+                .then((response) => {
+                    if (!response.ok) {
+                        throw new Error(`Failed to load ${language} translations`);
+                    }
+                    return response.json();
+                })
+                .then((full) => {
+                    this.translations[language] = full;
+                    this.fromBundle[language] = false;
+                    if (language === this.currentLanguage) {
+                        this.updatePageContent();
+                        window.dispatchEvent(new CustomEvent('languageChanged', { detail: { language } }));
+                    }
+                })
+                .catch((error) => {
+                    console.error(`Error loading translations for ${language}:`, error);
+                });
+        }
+        return this.fullLoads[language];
+    }
+
     /**
      * Get translation key with nested support (e.g., "hero.title")
      */
@@ -72,6 +117,10 @@ class I18nManager {
             if (value && typeof value === 'object' && k in value) {
                 value = value[k];
             } else {
+                // Absent from the page bundle: the full file may have it
+                if (this.fromBundle[this.currentLanguage]) {
+                    this.loadFullTranslations(this.currentLanguage);
+                }
                 return defaultValue;
             }
         }
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Source des lots disponibles (table `available_lots`)
+
+Lit le catalogue servi par /api/public/lots depuis :
+  • un export JSON (réponse de l'API `{"lots": [...]}` ou simple tableau) ;
+  • une base SQLite du backend (.db / .sqlite / .sqlite3) ;
+  • un dump PostgreSQL / SQLite (.sql : blocs COPY ou INSERT INTO).
+
+Un instantané local (.cache/lots_snapshot.json) évite de relire la source :
+il est réutilisé tel quel tant que le fichier source n'a pas changé (taille,
+mtime) et qu'il a moins de `max_age` secondes. Passé ce délai, seul le
+couple (MAX(updated_at), nombre de lots) est recalculé ; s'il est identique,
+l'instantané est prolongé sans reconstruire la liste.
+
+iter_lots() parcourt les lots un à un (curseur SQLite par paquets) pour le
+catalogue complet de generate_prospectus.py --catalogue.
+
+Usage :
+    python3 lots_source.py SOURCE [--max-age 3600]
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+CACHE_DIR = SCRIPT_DIR / '.cache'
+SNAPSHOT_FILE = CACHE_DIR / 'lots_snapshot.json'
+DEFAULT_MAX_AGE = 3600  # secondes
+
+COLUMNS = ['id', 'title', 'location', 'size_m2', 'price', 'monthly_amount', 'duration_months',
+           'icon', 'features', 'status', 'display_order', 'updated_at']
+INT_COLUMNS = {'id', 'size_m2', 'price', 'monthly_amount', 'duration_months', 'display_order'}
+
+# Lots initiaux du backend (backend/src/db/init.js) : utilisés sans source explicite
+DEFAULT_LOTS = [
+    {'id': 1, 'title': 'Lot Standard - 500m²', 'location': 'Soa, Yaoundé', 'size_m2': 500,
+     'price': 500000, 'monthly_amount': 21000, 'duration_months': 24, 'icon': '🏡',
+     'features': ['Titre foncier sécurisé', 'Accès route praticable', 'Électricité à proximité', 'Bornage inclus'],
+     'status': 'available', 'display_order': 1, 'updated_at': None},
+    {'id': 2, 'title': 'Lot Confort - 750m²', 'location': 'Nkolfoulou, Yaoundé', 'size_m2': 750,
+     'price': 750000, 'monthly_amount': 25000, 'duration_months': 30, 'icon': '🏠',
+     'features': ['Titre foncier sécurisé', 'Accès goudronné', 'Eau et électricité', 'Bornage et plan inclus'],
+     'status': 'available', 'display_order': 2, 'updated_at': None},
+    {'id': 3, 'title': 'Lot Premium - 1000m²', 'location': 'Mbankomo, Yaoundé', 'size_m2': 1000,
+     'price': 1000000, 'monthly_amount': 28000, 'duration_months': 36, 'icon': '🏘️',
+     'features': ['Titre foncier garanti', 'Zone viabilisée', 'Tous réseaux disponibles', 'Accompagnement complet'],
+     'status': 'available', 'display_order': 3, 'updated_at': None},
+]
+
+# Instantanés déjà chargés dans ce processus : {chemin source: entrée}
+_memo = {}
+
+
+# ── Normalisation ─────────────────────────────────────────────────────────────
+def normalize_lot(row):
+    """Ramène une ligne brute (SQL, CSV, JSON) au format de /api/public/lots."""
+    lot = {}
+    for col in COLUMNS:
+        value = row.get(col)
+        if col in INT_COLUMNS:
+            value = int(float(value)) if value not in (None, '') else None
+        lot[col] = value
+    features = lot['features']
+    if isinstance(features, str):
+        try:
+            features = json.loads(features or '[]')
+        except ValueError:
+            features = []
+    lot['features'] = features if isinstance(features, list) else []
+    lot['icon'] = lot['icon'] or '🏡'
+    lot['status'] = lot['status'] or 'available'
+    lot['display_order'] = lot['display_order'] or 0
+    return lot
+
+
+def _available(rows):
+    lots = [normalize_lot(r) for r in rows]
+    lots = [lot for lot in lots if lot['status'] == 'available']
+    lots.sort(key=lambda lot: (lot['display_order'], lot['id'] or 0))
+    return lots
+
+
+# ── Lecteurs ──────────────────────────────────────────────────────────────────
+def _source_kind(path):
+    ext = path.suffix.lower()
+    if ext in ('.db', '.sqlite', '.sqlite3'):
+        return 'sqlite'
+    if ext == '.sql':
+        return 'dump'
+    return 'json'
+
+
+def _read_json(path):
+    data = json.loads(path.read_text(encoding='utf-8'))
+    if isinstance(data, dict):
+        data = data.get('lots') or data.get('available_lots') or []
+    return data
+
+
+def _sqlite_connect(path):
+    return sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+
+
+_SQLITE_QUERY = (f'SELECT {", ".join(COLUMNS)} FROM available_lots '
+                 "WHERE status = 'available' ORDER BY display_order ASC, id ASC")
+
+
+def _read_sqlite(path):
+    with _sqlite_connect(path) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(r) for r in conn.execute(_SQLITE_QUERY)]
+
+
+def _sqlite_fingerprint(path):
+    """(MAX(updated_at), COUNT(*)) des lots disponibles : requête indexable, sans lire les lignes."""
+    with _sqlite_connect(path) as conn:
+        row = conn.execute(
+            "SELECT MAX(updated_at), COUNT(*) FROM available_lots WHERE status = 'available'"
+        ).fetchone()
+    return [row[0], row[1]]
+
+
+_COPY_RE = re.compile(r'^COPY\s+(?:\w+\.)?"?available_lots"?\s*\(([^)]*)\)\s+FROM\s+stdin', re.I)
+_INSERT_RE = re.compile(r'^INSERT\s+INTO\s+(?:\w+\.)?"?available_lots"?\s*\(([^)]*)\)\s*VALUES\s*', re.I)
+_COPY_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '\\': '\\'}
+
+
+def _unescape_copy(field):
+    if field == '\\N':
+        return None
+    return re.sub(r'\\(.)', lambda m: _COPY_ESCAPES.get(m.group(1), m.group(1)), field)
+
+
+def _sql_values(text):
+    """Découpe `(…), (…);` en tuples de valeurs Python (chaînes, nombres, NULL)."""
+    rows, row, i, n = [], None, 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '(':
+            row = []
+        elif c == ')':
+            rows.append(row)
+            row = None
+        elif c == "'":
+            j, buf = i + 1, []
+            while j < n:
+                if text[j] == "'" and j + 1 < n and text[j + 1] == "'":
+                    buf.append("'")
+                    j += 2
+                elif text[j] == "'":
+                    break
+                else:
+                    buf.append(text[j])
+                    j += 1
+            row.append(''.join(buf))
+            i = j
+        elif row is not None and c not in ' ,\n\t':
+            m = re.match(r"[^,)\s]+", text[i:])
+            token = m.group(0)
+            row.append(None if token.upper() == 'NULL' else token)
+            i += len(token) - 1
+        elif c == ';' and row is None:
+            break
+        i += 1
+    return rows
+
+
+def _read_dump(path):
+    rows = []
+    with open(path, encoding='utf-8') as fh:
+        lines = iter(fh)
+        for line in lines:
+            m = _COPY_RE.match(line)
+            if m:
+                cols = [c.strip().strip('"') for c in m.group(1).split(',')]
+                for data in lines:
+                    if data.startswith('\\.'):
+                        break
+                    fields = data.rstrip('\n').split('\t')
+                    rows.append(dict(zip(cols, map(_unescape_copy, fields))))
+                continue
+            m = _INSERT_RE.match(line)
+            if m:
+                cols = [c.strip().strip('"') for c in m.group(1).split(',')]
+                statement = line[m.end():]
+                while not statement.rstrip().endswith(';'):
+                    more = next(lines, None)
+                    if more is None:
+                        break
+                    statement += more
+                rows.extend(dict(zip(cols, values)) for values in _sql_values(statement))
+    return rows
+
+
+def read_source(path):
+    """Lit et normalise les lots disponibles d'une source, sans cache."""
+    path = Path(path)
+    kind = _source_kind(path)
+    if kind == 'sqlite':
+        return _available(_read_sqlite(path))
+    if kind == 'dump':
+        return _available(_read_dump(path))
+    return _available(_read_json(path))
+
+
+def fingerprint(lots):
+    """Clé de fraîcheur d'une liste de lots : (MAX(updated_at), nombre de lots)."""
+    stamps = [str(lot['updated_at']) for lot in lots if lot.get('updated_at')]
+    return [max(stamps) if stamps else None, len(lots)]
+
+
+# ── Instantané ───────────────────────────────────────────────────────────────
+def _read_snapshots(snapshot_file):
+    try:
+        return json.loads(Path(snapshot_file).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_snapshots(snapshot_file, snapshots):
+    snapshot_file = Path(snapshot_file)
+    snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = snapshot_file.with_suffix('.tmp')
+    tmp.write_text(json.dumps(snapshots, ensure_ascii=False, indent=1), encoding='utf-8')
+    os.replace(tmp, snapshot_file)
+
+
+def load_lots(source=None, max_age=DEFAULT_MAX_AGE, snapshot_file=SNAPSHOT_FILE, stats=None):
+    """Renvoie la liste des lots disponibles, via l'instantané local si possible.
+
+    `source` vaut None pour les lots par défaut du backend. `stats`, si fourni,
+    reçoit la clé 'lots_cache' : 'memo', 'hit', 'refresh' ou 'miss'.
+    """
+    stats = stats if stats is not None else {}
+    if source is None:
+        stats['lots_cache'] = 'default'
+        return [dict(lot) for lot in DEFAULT_LOTS]
+
+    path = Path(source).resolve()
+    key = str(path)
+    st = path.stat()
+    stamp = [st.st_size, st.st_mtime_ns]
+    now = time.time()
+
+    entry = _memo.get(key)
+    snapshots = None
+    if entry is None:
+        snapshots = _read_snapshots(snapshot_file)
+        entry = snapshots.get(key)
+    elif entry['stamp'] == stamp and now - entry['fetched_at'] < max_age:
+        stats['lots_cache'] = 'memo'
+        return entry['lots']
+
+    if entry and entry['stamp'] == stamp and now - entry['fetched_at'] < max_age:
+        stats['lots_cache'] = 'hit'
+        _memo[key] = entry
+        return entry['lots']
+
+    kind = _source_kind(path)
+    if entry and kind == 'sqlite' and _sqlite_fingerprint(path) == entry['fingerprint']:
+        # Base modifiée ailleurs (autres tables) ou instantané expiré : lots inchangés
+        stats['lots_cache'] = 'refresh'
+        lots = entry['lots']
+    elif entry and kind != 'sqlite' and entry['stamp'] == stamp:
+        # Fichier identique, seul l'âge a expiré : pas de nouvelle analyse
+        stats['lots_cache'] = 'refresh'
+        lots = entry['lots']
+    else:
+        lots = read_source(path)
+        if entry and lots == entry['lots']:
+            stats['lots_cache'] = 'refresh'
+        else:
+            stats['lots_cache'] = 'miss'
+
+    entry = {
+        'stamp': stamp,
+        'fingerprint': _sqlite_fingerprint(path) if kind == 'sqlite' else fingerprint(lots),
+        'fetched_at': now,
+        'lots': lots,
+    }
+    if snapshots is None:
+        snapshots = _read_snapshots(snapshot_file)
+    snapshots[key] = entry
+    _write_snapshots(snapshot_file, snapshots)
+    _memo[key] = entry
+    return lots
+
+
+def iter_lots(source=None, max_age=DEFAULT_MAX_AGE, batch_size=500, stats=None):
+    """Parcourt les lots disponibles un à un (catalogue complet, milliers de lots).
+
+    Une base SQLite est lue par un curseur, `batch_size` lignes à la fois,
+    sans instantané ni liste intermédiaire : la mémoire ne dépend pas du
+    nombre de lots. Les exports JSON et les dumps .sql sont analysés en
+    entier de toute façon et passent donc par load_lots (instantané).
+    """
+    stats = stats if stats is not None else {}
+    if source is None or _source_kind(Path(source)) != 'sqlite':
+        yield from load_lots(source, max_age=max_age, stats=stats)
+        return
+    stats['lots_cache'] = 'stream'
+    conn = _sqlite_connect(Path(source).resolve())
+    try:
+        conn.row_factory = sqlite3.Row
+        cur = conn.execute(_SQLITE_QUERY)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield normalize_lot(dict(row))
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TERRASOCIAL — Lots disponibles (available_lots)')
+    parser.add_argument('source', nargs='?', help='Export JSON, base SQLite ou dump .sql (défaut : lots du backend)')
+    parser.add_argument('--max-age', type=int, default=DEFAULT_MAX_AGE,
+                        help=f'Durée de validité de l\'instantané en secondes (défaut : {DEFAULT_MAX_AGE})')
+    args = parser.parse_args()
+
+    stats = {}
+    lots = load_lots(args.source, max_age=args.max_age, stats=stats)
+    writer = csv.writer(sys.stdout, delimiter='\t')
+    for lot in lots:
+        writer.writerow([lot['id'], lot['title'], lot['size_m2'], lot['price'],
+                         lot['monthly_amount'] or '', lot['duration_months'] or ''])
+    print(f'✅ {len(lots)} lot(s) disponible(s) — instantané : {stats["lots_cache"]}')
+
+
+if __name__ == '__main__':
+    main()
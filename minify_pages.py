@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Minification des pages HTML et CSS critique (build_assets.py)
+
+Chaque page *.html est réduite sans changer son comportement :
+
+- HTML : commentaires retirés (sauf commentaires conditionnels), espaces
+  consécutifs du texte ramenés à un seul (le navigateur les fusionne de
+  toute façon), blancs supprimés seulement autour des balises qui ne
+  s'affichent pas (head, meta, link, script…). <pre> et <textarea> et les
+  valeurs d'attributs ne sont jamais modifiés.
+- CSS inline : commentaires et blancs superflus retirés, chaînes intactes.
+- JS inline : commentaires retirés et blancs réduits par un analyseur
+  lexical qui respecte chaînes, gabarits `${…}` et expressions régulières.
+  Les fins de ligne sont conservées (insertion automatique des
+  points-virgules). Si Node.js est disponible, chaque script minifié est
+  compilé ; en cas d'échec, le script d'origine est conservé.
+- JSON inline (<script type="application/json">) : réécrit compact.
+
+Pour les pages de CRITICAL_PAGES, la feuille de style locale est scindée :
+les règles dont les classes, identifiants et balises figurent dans le
+premier écran (tout ce qui précède la fin de la première <section>) sont
+inlinées dans <style> ; la feuille complète est chargée sans bloquer le
+rendu (rel=preload puis stylesheet, <noscript> en secours), au même
+endroit, donc avec la même cascade une fois chargée.
+
+Le budget (deploy/budgets.json) fixe la taille maximale de chaque page
+minifiée, brute et/ou en gzip.
+"""
+
+import re
+import json
+import gzip
+import shutil
+import subprocess
+from pathlib import Path
+
+CRITICAL_PAGES = ('index.html',)
+
+# Balises sans rendu : les blancs qui les entourent peuvent disparaître
+_INVISIBLE_TAGS = {'html', 'head', 'body', 'meta', 'link', 'title', 'script', 'style', 'noscript', 'base', '!doctype'}
+
+_HTML_TOKEN_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style|pre|textarea)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>.*?</\1\s*>'
+    r'|<[a-zA-Z/!?](?:[^>"\']|"[^"]*"|\'[^\']*\')*>'
+    r'|[^<]+|<',
+    re.S | re.I)
+_TAG_NAME_RE = re.compile(r'<(/?)([a-zA-Z!][\w:-]*)')
+_TAG_PARTS_RE = re.compile(r'"[^"]*"|\'[^\']*\'|\s+|[^"\'\s]+')
+_ATTR_RE = re.compile(r'\s([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+_WS_RE = re.compile(r'\s+')
+
+_CSS_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/|\s+|[^"\'/\s]+|/', re.S)
+
+
+# ── CSS ───────────────────────────────────────────────────────────────────
+def minify_css(css):
+    """Retire commentaires et blancs superflus ; les chaînes restent intactes."""
+    tokens = [t for t in _CSS_TOKEN_RE.findall(css) if not t.startswith('/*')]
+    out = []
+    for i, tok in enumerate(tokens):
+        if tok.isspace():
+            prev = out[-1] if out else ''
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else ''
+            if not prev or not nxt or prev[-1] in '{};,:(' or nxt[0] in '{};,)' or nxt.isspace():
+                continue
+            out.append(' ')
+            continue
+        if tok[0] not in '"\'':
+            tok = tok.replace(';}', '}')
+            if tok[0] == '}' and out and out[-1][0] not in '"\'' and out[-1].endswith(';'):
+                out[-1] = out[-1][:-1]
+        out.append(tok)
+    return ''.join(out).strip()
+
+
+def _css_blocks(css):
+    """Découpe une feuille minifiée en [(prélude, corps ou None)] au premier niveau."""
+    blocks, i, n = [], 0, len(css)
+    while i < n:
+        start, depth, j = i, 0, i
+        while j < n:
+            c = css[j]
+            if c in '"\'':
+                k = j + 1
+                while k < n and css[k] != c:
+                    k += 2 if css[k] == '\\' else 1
+                j = k + 1
+                continue
+            if c == ';' and depth == 0:
+                blocks.append((css[start:j].strip(), None))
+                j += 1
+                break
+            if c == '{':
+                if depth == 0:
+                    body_start = j + 1
+                depth += 1
+            elif c == '}':
+                depth -= 1
+                if depth == 0:
+                    blocks.append((css[start:body_start - 1].strip(), css[body_start:j]))
+                    j += 1
+                    break
+            j += 1
+        else:
+            if css[start:].strip():
+                blocks.append((css[start:].strip(), None))
+        i = j
+    return blocks
+
+
+def _split_selectors(prelude):
+    parts, depth, cur = [], 0, []
+    for c in prelude:
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        if c == ',' and depth == 0:
+            parts.append(''.join(cur))
+            cur = []
+        else:
+            cur.append(c)
+    parts.append(''.join(cur))
+    return parts
+
+
+_PSEUDO_RE = re.compile(r'::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?')
+_ATTR_SEL_RE = re.compile(r'\[[^\]]*\]')
+
+
+def _selector_may_match(selector, fold):
+    """Vrai si toutes les classes, identifiants et balises du sélecteur existent dans le premier écran."""
+    sel = _ATTR_SEL_RE.sub('', _PSEUDO_RE.sub('', selector))
+    if any(c not in fold['class'] for c in re.findall(r'\.(-?[_a-zA-Z][\w-]*)', sel)):
+        return False
+    if any(i not in fold['id'] for i in re.findall(r'#(-?[_a-zA-Z][\w-]*)', sel)):
+        return False
+    tags = re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', sel)
+    return all(t.lower() in fold['tag'] for t in tags)
+
+
+def critical_css(css, fold):
+    """Règles de `css` (minifiée) utiles au premier écran décrit par `fold`."""
+    keep = []
+    used_animations = set()
+    keyframes = []
+    for prelude, body in _css_blocks(css):
+        if body is None:
+            if prelude.startswith(('@import', '@charset')):
+                keep.append(prelude + ';')
+            continue
+        if prelude.startswith('@'):
+            at = prelude.split(None, 1)[0].lower()
+            if at in ('@media', '@supports', '@layer'):
+                inner = critical_css(body, fold)
+                if inner:
+                    keep.append(f'{prelude}{{{inner}}}')
+            elif at == '@font-face':
+                keep.append(f'{prelude}{{{body}}}')
+            elif at.endswith('keyframes'):
+                keyframes.append((prelude.split(None, 1)[-1].strip(), f'{prelude}{{{body}}}'))
+            continue
+        selectors = [s for s in _split_selectors(prelude) if _selector_may_match(s.strip(), fold)]
+        if selectors:
+            keep.append(f'{",".join(selectors)}{{{body}}}')
+            used_animations.update(re.findall(r'animation(?:-name)?:([^;}]+)', body))
+    text = ''.join(keep)
+    for name, rule in keyframes:
+        if any(re.search(rf'(^|[\s,]){re.escape(name)}($|[\s,])', a) for a in used_animations):
+            text += rule
+    return text
+
+
+def fold_of(html):
+    """Balises, classes et identifiants du premier écran : <body> jusqu'à la fin de la première <section>."""
+    body = re.search(r'<body\b', html, re.I)
+    start = body.start() if body else 0
+    end = len(html)
+    first = re.search(r'<section\b', html[start:], re.I)
+    if first:
+        depth = 0
+        for m in re.finditer(r'<(/?)section\b', html[start + first.start():], re.I):
+            depth += -1 if m.group(1) else 1
+            if depth == 0:
+                end = start + first.start() + m.end()
+                break
+    fold = {'tag': {'html', 'body'}, 'class': set(), 'id': set()}
+    for m in _HTML_TOKEN_RE.finditer(html, start, end):
+        tok = m.group(0)
+        name = _TAG_NAME_RE.match(tok)
+        if not name or name.group(1):
+            continue
+        fold['tag'].add(name.group(2).lower())
+        for a in _ATTR_RE.finditer(tok):
+            value = next((v for v in a.groups()[1:] if v is not None), '')
+            if a.group(1).lower() == 'class':
+                fold['class'].update(value.split())
+            elif a.group(1).lower() == 'id':
+                fold['id'].add(value)
+    return fold
+
+
+# ── JavaScript ────────────────────────────────────────────────────────────
+_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+                   'throw', 'instanceof', 'yield', 'await'}
+_NEWLINES = '\n\r\u2028\u2029'
+
+
+def _is_word(c):
+    return c.isalnum() or c in '_$\\' or ord(c) > 127
+
+
+def minify_js(src):
+    """
+    Retire les commentaires et réduit les blancs d'un script. Les fins de
+    ligne sont conservées sauf après ; { , ( où elles ne peuvent rien changer.
+    """
+    out = []
+    n = len(src)
+    i = 0
+    braces = []          # profondeur d'accolades de chaque ${…} ouvert
+    last = ''            # dernier caractère significatif émis
+    last_word = ''
+    pending = ''         # blanc en attente : '', ' ' ou '\n'
+
+    def emit(text):
+        nonlocal pending
+        if pending and out:
+            prev = out[-1][-1]
+            if pending == '\n':
+                if prev not in ';{,(\n':
+                    out.append('\n')
+            elif (_is_word(prev) and _is_word(text[0])) or (prev in '+-' and text[0] in '+-') \
+                    or (prev == '/' and text[0] in '/*') or (prev.isdigit() and text[0] == '.'):
+                out.append(' ')
+        pending = ''
+        out.append(text)
+
+    def read_quoted(j, quote):
+        k = j + 1
+        while k < n and src[k] != quote:
+            k += 2 if src[k] == '\\' else 1
+        return k + 1
+
+    def read_template(j):
+        """Depuis j (après ` ou après la } d'un ${…}) jusqu'au ` fermant ou au prochain ${."""
+        k = j
+        while k < n:
+            if src[k] == '\\':
+                k += 2
+            elif src[k] == '`':
+                return k + 1, False
+            elif src.startswith('${', k):
+                return k + 2, True
+            else:
+                k += 1
+        return n, False
+
+    while i < n:
+        c = src[i]
+        if c.isspace():
+            if c in _NEWLINES or pending == '\n':
+                pending = '\n'
+            else:
+                pending = pending or ' '
+            i += 1
+            continue
+        if c == '/' and i + 1 < n and src[i + 1] == '/':
+            while i < n and src[i] not in _NEWLINES:
+                i += 1
+            continue
+        if c == '/' and i + 1 < n and src[i + 1] == '*':
+            end = src.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            if any(ch in src[i:end] for ch in _NEWLINES):
+                pending = '\n'
+            else:
+                pending = pending or ' '
+            i = end
+            continue
+        if c in '"\'':
+            j = read_quoted(i, c)
+            emit(src[i:j])
+            last, last_word, i = c, '', j
+            continue
+        if c == '`' or (c == '}' and braces and braces[-1] == 0):
+            if c == '}':
+                braces.pop()
+            j, opened = read_template(i + 1)
+            if opened:
+                braces.append(0)
+            emit(src[i:j])
+            last, last_word, i = ('{' if opened else '`'), '', j
+            continue
+        if c == '/' and (not last or last in _REGEX_AFTER or last_word in _REGEX_KEYWORDS):
+            j, in_class = i + 1, False
+            while j < n and src[j] not in _NEWLINES:
+                if src[j] == '\\':
+                    j += 2
+                    continue
+                if src[j] == '[':
+                    in_class = True
+                elif src[j] == ']':
+                    in_class = False
+                elif src[j] == '/' and not in_class:
+                    break
+                j += 1
+            if j < n and src[j] == '/':
+                j += 1
+                while j < n and _is_word(src[j]):
+                    j += 1
+                emit(src[i:j])
+                last, last_word, i = '/', '', j
+                continue
+            # Pas une expression régulière complète sur la ligne : division
+        if _is_word(c):
+            j = i + 1
+            while j < n and (_is_word(src[j]) or (src[j] == '.' and c.isdigit())):
+                j += 1
+            word = src[i:j]
+            emit(word)
+            last, last_word, i = word[-1], word, j
+            continue
+        if c == '{' and braces:
+            braces[-1] += 1
+        elif c == '}' and braces:
+            braces[-1] -= 1
+        emit(c)
+        last, last_word = c, ''
+        i += 1
+    return ''.join(out).strip()
+
+
+_NODE_COMPILE = r"""
+const vm = require('vm');
+const scripts = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const failed = [];
+scripts.forEach(([before, after], i) => {
+    let ok = true;
+    try { new vm.Script(before); } catch (e) { return; }  // déjà invalide seul (module…) : non vérifiable
+    try { new vm.Script(after); } catch (e) { ok = false; }
+    if (!ok) failed.push(i);
+});
+process.stdout.write(JSON.stringify(failed));
+"""
+
+
+def _node_rejects(pairs):
+    """Indices des scripts minifiés que Node.js ne compile pas ; None si Node.js est absent."""
+    node = shutil.which('node')
+    if not node or not pairs:
+        return None if not node else set()
+    r = subprocess.run([node, '-e', _NODE_COMPILE], input=json.dumps(pairs),
+                       capture_output=True, text=True, timeout=120)
+    if r.returncode != 0:
+        return None
+    return set(json.loads(r.stdout))
+
+
+# ── HTML ──────────────────────────────────────────────────────────────────
+def _minify_tag(tag):
+    parts = [' ' if p.isspace() else p for p in _TAG_PARTS_RE.findall(tag)]
+    text = ''.join(parts)
+    return re.sub(r'\s+(/?>)$', r'\1', text)
+
+
+def _tag_name(tok):
+    m = _TAG_NAME_RE.match(tok)
+    return m.group(2).lower() if m else ''
+
+
+def minify_html(html, check_js=True):
+    """
+    Minifie une page. Renvoie (html minifié, {'scripts': n, 'scripts_kept': n})
+    ; scripts_kept compte les scripts laissés intacts après l'échec de la
+    compilation de contrôle.
+    """
+    tokens = []
+    scripts = []  # (indice du jeton, ouverture, contenu d'origine, minifié, fermeture)
+    for m in _HTML_TOKEN_RE.finditer(html):
+        tok = m.group(0)
+        raw = m.group(1)
+        if tok.startswith('<!--'):
+            if tok.startswith('<!--[if') or tok.startswith('<!--<!'):
+                tokens.append(tok)
+            continue
+        if raw:
+            kind = raw.lower()
+            open_end = re.match(r'<(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', tok).end()
+            close_start = tok.lower().rindex('</')
+            opening, body, closing = tok[:open_end], tok[open_end:close_start], tok[close_start:]
+            if kind == 'style':
+                tok = _minify_tag(opening) + minify_css(body) + closing
+            elif kind == 'script':
+                type_ = (re.search(r'\btype\s*=\s*["\']?([^"\'\s>]+)', opening, re.I) or [None, ''])[1].lower()
+                if type_ in ('', 'text/javascript', 'application/javascript', 'module'):
+                    if body.strip():
+                        scripts.append((len(tokens), _minify_tag(opening), body, minify_js(body), closing))
+                    tok = _minify_tag(opening) + body + closing
+                elif type_ in ('application/json', 'application/ld+json', 'importmap') and body.strip():
+                    try:
+                        compact = json.dumps(json.loads(body), ensure_ascii=False, separators=(',', ':'))
+                        tok = _minify_tag(opening) + compact.replace('</', '<\\/') + closing
+                    except ValueError:
+                        pass
+            tokens.append(tok)
+        elif tok.startswith('<') and len(tok) > 1:
+            tokens.append(_minify_tag(tok))
+        else:
+            tokens.append(_WS_RE.sub(' ', tok))
+
+    rejected = _node_rejects([[s[2], s[3]] for s in scripts]) if check_js else None
+    kept = 0
+    for k, (index, opening, body, minified, closing) in enumerate(scripts):
+        if rejected is not None and k in rejected:
+            kept += 1
+            continue
+        tokens[index] = opening + minified + closing
+
+    # Blancs autour des balises sans rendu
+    out = []
+    for i, tok in enumerate(tokens):
+        if tok.isspace():
+            prev = _tag_name(tokens[i - 1]) if i else '!doctype'
+            nxt = _tag_name(tokens[i + 1]) if i + 1 < len(tokens) else 'html'
+            if prev.lstrip('/') in _INVISIBLE_TAGS or nxt.lstrip('/') in _INVISIBLE_TAGS:
+                continue
+        out.append(tok)
+    return ''.join(out).strip() + '\n', {'scripts': len(scripts), 'scripts_kept': kept,
+                                          'js_checked': rejected is not None}
+
+
+def inline_critical(html, root):
+    """
+    Remplace la première feuille locale de la page par sa partie critique
+    inlinée + un chargement différé de la feuille complète.
+    Renvoie (html, {'stylesheet', 'critical_bytes', 'full_bytes'}) ou (html, None).
+    """
+    for m in re.finditer(r'<link\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', html, re.I):
+        tag = m.group(0)
+        if not re.search(r'\brel\s*=\s*["\']?stylesheet', tag, re.I):
+            continue
+        href = re.search(r'\bhref\s*=\s*["\']([^"\']+)', tag, re.I)
+        if not href or re.match(r'(?:[a-z]+:)?//', href.group(1)):
+            continue
+        sheet = root / href.group(1).lstrip('/')
+        if not sheet.is_file():
+            continue
+        full = minify_css(sheet.read_text(encoding='utf-8'))
+        critical = critical_css(full, fold_of(html))
+        url = href.group(1)
+        replacement = (f'<style>{critical}</style>'
+                       f'<link rel="preload" href="{url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+                       f'<noscript><link rel="stylesheet" href="{url}"></noscript>')
+        return html[:m.start()] + replacement + html[m.end():], {
+            'stylesheet': url, 'critical_bytes': len(critical.encode('utf-8')),
+            'full_bytes': len(full.encode('utf-8'))}
+    return html, None
+
+
+# ── Pages et budget ───────────────────────────────────────────────────────
+def load_budgets(path):
+    """{'default': {...}, 'pages': {page: {'bytes': n, 'gzip': n}}} ; fichier absent : pas de budget."""
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {'default': {}, 'pages': {}}
+    return {'default': data.get('default', {}), 'pages': data.get('pages', {})}
+
+
+def budget_for(budgets, page):
+    return {**budgets['default'], **budgets['pages'].get(page, {})}
+
+
+def build_page(rel, root, check_js=True, budgets=None):
+    """
+    Page minifiée (et CSS critique pour CRITICAL_PAGES). Renvoie (octets,
+    rapport {'page', 'before', 'after', 'gzip', 'budget', 'over', 'critical', …}).
+    """
+    source = (root / rel).read_text(encoding='utf-8')
+    html = source
+    critical = None
+    if rel in CRITICAL_PAGES:
+        html, critical = inline_critical(html, root)
+    html, info = minify_html(html, check_js=check_js)
+    data = html.encode('utf-8')
+    report = {
+        'page': rel,
+        'before': len(source.encode('utf-8')),
+        'after': len(data),
+        'gzip': len(gzip.compress(data, compresslevel=9, mtime=0)),
+        'critical': critical,
+        **info,
+    }
+    budget = budget_for(budgets, rel) if budgets else {}
+    report['budget'] = budget
+    report['over'] = [key for key, measure in (('bytes', 'after'), ('gzip', 'gzip'))
+                      if budget.get(key) and report[measure] > budget[key]]
+    return data, report
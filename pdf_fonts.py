@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Polices Unicode (TrueType) des PDF ReportLab
+
+Les polices standard du PDF (Helvetica) ne couvrent que le jeu Latin-1 :
+ni emoji, ni chinois. Ce module choisit des polices TTF installées et les
+enregistre dans ReportLab une seule fois par processus :
+
+- texte : une famille complète (normal, gras, italique), DejaVu Sans,
+  Noto Sans, Liberation Sans… ou à défaut Vera, livrée avec ReportLab ;
+- chinois : Noto Sans SC, WenQuanYi, Droid Sans Fallback… (facultatif) ;
+- emoji : Noto Emoji, Symbola… (facultatif), en repli pour les caractères
+  absents de la police du texte (with_fallback).
+
+L'analyse d'un fichier TTF (tables cmap, hmtx…) coûte de quelques
+millisecondes à plus d'une seconde pour une police CJK : les métriques
+analysées sont conservées sur disque (pickle, ~/.cache/terrasocial/fonts)
+et rechargées aux exécutions suivantes tant que le fichier de police et la
+version de ReportLab ne changent pas. La reconstruction passe par des
+attributs internes de ReportLab : chaque entrée garde une empreinte de la
+police fraîchement analysée (nom, largeurs, sous-ensemble embarqué), et une
+police reconstruite qui s'en écarte est ignorée au profit d'une nouvelle
+analyse. ReportLab n'embarque dans chaque PDF que les glyphes utilisés
+(sous-ensembles de 256 glyphes).
+
+Sans police CJK TTF, le chinois est rendu avec STSong-Light, police CID
+non embarquée (dessinée par la visionneuse, si elle la possède) : un
+avertissement le signale (generate_prospectus.Lang). Sans police d'emoji,
+les emoji sont retirés du texte et un avertissement le signale aussi, une
+fois par processus (import de generate_prospectus).
+
+Dossiers de recherche : $TERRASOCIAL_FONT_DIRS (séparés par « : »), fonts/
+du projet, puis les dossiers de polices du système.
+"""
+
+import os
+import re
+import sys
+import pickle
+import hashlib
+import functools
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+CACHE_VERSION = 2
+CACHE_DIR = Path(os.environ.get('TERRASOCIAL_FONT_CACHE')
+                 or Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'terrasocial' / 'fonts')
+
+SYSTEM_FONT_DIRS = [
+    '/usr/share/fonts', '/usr/local/share/fonts', '~/.local/share/fonts', '~/.fonts',
+    '/Library/Fonts', '~/Library/Fonts', '/System/Library/Fonts',
+    os.path.join(os.environ.get('WINDIR', 'C:/Windows'), 'Fonts'),
+]
+
+# Familles de texte, par ordre de préférence : {style : noms de fichiers possibles}
+TEXT_FAMILIES = [
+    {'normal': ['DejaVuSans.ttf'], 'bold': ['DejaVuSans-Bold.ttf'],
+     'italic': ['DejaVuSans-Oblique.ttf'], 'boldItalic': ['DejaVuSans-BoldOblique.ttf']},
+    {'normal': ['NotoSans-Regular.ttf'], 'bold': ['NotoSans-Bold.ttf'],
+     'italic': ['NotoSans-Italic.ttf'], 'boldItalic': ['NotoSans-BoldItalic.ttf']},
+    {'normal': ['LiberationSans-Regular.ttf'], 'bold': ['LiberationSans-Bold.ttf'],
+     'italic': ['LiberationSans-Italic.ttf'], 'boldItalic': ['LiberationSans-BoldItalic.ttf']},
+    {'normal': ['arial.ttf', 'Arial.ttf'], 'bold': ['arialbd.ttf', 'Arial Bold.ttf'],
+     'italic': ['ariali.ttf', 'Arial Italic.ttf'], 'boldItalic': ['arialbi.ttf', 'Arial Bold Italic.ttf']},
+    # Livrée avec ReportLab : toujours disponible
+    {'normal': ['Vera.ttf'], 'bold': ['VeraBd.ttf'], 'italic': ['VeraIt.ttf'], 'boldItalic': ['VeraBI.ttf']},
+]
+# Polices à contours TrueType seulement : ReportLab ne lit pas les .otf / .ttc CFF (Noto Sans CJK)
+CJK_FONTS = ['NotoSansSC-Regular.ttf', 'NotoSansSC-VariableFont_wght.ttf', 'wqy-microhei.ttc',
+             'wqy-zenhei.ttc', 'DroidSansFallbackFull.ttf', 'DroidSansFallback.ttf', 'simhei.ttf',
+             'msyh.ttc', 'simsun.ttc', 'Arial Unicode.ttf']
+EMOJI_FONTS = ['NotoEmoji-Regular.ttf', 'NotoEmoji-VariableFont_wght.ttf', 'Symbola.ttf',
+               'seguiemj.ttf', 'seguisym.ttf']
+
+# Noms sous lesquels les polices sont enregistrées dans ReportLab
+TEXT_NAMES = {'normal': 'TSSans', 'bold': 'TSSans-Bold', 'italic': 'TSSans-Oblique', 'boldItalic': 'TSSans-BoldOblique'}
+BASE14 = {'normal': 'Helvetica', 'bold': 'Helvetica-Bold', 'italic': 'Helvetica-Oblique', 'boldItalic': 'Helvetica-BoldOblique'}
+CJK_NAME = 'TSSansCJK'
+EMOJI_NAME = 'TSEmoji'
+
+# Caractères mesurés pour l'empreinte d'une police en cache (absents : largeur par défaut)
+PROBE_TEXT = 'AaÉéèçà€0123456789 TERRASOCIAL m² 中文土地 ✅🏡'
+PROBE_SAMPLES = 32
+
+_MARKUP_RE = re.compile(r'(<[^>]*>|&#?\w+;)')
+# Polices CID (STSong-Light…) : pas de table de caractères consultable ; la
+# collection Adobe-GB1 ne couvre ni les emoji (hors BMP), ni les sélecteurs
+# de variante, ni les Dingbats (✅…)
+CID_MISSING = ((0x2700, 0x27BF), (0xFE00, 0xFE0F), (0x10000, 0x10FFFF))
+
+
+def font_dirs():
+    dirs = [d for d in os.environ.get('TERRASOCIAL_FONT_DIRS', '').split(os.pathsep) if d]
+    dirs.append(str(SCRIPT_DIR / 'fonts'))
+    dirs += SYSTEM_FONT_DIRS
+    try:
+        import reportlab
+        dirs.append(os.path.join(os.path.dirname(reportlab.__file__), 'fonts'))
+    except ImportError:
+        pass
+    return [Path(os.path.expanduser(d)) for d in dirs]
+
+
+@functools.lru_cache(maxsize=None)
+def _font_index():
+    """{nom de fichier en minuscules : chemin}, premier dossier prioritaire ; parcouru une fois par processus."""
+    index = {}
+    for root in font_dirs():
+        if not root.is_dir():
+            continue
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                if name.lower().endswith(('.ttf', '.ttc')):
+                    index.setdefault(name.lower(), Path(dirpath) / name)
+    return index
+
+
+def find_font(candidates):
+    """Chemin du premier fichier de `candidates` trouvé, ou None."""
+    index = _font_index()
+    return next((index[c.lower()] for c in candidates if c.lower() in index), None)
+
+
+def text_family_files():
+    """{style : chemin} de la première famille dont le normal et le gras sont installés."""
+    for family in TEXT_FAMILIES:
+        files = {style: find_font(names) for style, names in family.items()}
+        if files['normal'] and files['bold']:
+            files['italic'] = files['italic'] or files['normal']
+            files['boldItalic'] = files['boldItalic'] or files['bold']
+            return files
+    return {}
+
+
+def selected_files():
+    """Fichiers de police retenus (empreinte du cache de build d'update_documents.py)."""
+    files = {f'text.{style}': path for style, path in text_family_files().items()}
+    files['cjk'] = find_font(CJK_FONTS)
+    files['emoji'] = find_font(EMOJI_FONTS)
+    return {role: str(path) for role, path in files.items() if path}
+
+
+# ── Cache des métriques ──────────────────────────────────────────────────────
+def _cache_file(path, subfont_index, cache_dir):
+    import reportlab
+    st = os.stat(path)
+    key = f'{CACHE_VERSION}|{reportlab.Version}|{os.path.abspath(path)}|{subfont_index}|{st.st_size}|{st.st_mtime_ns}'
+    return Path(cache_dir) / (hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pickle')
+
+
+def _restore(name, path, state):
+    """TTFont reconstruite depuis les métriques en cache, sans réanalyser le fichier."""
+    from fnmatch import fnmatch
+    from weakref import WeakKeyDictionary
+    from reportlab import rl_config
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont, TTFontFace, TTEncoding, unShapedFontGlob
+
+    face = TTFontFace.__new__(TTFontFace)
+    pdfmetrics.TypeFace.__init__(face, None)
+    face.__dict__.update(state)
+    with open(path, 'rb') as fh:
+        face._ttf_data = fh.read()
+    scale = 1000 / face.unitsPerEm
+    face._pdfScale = (lambda x: x) if face.unitsPerEm == 1000 else (lambda x: x * scale)
+
+    font = TTFont.__new__(TTFont)
+    font.fontName = name
+    font.face = face
+    font.encoding = TTEncoding()
+    font.state = WeakKeyDictionary()
+    font._asciiReadable = rl_config.ttfAsciiReadable
+    font.shapable = not any(fnmatch(name, glob) for glob in unShapedFontGlob)
+    return font
+
+
+def _probe(font):
+    """Empreinte d'une TTFont : nom de la police, métriques, largeurs d'un échantillon de caractères."""
+    face = font.face
+    codes = sorted(face.charToGlyph)
+    step = max(1, len(codes) // PROBE_SAMPLES)
+    chars = PROBE_TEXT + ''.join(chr(code) for code in codes[::step][:PROBE_SAMPLES])
+    return {
+        'name': face.name, 'ascent': face.ascent, 'descent': face.descent, 'bbox': list(face.bbox),
+        'glyphs': len(codes), 'widths': [font.stringWidth(ch, 1000) for ch in chars],
+    }
+
+
+def _subset_codes(font):
+    """Quelques caractères présents dans la police, pour comparer les sous-ensembles embarqués."""
+    return [ord(ch) for ch in dict.fromkeys(PROBE_TEXT) if ord(ch) in font.face.charToGlyph][:16]
+
+
+def load_ttfont(name, path, subfont_index=0, cache_dir=CACHE_DIR, stats=None):
+    """
+    TTFont `name` pour le fichier `path`, depuis le cache de métriques si
+    possible. Un cache illisible, d'une autre version, ou dont la police
+    reconstruite ne correspond plus à son empreinte est ignoré et réécrit.
+    `stats` (facultatif) reçoit 'cache_hits' / 'parsed' / 'rejected'.
+    """
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    cache_file = _cache_file(path, subfont_index, cache_dir)
+    try:
+        with open(cache_file, 'rb') as fh:
+            entry = pickle.load(fh)
+        font = _restore(name, path, entry['state'])
+        if _probe(font) == entry['probe']:
+            if stats is not None:
+                stats['cache_hits'] = stats.get('cache_hits', 0) + 1
+            return font
+        if stats is not None:
+            stats['rejected'] = stats.get('rejected', 0) + 1
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError, TypeError, ValueError):
+        pass
+    font = TTFont(name, str(path), subfontIndex=subfont_index)
+    if stats is not None:
+        stats['parsed'] = stats.get('parsed', 0) + 1
+    state = {k: v for k, v in font.face.__dict__.items() if k not in ('_ttf_data', '_pdfScale')}
+    probe = _probe(font)
+    # Vérifié contre la police fraîche avant écriture : si ReportLab a changé
+    # ses attributs internes, la reconstruction diverge et rien n'est mis en cache
+    try:
+        restored = _restore(name, path, state)
+        codes = _subset_codes(font)
+        if _probe(restored) != probe or restored.face.makeSubset(codes) != font.face.makeSubset(codes):
+            return font
+    except Exception:
+        return font
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f'.~{cache_file.name}.{os.getpid()}')
+        with open(tmp, 'wb') as fh:
+            pickle.dump({'state': state, 'probe': probe}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(cache_file)
+    except OSError:
+        pass  # cache en lecture seule : la police reste utilisable
+    return font
+
+
+def register_font(name, path, subfont_index=0):
+    """Enregistre `path` sous `name` (une seule fois par processus) ; renvoie `name`."""
+    from reportlab.pdfbase import pdfmetrics
+    if name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(load_ttfont(name, path, subfont_index))
+    return name
+
+
+def _register_single(name, candidates):
+    """Enregistre le premier fichier de `candidates` lisible par ReportLab, comme famille à un seul style."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFError
+    index = _font_index()
+    for candidate in candidates:
+        path = index.get(candidate.lower())
+        if path is None:
+            continue
+        try:
+            register_font(name, path)
+        except (TTFError, OSError) as e:
+            print(f'⚠️  Police {path.name} ignorée : {e}', file=sys.stderr)
+            continue
+        # <b>/<i> à l'intérieur d'un <font name=…> gardent la même police
+        pdfmetrics.registerFontFamily(name, normal=name, bold=name, italic=name, boldItalic=name)
+        return name
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def text_fonts():
+    """
+    {police standard : police TTF enregistrée} ('Helvetica' → 'TSSans'…),
+    ou {} si aucune famille TTF n'est lisible (les polices standard restent).
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFError
+    files = text_family_files()
+    try:
+        for style, path in files.items():
+            register_font(TEXT_NAMES[style], path)
+    except (TTFError, OSError) as e:
+        print(f'⚠️  Polices TTF indisponibles ({e}) : Helvetica utilisée', file=sys.stderr)
+        return {}
+    if not files:
+        return {}
+    pdfmetrics.registerFontFamily(TEXT_NAMES['normal'], **TEXT_NAMES)
+    return {BASE14[style]: TEXT_NAMES[style] for style in BASE14}
+
+
+@functools.lru_cache(maxsize=None)
+def cjk_font():
+    """Police chinoise TTF enregistrée, ou None."""
+    return _register_single(CJK_NAME, CJK_FONTS)
+
+
+@functools.lru_cache(maxsize=None)
+def emoji_font():
+    """Police d'emoji (monochrome) enregistrée, ou None."""
+    return _register_single(EMOJI_NAME, EMOJI_FONTS)
+
+
+# ── Repli glyphe par glyphe ──────────────────────────────────────────────────
+@functools.lru_cache(maxsize=None)
+def _charset(font_name):
+    """Points de code couverts par une police TTF enregistrée ; None pour les polices standard ou CID."""
+    from reportlab.pdfbase import pdfmetrics
+    face = getattr(pdfmetrics.getFont(font_name), 'face', None)
+    char_to_glyph = getattr(face, 'charToGlyph', None)
+    return frozenset(char_to_glyph) if char_to_glyph is not None else None
+
+
+@functools.lru_cache(maxsize=None)
+def _is_cid(font_name):
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import CIDFont
+    return isinstance(pdfmetrics.getFont(font_name), CIDFont)
+
+
+def has_glyph(font_name, ch):
+    charset = _charset(font_name)
+    if charset is not None:
+        return ord(ch) in charset
+    if _is_cid(font_name):
+        return not any(lo <= ord(ch) <= hi for lo, hi in CID_MISSING)
+    return True
+
+
+def drop_missing(text, font_name):
+    """Texte brut (cellules de tableau, décor de page) sans les caractères absents de la police."""
+    if _charset(font_name) is None and not _is_cid(font_name):
+        return text
+    return ''.join(ch for ch in text if ch in '\n\t' or has_glyph(font_name, ch))
+
+
+def with_fallback(text, font_name, fallback=None):
+    """
+    Balisage de Paragraph : les caractères absents de `font_name` passent
+    dans la police `fallback` (<font name=…>) si elle les contient, et sont
+    retirés sinon (plutôt qu'affichés en carrés vides). Balises et entités
+    sont conservées telles quelles.
+    """
+    if _charset(font_name) is None and not _is_cid(font_name):
+        return text
+    alt = _charset(fallback) if fallback else frozenset()
+    out = []
+    for part in _MARKUP_RE.split(text):
+        if not part or _MARKUP_RE.fullmatch(part):
+            out.append(part)
+            continue
+        run = []
+        for ch in part:
+            if ch.isspace() or has_glyph(font_name, ch):
+                if run:
+                    out.append(f'<font name="{fallback}">{"".join(run)}</font>')
+                    run = []
+                out.append(ch)
+            elif alt and ord(ch) in alt:
+                run.append(ch)
+        if run:
+            out.append(f'<font name="{fallback}">{"".join(run)}</font>')
+    return ''.join(out)
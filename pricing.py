@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Formules de tarification partagées (Février 2026)
+Frais de dossier fixes + mensualité ou versements journaliers.
+
+Ces formules reprennent celles du simulateur de index.html afin que les
+documents générés (prospectus, devis, relevés) affichent les mêmes montants
+que le site. Module sans dépendance : importable par tous les scripts.
+"""
+
+import math
+
+FRAIS_DOSSIER = 10000      # FCFA, forfait unique à la souscription
+MIN_DAILY = 1500           # FCFA, versement journalier minimum
+DEFAULT_DURATION = 24      # mois
+DURATIONS = (12, 24, 36)   # durées proposées dans le simulateur
+# Fréquences du simulateur : nombre de jours couverts par un versement
+SIM_FREQ_MULTIPLIERS = {'quotidien': 1, 'hebdomadaire': 7, 'bimensuel': 14, 'mensuel': 30, 'semestriel': 180}
+
+
+def mensualite(price, duration_months, monthly_amount=None):
+    """Mensualité du lot : montant contractuel s'il existe, sinon prix / durée arrondi au franc supérieur."""
+    if monthly_amount:
+        return int(monthly_amount)
+    duration = int(duration_months or 0) or DEFAULT_DURATION
+    return math.ceil(int(price or 0) / duration)
+
+
+def versements_par_mois(monthly):
+    """Nombre de versements journaliers minimum couvrant une mensualité."""
+    return math.ceil(int(monthly) / MIN_DAILY)
+
+
+def fcfa(amount):
+    """Formate un montant à la française : 1500000 → '1 500 000 FCFA'."""
+    return f'{int(amount):,} FCFA'.replace(',', ' ')
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+TERRASOCIAL — Relevés de compte par réservation (Février 2026)
+
+Rapproche les exports des tables `reservations` et `payments` avec
+l'échéancier contractuel : montant attendu à date (mensuel, ou journalier à
+partir de 1 500 FCFA), montant payé, arriérés, avance, reste à payer et date
+de fin projetée. Les calculs portent sur des colonnes NumPy entières : aucune
+boucle Python par réservation ou par paiement.
+
+Usage :
+    python3 releves.py reservations.csv payments.csv [--as-of 2026-03-01]
+                       [--summary releves.csv] [--pdf-dir releves/] [--jobs N] [--only 12,15]
+
+Dépendances : numpy (calculs), reportlab (relevés PDF uniquement).
+"""
+
+import os
+import sys
+import csv
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date
+
+import numpy as np
+
+from pricing import MIN_DAILY, fcfa
+
+# Fréquences du simulateur : (période en jours, période en mois)
+FREQUENCIES = {
+    'quotidien':    (1, 0),
+    'hebdomadaire': (7, 0),
+    'bimensuel':    (14, 0),
+    'mensuel':      (0, 1),
+    'semestriel':   (0, 6),
+}
+FREQUENCY_ALIASES = {'journalier': 'quotidien', 'daily': 'quotidien', 'weekly': 'hebdomadaire',
+                     'monthly': 'mensuel'}
+DEFAULT_FREQUENCY = 'quotidien'   # valeur par défaut de reservations.payment_frequency
+PAID_STATUSES = ('paid', 'success', 'completed', 'confirmed')
+NAT = np.datetime64('NaT', 'D')
+
+
+# ── Chargement des exports (une liste par colonne) ──────────────────────────
+def read_columns(path):
+    """Lit un export CSV et renvoie {colonne: np.ndarray de chaînes}."""
+    with open(path, encoding='utf-8', newline='') as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        columns = list(zip(*reader)) or [()] * len(header)
+    return {name: np.array(values, dtype=str) for name, values in zip(header, columns)}
+
+
+def _ints(cols, name, n):
+    values = cols.get(name)
+    if values is None or len(values) == 0:
+        return np.zeros(n, dtype=np.int64)
+    values = np.where(np.char.strip(values) == '', '0', values)
+    return values.astype(np.float64).astype(np.int64)
+
+
+def _strs(cols, name, n, default=''):
+    values = cols.get(name)
+    if values is None or len(values) == 0:
+        return np.full(n, default, dtype=object)
+    return np.where(values == '', default, values).astype(object)
+
+
+def _dates(cols, name, n):
+    """Dates ISO (ou timestamps 'YYYY-MM-DD HH:MM…') → datetime64[D] ; vide → NaT."""
+    values = cols.get(name)
+    if values is None or len(values) == 0:
+        return np.full(n, NAT)
+    return values.astype('U10').astype('datetime64[D]')
+
+
+def load_reservations(path):
+    cols = read_columns(path)
+    n = len(next(iter(cols.values()), ()))
+    freq = np.char.lower(_strs(cols, 'payment_frequency', n, DEFAULT_FREQUENCY).astype(str)).astype(object)
+    for alias, name in FREQUENCY_ALIASES.items():
+        freq[freq == alias] = name
+    return {
+        'id': _ints(cols, 'id', n),
+        'name': _strs(cols, 'lead_name', n, 'Client TERRASOCIAL'),
+        'lot': _strs(cols, 'lot_type', n, 'Lot'),
+        'price': _ints(cols, 'lot_price', n),
+        'duration': _ints(cols, 'duration_months', n),
+        'monthly_amount': _ints(cols, 'monthly_amount', n),
+        'daily_amount': _ints(cols, 'daily_amount', n),
+        'frequency': freq,
+        'start': _dates(cols, 'created_at', n),
+    }
+
+
+def load_payments(path):
+    cols = read_columns(path)
+    n = len(next(iter(cols.values()), ()))
+    status = np.char.lower(_strs(cols, 'status', n, 'paid').astype(str))
+    return {
+        'reservation_id': _ints(cols, 'reservation_id', n),
+        'amount': _ints(cols, 'amount', n),
+        'paid_at': _dates(cols, 'paid_at', n),
+        'method': _strs(cols, 'method', n),
+        'paid': np.isin(status, PAID_STATUSES),
+    }
+
+
+# ── Arithmétique de dates vectorisée ─────────────────────────────────────────
+def _month_start(d):
+    return d.astype('datetime64[M]')
+
+
+def _day_of_month(d):
+    return (d - _month_start(d).astype('datetime64[D]')).astype(np.int64) + 1
+
+
+def months_between(start, end):
+    """Nombre de mois entiers écoulés de `start` à `end` (négatif si end < start)."""
+    months = (_month_start(end) - _month_start(start)).astype(np.int64)
+    return months - (_day_of_month(end) < _day_of_month(start))
+
+
+def add_months(d, k):
+    """d + k mois, le jour étant ramené au dernier jour du mois si nécessaire."""
+    target = _month_start(d) + np.asarray(k, dtype=np.int64)
+    length = ((target + 1).astype('datetime64[D]') - target.astype('datetime64[D]')).astype(np.int64)
+    return target.astype('datetime64[D]') + np.minimum(_day_of_month(d), length) - 1
+
+
+# ── Échéancier ───────────────────────────────────────────────────────────────
+def plan_terms(res):
+    """Colonnes dérivées du contrat : mensualité, montant journalier, période (jours ou mois)."""
+    duration = np.where(res['duration'] > 0, res['duration'], 24)
+    monthly = np.where(res['monthly_amount'] > 0, res['monthly_amount'],
+                       -(-res['price'] // duration))
+    daily = np.maximum(res['daily_amount'], MIN_DAILY)
+    names = sorted(FREQUENCIES)
+    codes = np.minimum(np.searchsorted(np.array(names), res['frequency'].astype(str)), len(names) - 1)
+    codes = np.where(np.isin(res['frequency'], names), codes, names.index(DEFAULT_FREQUENCY))
+    table = np.array([FREQUENCIES[k] for k in names], dtype=np.int64)
+    period_days, period_months = table[codes, 0], table[codes, 1]
+    return {
+        'duration': duration,
+        'monthly': monthly,
+        'daily': daily,
+        'period_days': period_days,
+        'period_months': period_months,
+        'installment': np.where(period_days > 0, daily * period_days, monthly * period_months),
+    }
+
+
+def expected_at(start, at, price, terms):
+    """Montant cumulé attendu à la date `at` (diffusion NumPy sur toutes les colonnes).
+
+    Une échéance est due à la fin de chaque période pleine écoulée depuis la
+    date de début ; le cumul est plafonné au prix du lot.
+    """
+    days = (at - start).astype(np.int64)
+    by_day = np.floor_divide(np.maximum(days, 0), np.maximum(terms['period_days'], 1))
+    by_month = np.floor_divide(np.maximum(months_between(start, at), 0), np.maximum(terms['period_months'], 1))
+    periods = np.where(terms['period_days'] > 0, by_day, by_month)
+    expected = np.minimum(periods * terms['installment'], price)
+    return np.where(np.isnat(start), 0, expected)
+
+
+def reconcile(res, pay, as_of):
+    """Rapproche tous les paiements de toutes les réservations en une passe vectorisée.
+
+    Renvoie un dict de colonnes alignées sur `res` (attendu, payé, arriérés,
+    avance, reste, date de fin projetée, statut) et, dans '_payments', les
+    paiements retenus triés par réservation pour les relevés détaillés.
+    """
+    as_of = np.datetime64(as_of, 'D')
+    n = len(res['id'])
+    terms = plan_terms(res)
+    start = np.where(np.isnat(res['start']), as_of, res['start'])
+
+    # Paiements → index de réservation (recherche dichotomique, pas de dict Python)
+    order = np.argsort(res['id'], kind='stable')
+    sorted_ids = res['id'][order]
+    pos = np.minimum(np.searchsorted(sorted_ids, pay['reservation_id']), max(n - 1, 0))
+    found = (sorted_ids[pos] == pay['reservation_id']) if n else np.zeros(len(pos), dtype=bool)
+    keep = found & pay['paid'] & ~(pay['paid_at'] > as_of)
+    idx = order[pos[keep]]
+    amounts = pay['amount'][keep]
+    paid_at = pay['paid_at'][keep]
+
+    paid = np.bincount(idx, weights=amounts, minlength=n).astype(np.int64)
+    count = np.bincount(idx, minlength=n)
+    last_int = np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(last_int, idx, paid_at.astype(np.int64))
+    last_paid = np.where(count > 0, last_int, np.iinfo(np.int64).min).astype('datetime64[D]')
+
+    expected = expected_at(start, as_of, res['price'], terms)
+    remaining = np.maximum(res['price'] - paid, 0)
+    periods_left = -(-remaining // np.maximum(terms['installment'], 1))
+    projected = np.where(
+        terms['period_days'] > 0,
+        as_of + periods_left * terms['period_days'],
+        add_months(np.full(n, as_of), periods_left * terms['period_months']),
+    )
+    projected = np.where(remaining == 0, last_paid, projected)
+
+    arrears = np.maximum(expected - paid, 0)
+    advance = np.maximum(paid - expected, 0)
+    status = np.select(
+        [remaining == 0, arrears > 0, advance > 0],
+        ['Soldé', 'En retard', 'En avance'],
+        default='À jour',
+    )
+
+    by_res = np.argsort(idx, kind='stable')
+    return {
+        **terms,
+        'start': start,
+        'expected': expected,
+        'paid': paid,
+        'payments': count,
+        'last_paid': last_paid,
+        'arrears': arrears,
+        'advance': advance,
+        'remaining': remaining,
+        'projected_end': projected,
+        'status': status,
+        '_payments': {
+            'index': idx[by_res],
+            'paid_at': paid_at[by_res],
+            'amount': amounts[by_res],
+            'method': pay['method'][keep][by_res],
+        },
+    }
+
+
+def schedule(start, price, terms_row, as_of=None, max_months=240):
+    """Échéancier mensuel d'une réservation : (fins de mois, attendu du mois, cumul attendu).
+
+    Les modes journaliers/hebdomadaires sont agrégés par mois pour rester lisibles.
+    """
+    terms = {k: np.int64(v) for k, v in terms_row.items()}
+    installment = max(int(terms['installment']), 1)
+    if terms['period_days'] > 0:
+        months = min(max_months, int(np.ceil(price / installment * terms['period_days'] / 28)) + 1)
+    else:
+        months = min(max_months, int(terms['duration']) + 1)
+    k = np.arange(1, max(months, 1) + 1)
+    ends = add_months(np.full(len(k), start), k)
+    cumulative = expected_at(np.full(len(k), start), ends, price, terms)
+    reached = np.flatnonzero(cumulative >= price)
+    if len(reached):
+        k, ends, cumulative = k[:reached[0] + 1], ends[:reached[0] + 1], cumulative[:reached[0] + 1]
+    due = np.diff(cumulative, prepend=0)
+    return ends, due, cumulative
+
+
+# ── Sorties ──────────────────────────────────────────────────────────────────
+SUMMARY_COLUMNS = ['reservation_id', 'client', 'lot', 'frequency', 'price', 'expected', 'paid',
+                   'arrears', 'advance', 'remaining', 'payments', 'last_paid', 'projected_end', 'status']
+
+
+def write_summary(path, res, rec):
+    with open(path, 'w', encoding='utf-8', newline='') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(SUMMARY_COLUMNS)
+        writer.writerows(zip(
+            res['id'], res['name'], res['lot'], res['frequency'], res['price'],
+            rec['expected'], rec['paid'], rec['arrears'], rec['advance'], rec['remaining'],
+            rec['payments'], np.datetime_as_string(rec['last_paid']),
+            np.datetime_as_string(rec['projected_end']), rec['status'],
+        ))
+
+
+def statement_tasks(res, rec, as_of, selected=None):
+    """Prépare une tâche de relevé par réservation (données Python simples, picklables)."""
+    pays = rec['_payments']
+    bounds = np.searchsorted(pays['index'], np.arange(len(res['id']) + 1))
+    term_keys = ('duration', 'monthly', 'daily', 'period_days', 'period_months', 'installment')
+    rows = range(len(res['id'])) if selected is None else selected
+    for i in rows:
+        lo, hi = bounds[i], bounds[i + 1]
+        yield {
+            'id': int(res['id'][i]),
+            'name': str(res['name'][i]),
+            'lot': str(res['lot'][i]),
+            'frequency': str(res['frequency'][i]),
+            'price': int(res['price'][i]),
+            'start': str(rec['start'][i]),
+            'as_of': str(as_of),
+            'terms': {k: int(rec[k][i]) for k in term_keys},
+            'summary': {k: int(rec[k][i]) for k in ('expected', 'paid', 'arrears', 'advance', 'remaining', 'payments')},
+            'projected_end': str(rec['projected_end'][i]),
+            'status': str(rec['status'][i]),
+            'payments': list(zip(map(str, pays['paid_at'][lo:hi]), map(int, pays['amount'][lo:hi]),
+                                 map(str, pays['method'][lo:hi]))),
+        }
+
+
+def _fmt_date(value):
+    return '—' if value in ('NaT', '', None) else f'{value[8:10]}/{value[5:7]}/{value[0:4]}'
+
+
+def build_statement(task, out):
+    """Rend le relevé PDF d'une réservation avec la charte du prospectus."""
+    import generate_prospectus as gp
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
+    s = task['summary']
+    period = (f"{task['terms']['period_days']} jour(s)" if task['terms']['period_days']
+              else f"{task['terms']['period_months']} mois")
+    info = [
+        ['Client :', task['name']],
+        ['Lot :', f"{task['lot']} — {fcfa(task['price'])}"],
+        ['Fréquence :', f"{task['frequency']} ({fcfa(task['terms']['installment'])} / {period})"],
+        ['Début du contrat :', _fmt_date(task['start'])],
+        ['Arrêté au :', _fmt_date(task['as_of'])],
+    ]
+    summary = [
+        ['Attendu à date', 'Payé', 'Arriérés', 'Avance', 'Reste à payer', 'Fin projetée'],
+        [fcfa(s['expected']), fcfa(s['paid']), fcfa(s['arrears']), fcfa(s['advance']),
+         fcfa(s['remaining']), _fmt_date(task['projected_end'])],
+    ]
+
+    ends, due, cumulative = schedule(np.datetime64(task['start'], 'D'), task['price'], task['terms'])
+    pay_dates = np.array([p[0] for p in task['payments']], dtype='datetime64[D]')
+    pay_amounts = np.array([p[1] for p in task['payments']], dtype=np.int64)
+    order = np.argsort(pay_dates)
+    paid_cum = np.concatenate([[0], np.cumsum(pay_amounts[order])])
+    paid_by_end = paid_cum[np.searchsorted(pay_dates[order], ends, side='right')]
+    sched = [['Échéance', 'Attendu', 'Cumul attendu', 'Cumul payé', 'Écart']]
+    as_of = np.datetime64(task['as_of'], 'D')
+    for end, d, c, p in zip(np.datetime_as_string(ends), due, cumulative, paid_by_end):
+        past = np.datetime64(end) <= as_of
+        sched.append([_fmt_date(end), fcfa(d), fcfa(c), fcfa(p) if past else '',
+                      fcfa(p - c) if past else ''])
+
+    payments = [['Date', 'Montant', 'Moyen']] + [
+        [_fmt_date(d), fcfa(a), m] for d, a, m in task['payments']
+    ]
+
+    col6 = [gp.CONTENT_W / 6] * 6
+    col5 = [gp.CONTENT_W / 5] * 5
+    story = [
+        Paragraph(f"Relevé de compte — Réservation n° {task['id']}", gp.H2_STYLE),
+        Paragraph(f"Statut : <b>{task['status']}</b>", gp.BODY_STYLE),
+        Table(info, colWidths=[gp.CONTENT_W * 0.30, gp.CONTENT_W * 0.70], style=gp.DEVIS_TS),
+        Spacer(1, 5 * gp.mm),
+        Table(summary, colWidths=col6, style=gp.LOTS_TS),
+        Spacer(1, 5 * gp.mm),
+        gp.hr(gp.GREEN),
+        Paragraph('Échéancier', gp.H3_STYLE),
+        Table(sched, colWidths=col5, style=gp.LOTS_TS, repeatRows=1),
+        Spacer(1, 5 * gp.mm),
+        gp.hr(gp.GREEN),
+        Paragraph('Paiements reçus', gp.H3_STYLE),
+        Table(payments, colWidths=[gp.CONTENT_W / 3] * 3, style=gp.LOTS_TS, repeatRows=1)
+        if task['payments'] else Paragraph('Aucun paiement enregistré.', gp.ITALIC_STYLE),
+    ]
+    doc = SimpleDocTemplate(
+        out, pagesize=gp.A4,
+        leftMargin=gp.MARGIN, rightMargin=gp.MARGIN,
+        topMargin=20 * gp.mm, bottomMargin=12 * gp.mm,
+        title=f"Relevé TERRASOCIAL - Réservation {task['id']}",
+        author=gp.DEFAULT_DATA['author'],
+    )
+    doc.build(story, onFirstPage=gp.on_later_page, onLaterPages=gp.on_later_page)
+    return out
+
+
+def _render_statement(job):
+    task, out_dir = job
+    import generate_prospectus as gp
+    try:
+        out = gp.shard_path(out_dir, str(task['id']), prefix='Releve_TERRASOCIAL')
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        build_statement(task, out)
+        return task['id'], out, None
+    except Exception as e:
+        return task['id'], None, f'{type(e).__name__}: {e}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TERRASOCIAL — Relevés de compte par réservation')
+    parser.add_argument('reservations', help='Export CSV de la table reservations')
+    parser.add_argument('payments', help='Export CSV de la table payments')
+    parser.add_argument('--as-of', default=date.today().isoformat(), help="Date d'arrêté (défaut : aujourd'hui)")
+    parser.add_argument('--summary', default='releves.csv', help='CSV de synthèse (une ligne par réservation)')
+    parser.add_argument('--pdf-dir', help='Dossier des relevés PDF (aucun PDF si absent)')
+    parser.add_argument('--only', help='Limiter les PDF à ces identifiants de réservation (séparés par des virgules)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Processus pour les PDF (défaut : tous les cœurs)')
+    args = parser.parse_args(argv)
+
+    res = load_reservations(args.reservations)
+    pay = load_payments(args.payments)
+    rec = reconcile(res, pay, args.as_of)
+    write_summary(args.summary, res, rec)
+    late = int(np.count_nonzero(rec['arrears'] > 0))
+    print(f"✅ {len(res['id'])} réservation(s), {len(pay['amount'])} paiement(s) rapprochés → {args.summary}")
+    print(f"   {late} en retard — arriérés cumulés {fcfa(rec['arrears'].sum())}")
+
+    if args.pdf_dir:
+        selected = None
+        if args.only:
+            wanted = np.array([int(x) for x in args.only.split(',') if x.strip()])
+            selected = np.flatnonzero(np.isin(res['id'], wanted))
+        tasks = statement_tasks(res, rec, args.as_of, selected)
+        workers = args.jobs or os.cpu_count() or 1
+        errors = 0
+        pending = set()
+        # Soumission au fil de l'eau (au plus 4 tâches en attente par worker,
+        # comme generate_prospectus.run_batch) : mémoire bornée quel que soit
+        # le nombre de réservations
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < workers * 4:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    pending.add(pool.submit(_render_statement, (task, args.pdf_dir)))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    rid, out, error = future.result()
+                    if error:
+                        errors += 1
+                        print(f'❌ Réservation {rid} : {error}')
+        print(f'✅ Relevés PDF dans {args.pdf_dir} ({errors} erreur(s))')
+        return 1 if errors else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+// Build Vercel : assemble dist/ (outputDirectory de vercel.json).
+// Vercel sert un fichier existant avant d'appliquer les rewrites : pour que
+// /index.html soit la page minifiée, dist/ contient le site avec chaque page
+// remplacée par sa copie de build/pages/ (build_assets.py), à condition que
+// build/pages-sources.json l'associe à l'empreinte de la source actuelle.
+// Une copie périmée (page modifiée sans relancer DEPLOY.py --build-assets)
+// est ignorée : la page source est servie.
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+
+const root = path.join(__dirname, '..');
+const outDir = path.join(root, 'dist');
+const pagesDir = path.join(root, 'build', 'pages');
+const sourcesPath = path.join(root, 'build', 'pages-sources.json');
+const SKIP = new Set(['.git', 'node_modules', 'dist', '.vercel', '.cache']);
+
+function rev(file) {
+  return crypto.createHash('sha256').update(fs.readFileSync(file)).digest('hex').slice(0, 12);
+}
+
+fs.rmSync(outDir, { recursive: true, force: true });
+for (const name of fs.readdirSync(root)) {
+  if (!SKIP.has(name)) fs.cpSync(path.join(root, name), path.join(outDir, name), { recursive: true });
+}
+
+const sources = fs.existsSync(sourcesPath) ? JSON.parse(fs.readFileSync(sourcesPath, 'utf8')) : {};
+const served = [];
+const stale = [];
+for (const [page, digest] of Object.entries(sources)) {
+  const source = path.join(root, page);
+  const minified = path.join(pagesDir, page);
+  if (!fs.existsSync(source) || !fs.existsSync(minified)) continue;
+  if (rev(source) !== digest) {
+    stale.push(page);
+    continue;
+  }
+  fs.copyFileSync(minified, path.join(outDir, page));
+  served.push(page);
+}
+
+console.log(`dist/ : ${served.length} page(s) minifiée(s) servie(s)`);
+if (stale.length) {
+  console.warn(`⚠️  Copie minifiée périmée, page source servie : ${stale.join(', ')} (relancez DEPLOY.py --build-assets)`);
+}
@@ -1,22 +1,93 @@
-const CACHE_NAME = 'terrasocial-v1';
+const CACHE_NAME = 'terrasocial-assets';
+// Manifeste de précache empreinté, réécrit par build_assets.py (null : pas encore de build)
+const PRECACHE_MANIFEST = null;
+// Sans manifeste (site servi sans build_assets.py) : ressources précachées sous leur nom d'origine
 const URLS_TO_CACHE = [
   '/index.html',
+  '/404.html',
   '/css/app.css',
   '/js/app-api.js',
   '/assets/favicon.svg'
 ];
 
+// Chaque ressource est mise en cache sous le nom de sa copie empreintée
+// (/build/js/app-api.<hash>.js) : une ressource inchangée d'un déploiement
+// à l'autre garde le même nom et n'est jamais retéléchargée.
+let manifestPromise = null;
+
+function fallbackManifest() {
+  const assets = URLS_TO_CACHE.map((url) => ({ url, path: url, precache: true }));
+  return { assets, byUrl: new Map(assets.map((asset) => [asset.url, asset])) };
+}
+
+function loadManifest() {
+  if (!PRECACHE_MANIFEST) return Promise.resolve(fallbackManifest());
+  if (!manifestPromise) {
+    manifestPromise = caches.open(CACHE_NAME)
+      .then((cache) => cache.match(PRECACHE_MANIFEST).then((hit) => hit || fetch(PRECACHE_MANIFEST).then((res) => {
+        if (!res.ok) throw new Error(`manifeste ${res.status}`);
+        cache.put(PRECACHE_MANIFEST, res.clone());
+        return res;
+      })))
+      .then((res) => res.json())
+      .then((manifest) => {
+        manifest.byUrl = new Map(manifest.assets.map((asset) => [asset.url, asset]));
+        return manifest;
+      })
+      .catch(() => {
+        manifestPromise = null;
+        return { assets: [], byUrl: new Map() };
+      });
+  }
+  return manifestPromise;
+}
+
+function cachedAsset(asset) {
+  return caches.open(CACHE_NAME).then((cache) => cache.match(asset.path).then((hit) => hit || fetch(asset.path).then((res) => {
+    if (res.ok) cache.put(asset.path, res.clone());
+    return res;
+  })));
+}
+
 self.addEventListener('install', (event) => {
-  event.waitUntil(caches.open(CACHE_NAME).then((cache) => cache.addAll(URLS_TO_CACHE)));
+  event.waitUntil(
+    loadManifest()
+      .then((manifest) => Promise.all(manifest.assets.filter((asset) => asset.precache).map(cachedAsset)))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    Promise.all([loadManifest(), caches.keys()])
+      .then(([manifest, names]) => {
+        const live = new Set(manifest.assets.map((asset) => asset.path));
+        if (PRECACHE_MANIFEST) live.add(PRECACHE_MANIFEST);
+        return Promise.all([
+          ...names.filter((name) => name !== CACHE_NAME).map((name) => caches.delete(name)),
+          caches.open(CACHE_NAME).then((cache) => cache.keys().then((requests) => Promise.all(
+            requests
+              .filter((request) => !live.has(new URL(request.url).pathname))
+              .map((request) => cache.delete(request))
+          ))),
+        ]);
+      })
+      .then(() => self.clients.claim())
+  );
 });
 
 self.addEventListener('fetch', (event) => {
   if (event.request.method !== 'GET') return;
+  const url = new URL(event.request.url);
+  if (url.origin !== self.location.origin) return;
+  const pathname = url.pathname === '/' ? '/index.html' : url.pathname;
 
   event.respondWith(
-    caches.match(event.request).then((cached) => {
-      if (cached) return cached;
-      return fetch(event.request).catch(() => caches.match('/404.html'));
+    loadManifest().then((manifest) => {
+      const asset = manifest.byUrl.get(pathname);
+      if (asset) return cachedAsset(asset).catch(() => fetch(event.request));
+      const notFound = manifest.byUrl.get('/404.html');
+      return fetch(event.request).catch(() => caches.match(notFound ? notFound.path : '/404.html'));
     })
   );
 });
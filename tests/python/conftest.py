@@ -0,0 +1,8 @@
+"""Tests des scripts Python de la racine (python3 -m pytest tests/python)."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,65 @@
+import json
+
+import bench_documents as bench
+
+
+def _run(seconds, items=10, calibration=0.5, rss=1000):
+    return {'seconds': seconds, 'cpu_seconds': seconds, 'rate': items / seconds, 'items': items,
+            'unit': 'docs', 'peak_rss_kb': rss, 'calibration': calibration}
+
+
+def _bench(python='3.11.7', **phases):
+    return {'machine': {'python': python}, 'phases': phases}
+
+
+def test_sub_floor_timings_are_not_regressions():
+    baseline = {'phases': {'copy_warm': _run(0.002)}}
+    current = {'phases': {'copy_warm': _run(0.009)}}
+    assert bench.compare(current, baseline, 0.25, min_seconds=0.05) == []
+    assert {key for _, key, *_ in bench.compare(current, baseline, 0.25, min_seconds=0)} == {'seconds', 'rate'}
+
+
+def test_slow_phase_above_floor_is_a_regression():
+    baseline = {'phases': {'update_docx': _run(1.0)}}
+    current = {'phases': {'update_docx': _run(2.0)}}
+    assert {key for _, key, *_ in bench.compare(current, baseline, 0.25)} == {'seconds', 'rate'}
+
+
+def test_missing_baseline_fails_without_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, 'build_corpus', lambda work, params: tmp_path)
+    monkeypatch.setattr(bench, 'run_phase_repeated', lambda *args: _run(0.1))
+    baseline = tmp_path / 'baseline.json'
+    argv = ['--phases', 'releves', '--work', str(tmp_path), '--baseline', str(baseline)]
+    assert bench.main(argv) == 2
+    assert not baseline.exists()
+    assert bench.main(argv + ['--save-baseline']) == 0
+    assert baseline.exists()
+    assert bench.main(argv) == 0
+
+
+def test_slower_machine_is_normalised_by_calibration():
+    baseline = _bench(update_docx=_run(1.0, calibration=0.5))
+    slower = _bench(update_docx=_run(2.0, calibration=1.0))
+    assert bench.compare(slower, baseline, 0.25) == []
+    regressed = _bench(update_docx=_run(3.0, calibration=1.0))
+    assert {key for _, key, *_ in bench.compare(regressed, baseline, 0.25)} == {'seconds', 'rate'}
+
+
+def test_rss_compared_only_on_same_python():
+    baseline = _bench(releves=_run(1.0, rss=1000))
+    current = _bench(releves=_run(1.0, rss=2000))
+    assert {key for _, key, *_ in bench.compare(current, baseline, 0.25)} == {'peak_rss_kb'}
+    current['machine']['python'] = '3.12.1'
+    assert bench.compare(current, baseline, 0.25) == []
+
+
+def test_baseline_without_calibration_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, 'build_corpus', lambda work, params: tmp_path)
+    monkeypatch.setattr(bench, 'run_phase_repeated', lambda *args: _run(0.1))
+    baseline = tmp_path / 'baseline.json'
+    argv = ['--phases', 'releves', '--work', str(tmp_path), '--baseline', str(baseline)]
+    assert bench.main(argv + ['--save-baseline']) == 0
+    stale = json.loads(baseline.read_text(encoding='utf-8'))
+    del stale['phases']['releves']['calibration']
+    baseline.write_text(json.dumps(stale), encoding='utf-8')
+    assert bench.main(argv) == 2
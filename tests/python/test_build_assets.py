@@ -0,0 +1,41 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import build_assets
+
+REPO = Path(build_assets.__file__).parent
+PAGE = '<!DOCTYPE html>\n<html>\n  <head>\n    <!-- commentaire -->\n    <title>Lots</title>\n  </head>\n  <body><p>Terrains   titrés</p></body>\n</html>\n'
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / 'lots.html').write_text(PAGE, encoding='utf-8')
+    (tmp_path / 'scripts').mkdir()
+    shutil.copy(REPO / 'scripts' / 'vercel-output.js', tmp_path / 'scripts')
+    build_assets.build_pages(['lots.html'], root=tmp_path, build_dir=tmp_path / 'build', jobs=1,
+                             use_brotli=False, check_js=False)
+    return tmp_path
+
+
+def test_page_sources_record_the_minified_source(site):
+    sources = json.loads((site / 'build' / build_assets.PAGE_SOURCES).read_text(encoding='utf-8'))
+    assert sources == {'lots.html': build_assets.rev(PAGE.encode('utf-8'))}
+    assert not (site / 'build' / 'pages' / build_assets.PAGE_SOURCES).exists()
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='Node.js absent')
+def test_vercel_output_serves_fresh_minified_pages_only(site):
+    subprocess.run(['node', 'scripts/vercel-output.js'], cwd=site, check=True, capture_output=True)
+    minified = (site / 'build' / 'pages' / 'lots.html').read_bytes()
+    assert (site / 'dist' / 'lots.html').read_bytes() == minified
+    assert len(minified) < len(PAGE)
+    assert not (site / 'dist' / 'dist').exists()
+
+    (site / 'lots.html').write_text(PAGE + '<!-- modifiée -->\n', encoding='utf-8')
+    proc = subprocess.run(['node', 'scripts/vercel-output.js'], cwd=site, check=True, capture_output=True, text=True)
+    assert (site / 'dist' / 'lots.html').read_text(encoding='utf-8') == PAGE + '<!-- modifiée -->\n'
+    assert 'lots.html' in proc.stderr
@@ -0,0 +1,76 @@
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from deploy_git import GitError, STALE_LOCK_SECONDS, finish_deploy, start_deploy
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git absent')
+
+
+def git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Clone de travail poussant vers un dépôt nu local (remote 'origin', branche main)."""
+    for var in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{var}_NAME', 'Déploiement')
+        monkeypatch.setenv(f'GIT_{var}_EMAIL', 'deploy@terrasocial.test')
+    remote = tmp_path / 'remote.git'
+    work = tmp_path / 'work'
+    git(tmp_path, 'init', '-q', '--bare', '-b', 'main', str(remote))
+    git(tmp_path, 'init', '-q', '-b', 'main', str(work))
+    git(work, 'remote', 'add', 'origin', str(remote))
+    (work / 'index.html').write_text('<h1>TERRASOCIAL</h1>\n', encoding='utf-8')
+    git(work, 'add', 'index.html')
+    git(work, 'commit', '-q', '-m', 'initial')
+    git(work, 'push', '-q', 'origin', 'main')
+    return work, remote
+
+
+def test_noop_deploy_creates_no_commit_and_does_not_push(repo):
+    work, remote = repo
+    before = git(remote, 'rev-parse', 'main')
+    result = finish_deploy(start_deploy(work), ['index.html'], 'deploy')
+    assert result == {'commit': None, 'pushed': False}
+    assert git(work, 'rev-parse', 'HEAD') == before
+    assert git(remote, 'rev-parse', 'main') == before
+
+
+def test_changed_file_is_committed_once_and_pushed(repo):
+    work, remote = repo
+    before = git(work, 'rev-parse', 'HEAD')
+    (work / 'index.html').write_text('<h1>TERRASOCIAL — 2026</h1>\n', encoding='utf-8')
+    ctx = start_deploy(work)
+    assert ctx['sync'] == 'à jour'
+    result = finish_deploy(ctx, ['index.html'], 'deploy: index')
+    assert result['pushed']
+    assert git(work, 'rev-list', f'{before}..HEAD') == result['commit']
+    assert git(remote, 'rev-parse', 'main') == result['commit']
+    assert git(work, 'status', '--porcelain') == ''
+
+
+def test_stale_index_lock_is_cleared(repo):
+    work, _ = repo
+    lock = work / '.git' / 'index.lock'
+    lock.write_bytes(b'')
+    old = time.time() - STALE_LOCK_SECONDS - 60
+    os.utime(lock, (old, old))
+    ctx = start_deploy(work)
+    assert ctx['lock'] >= STALE_LOCK_SECONDS
+    assert not lock.exists()
+
+
+def test_fresh_index_lock_aborts(repo):
+    work, remote = repo
+    before = git(remote, 'rev-parse', 'main')
+    lock = work / '.git' / 'index.lock'
+    lock.write_bytes(b'')
+    with pytest.raises(GitError, match='index.lock'):
+        start_deploy(work)
+    assert lock.exists()
+    assert git(remote, 'rev-parse', 'main') == before
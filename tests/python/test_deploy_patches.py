@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+import deploy_patches as dp
+from deploy_patches import ALREADY, AMBIGUOUS, APPLIED, CONFLICT, MISSING
+
+
+def _patch(pid, old, new, count=1, files=('page.html',)):
+    return {'id': pid, 'description': '', 'files': list(files), 'old': old, 'new': new, 'count': count}
+
+
+def test_apply_to_text_is_idempotent_when_anchor_is_inside_new():
+    # L'ancre reste présente après application : seul le nouveau texte permet de conclure
+    patch = _patch('api', 'fetch(url)', 'fetch(url, {credentials: "include"})')
+    once, statuses = dp.apply_to_text('a = fetch(url);', [patch])
+    assert statuses == {'api': APPLIED}
+    twice, statuses = dp.apply_to_text(once, [patch])
+    assert twice == once and statuses == {'api': ALREADY}
+
+
+def test_apply_to_text_statuses():
+    text = 'titre\nprix: 1000\nprix: 2000\n'
+    new, statuses = dp.apply_to_text(text, [_patch('t', 'titre', 'Titre'), _patch('x', 'absent', 'y')])
+    assert new == 'Titre\nprix: 1000\nprix: 2000\n'
+    assert statuses == {'t': APPLIED, 'x': MISSING}
+    new, statuses = dp.apply_to_text(text, [_patch('p', 'prix: ', 'Prix : ', count=2)])
+    assert new == 'titre\nPrix : 1000\nPrix : 2000\n' and statuses == {'p': APPLIED}
+
+
+@pytest.mark.parametrize('patches, status', [
+    # Deux occurrences pour une ancre attendue une fois
+    ([_patch('t', 'titre', 'Titre'), _patch('p', 'prix', 'Prix')], AMBIGUOUS),
+    # Deux correctifs sur la même ancre
+    ([_patch('t', 'titre', 'Titre'), _patch('t2', 'titre', 'TITRE')], CONFLICT),
+])
+def test_ambiguous_or_conflicting_patches_leave_file_untouched(tmp_path, patches, status):
+    path = tmp_path / 'page.html'
+    path.write_text('titre\nprix: 1000\nprix: 2000\n', encoding='utf-8')
+    before = path.read_bytes()
+    result = dp.patch_file(tmp_path, 'page.html', patches)
+    assert result['status'] == 'erreur'
+    assert status in result['patches'].values()
+    assert result['state'] is None
+    assert path.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == ['page.html']
+
+
+def _write_patchset(path, patches):
+    path.write_text(json.dumps({'patches': patches}, ensure_ascii=False), encoding='utf-8')
+
+
+def test_state_file_skips_unchanged_files(tmp_path, monkeypatch):
+    (tmp_path / 'page.html').write_text('<h1>titre</h1>', encoding='utf-8')
+    patchset, state = tmp_path / 'patches.json', tmp_path / 'state.json'
+    _write_patchset(patchset, [{'id': 't', 'file': 'page.html', 'old': 'titre', 'new': 'Titre'}])
+
+    [first] = dp.apply_patchset(patchset, tmp_path, state)
+    assert first['status'] == 'modifié' and first['patches'] == {'t': APPLIED}
+    assert (tmp_path / 'page.html').read_text(encoding='utf-8') == '<h1>Titre</h1>'
+
+    real_apply = dp.apply_to_text
+
+    def must_not_parse(text, patches):
+        raise AssertionError('fichier réanalysé malgré le fichier d\'état')
+    monkeypatch.setattr(dp, 'apply_to_text', must_not_parse)
+    [second] = dp.apply_patchset(patchset, tmp_path, state)
+    assert second['status'] == 'inchangé' and second['patches'] == {'t': ALREADY}
+
+    # Fichier modifié depuis, ou jeu de correctifs modifié : nouvelle analyse
+    monkeypatch.setattr(dp, 'apply_to_text', real_apply)
+    (tmp_path / 'page.html').write_text('<h1>Titre</h1>\n', encoding='utf-8')
+    [third] = dp.apply_patchset(patchset, tmp_path, state)
+    assert third['status'] == 'sans changement' and third['patches'] == {'t': ALREADY}
+    _write_patchset(patchset, [{'id': 't', 'file': 'page.html', 'old': 'Titre', 'new': 'TITRE'}])
+    [fourth] = dp.apply_patchset(patchset, tmp_path, state)
+    assert fourth['status'] == 'modifié'
+
+
+def test_dry_run_writes_neither_file_nor_state(tmp_path):
+    (tmp_path / 'page.html').write_text('titre\n', encoding='utf-8')
+    patchset, state = tmp_path / 'patches.json', tmp_path / 'state.json'
+    _write_patchset(patchset, [{'id': 't', 'file': 'page.html', 'old': 'titre', 'new': 'Titre'}])
+    [result] = dp.apply_patchset(patchset, tmp_path, state, dry_run=True)
+    assert result['status'] == 'modifié' and '+Titre' in result['diff']
+    assert (tmp_path / 'page.html').read_text(encoding='utf-8') == 'titre\n'
+    assert not state.exists()
@@ -0,0 +1,66 @@
+import pytest
+
+import deploy_store as ds
+from deploy_store import StoreError
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Magasin capturé depuis src/, à synchroniser vers site/."""
+    src, site = tmp_path / 'src', tmp_path / 'site'
+    (src / 'legal').mkdir(parents=True)
+    site.mkdir()
+    (src / 'cgv.html').write_text('<h1>CGV</h1>', encoding='utf-8')
+    (src / 'legal' / 'cgu.html').write_text('<h1>CGU</h1>', encoding='utf-8')
+    captured = ds.capture(tmp_path / 'store', tmp_path / 'files.json', src, ['cgv.html', 'legal/cgu.html'])
+    return tmp_path, captured
+
+
+def _args(tmp_path):
+    return tmp_path / 'store', tmp_path / 'files.json', tmp_path / 'site'
+
+
+def test_sync_writes_only_changed_files(store):
+    tmp_path, captured = store
+    assert ds.sync_from_store(*_args(tmp_path)) == [('cgv.html', 'écrit'), ('legal/cgu.html', 'écrit')]
+    assert (tmp_path / 'site' / 'legal' / 'cgu.html').read_text(encoding='utf-8') == '<h1>CGU</h1>'
+    assert ds.sync_from_store(*_args(tmp_path)) == [('cgv.html', 'identique'), ('legal/cgu.html', 'identique')]
+    (tmp_path / 'site' / 'cgv.html').write_text('modifié', encoding='utf-8')
+    assert ds.sync_from_store(*_args(tmp_path), dry_run=True)[0] == ('cgv.html', 'à écrire')
+    assert (tmp_path / 'site' / 'cgv.html').read_text(encoding='utf-8') == 'modifié'
+
+
+def test_corrupted_object_is_refused_and_target_untouched(store):
+    tmp_path, captured = store
+    ds.sync_from_store(*_args(tmp_path))
+    (tmp_path / 'site' / 'cgv.html').write_text('version locale', encoding='utf-8')
+    (tmp_path / 'store' / captured['cgv.html']).write_bytes(b'<h1>CGV tronqu')
+    with pytest.raises(StoreError, match='corrompu'):
+        ds.sync_from_store(*_args(tmp_path))
+    assert (tmp_path / 'site' / 'cgv.html').read_text(encoding='utf-8') == 'version locale'
+
+
+def test_missing_object_is_refused(store):
+    tmp_path, captured = store
+    (tmp_path / 'store' / captured['legal/cgu.html']).unlink()
+    with pytest.raises(StoreError, match='absent'):
+        ds.sync_from_store(*_args(tmp_path))
+    assert not (tmp_path / 'site' / 'legal' / 'cgu.html').exists()
+
+
+def test_capture_repairs_corrupted_object_and_drops_unreferenced(store):
+    tmp_path, captured = store
+    obj = tmp_path / 'store' / captured['cgv.html']
+    obj.write_bytes(b'corrompu')
+    (tmp_path / 'src' / 'legal' / 'cgu.html').write_text('<h1>CGU v2</h1>', encoding='utf-8')
+    again = ds.capture(tmp_path / 'store', tmp_path / 'files.json', tmp_path / 'src', ['cgv.html', 'legal/cgu.html'])
+    assert again['cgv.html'] == captured['cgv.html']
+    assert ds.read_object(tmp_path / 'store', captured['cgv.html']) == b'<h1>CGV</h1>'
+    assert sorted(p.name for p in (tmp_path / 'store').iterdir()) == sorted(again.values())
+    assert ds.load_manifest(tmp_path / 'files.json') == again
+
+
+def test_unknown_manifest_version_is_refused(tmp_path):
+    (tmp_path / 'files.json').write_text('{"version": 99, "files": {}}', encoding='utf-8')
+    with pytest.raises(StoreError):
+        ds.sync_from_store(tmp_path, tmp_path / 'files.json', tmp_path)
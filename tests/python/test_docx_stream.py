@@ -0,0 +1,80 @@
+import io
+import struct
+import zipfile
+import zlib
+
+import pytest
+
+docx = pytest.importorskip('docx')
+
+import docx_stream
+from docx_rules import RuleSet
+
+RULES = RuleSet([('acompte de 10%', 'frais de dossier de 10 000 FCFA', 'Acompte → frais dossier')])
+XML_COMMENT = '<!-- revue juridique -->'
+XML_PI = '<?terrasocial-marker v1?>'
+
+
+def _png():
+    """PNG 1×1 minimal (membre word/media/ du document)."""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff')) + chunk(b'IEND', b''))
+
+
+@pytest.fixture
+def source_docx(tmp_path):
+    """Document avec image, commentaire Word, en-tête, commentaire XML et instruction de traitement."""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = 'TERRASOCIAL — en-tête'
+    paragraph = document.add_paragraph('Un acompte de 10% est demandé.')
+    document.add_comment(paragraph.runs, text='À vérifier', author='Juridique')
+    document.add_picture(io.BytesIO(_png()))
+    plain = tmp_path / 'plain.docx'
+    document.save(plain)
+
+    # Commentaire XML et instruction de traitement dans word/document.xml
+    src = tmp_path / 'source.docx'
+    with zipfile.ZipFile(plain) as zin, zipfile.ZipFile(src, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info)
+            if info.filename == 'word/document.xml':
+                data = data.replace(b'<w:body>', f'<w:body>{XML_COMMENT}{XML_PI}'.encode('utf-8'), 1)
+            zout.writestr(info, data)
+    return src
+
+
+@pytest.mark.parametrize('raw', [True, False], ids=['copie-brute', 'api-publique'])
+def test_rewrite_round_trip(source_docx, tmp_path, monkeypatch, raw):
+    if not raw:
+        monkeypatch.setattr(docx_stream, 'raw_copy_supported', lambda dst_zf: False)
+    out = tmp_path / 'out.docx'
+    result = docx_stream.rewrite_docx(source_docx, out, RULES)
+    assert result['changed']
+    assert result['modifications'] == ['Acompte → frais dossier']
+
+    reopened = docx.Document(out)
+    assert 'frais de dossier de 10 000 FCFA' in reopened.paragraphs[0].text
+    assert reopened.sections[0].header.paragraphs[0].text == 'TERRASOCIAL — en-tête'
+    assert len(reopened.inline_shapes) == 1
+    assert [c.text for c in reopened.comments] == ['À vérifier']
+
+    with zipfile.ZipFile(source_docx) as before, zipfile.ZipFile(out) as after:
+        assert after.namelist() == before.namelist()
+        for info in before.infolist():
+            if info.filename == 'word/document.xml':
+                continue
+            assert after.read(info.filename) == before.read(info.filename), info.filename
+            if raw:
+                assert after.getinfo(info.filename).compress_size == info.compress_size
+        document_xml = after.read('word/document.xml').decode('utf-8')
+    assert XML_COMMENT in document_xml
+    assert XML_PI in document_xml
+
+
+def test_untouched_document_is_not_written(source_docx, tmp_path):
+    out = tmp_path / 'out.docx'
+    result = docx_stream.rewrite_docx(source_docx, out, RuleSet([('introuvable', 'x', 'x')]))
+    assert not result['changed']
+    assert not out.exists()
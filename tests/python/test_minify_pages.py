@@ -0,0 +1,73 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from minify_pages import minify_css, minify_js
+
+
+@pytest.mark.parametrize('css, expected', [
+    ('a  {\n  color: red ;\n}\n/* commentaire */ b { }', 'a{color:red}b{}'),
+    ('a::after { content: "  /* pas un commentaire */  " ; }', 'a::after{content:"  /* pas un commentaire */  "}'),
+    ("a { background: url( 'x y.png' ) }", "a{background:url('x y.png')}"),
+    # Blancs significatifs : combinateur descendant, calc(), valeurs multiples
+    ('.a :hover , .b > .c { width: calc(100% - 2px); margin: 0 auto }',
+     '.a :hover,.b > .c{width:calc(100% - 2px);margin:0 auto}'),
+    ('@media (max-width: 600px) {\n  .x { display: none; }\n}', '@media (max-width:600px){.x{display:none}}'),
+])
+def test_minify_css(css, expected):
+    assert minify_css(css) == expected
+
+
+@pytest.mark.parametrize('src, expected', [
+    ('var a = 1 ; // commentaire\nvar b = 2', 'var a=1;var b=2'),
+    ("const s = '// pas un commentaire'; /* bloc */ x = s", "const s='// pas un commentaire';x=s"),
+    ('s = "l\'apostrophe \\" ici"', 's="l\'apostrophe \\" ici"'),
+    # Expression régulière ou division selon le jeton précédent
+    ('const r = /[/]\\/*x/g.test(s); y = a / b / c', 'const r=/[/]\\/*x/g.test(s);y=a/b/c'),
+    ('return /ab+c/i.exec(s)', 'return/ab+c/i.exec(s)'),
+    # Gabarits imbriqués : le texte du gabarit n'est pas touché
+    ('t = `a ${ b + `c ${ d } e` } // f`; g()', 't=`a ${b+`c ${d} e`} // f`;g()'),
+    # Fins de ligne conservées (insertion automatique des points-virgules)
+    ('a = b\n++c', 'a=b\n++c'),
+    ('x = a\n/* multi\nligne */\ny = b', 'x=a\ny=b'),
+    ('x = a + +b; y = a - -b', 'x=a+ +b;y=a- -b'),
+    ('n = 1 .toString(); m = 1.5', 'n=1 .toString();m=1.5'),
+])
+def test_minify_js_tokens(src, expected):
+    assert minify_js(src) == expected
+
+
+SCRIPT = r"""
+// Calculs du simulateur (extrait réduit)
+const out = [];
+let a = 10, b = 2, c = 1
+let d = a
+++c
+out.push(d, c);                                  /* ASI : d = a, puis ++c */
+out.push(a / b / 5, '/* texte */', "// texte");
+out.push(/\d+\/[a-z]*/g.test('12/ab') ? 'regex' : 'division');
+const tpl = `lot ${a + `n°${b}`} — ${ {x: 1}.x } // fin`;
+out.push(tpl);
+function f(x) {
+  return x
+    * 2
+}
+out.push(f(3), a - -b, a+ +b, 1 .toString());
+const re = /[/*]+/;
+out.push('a/*b'.replace(re, '|'));
+out.push(typeof /x/ === 'object');
+console.log(JSON.stringify(out));
+"""
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='Node.js absent')
+def test_minified_script_behaves_like_the_original():
+    def run(src):
+        proc = subprocess.run(['node', '-e', src], capture_output=True, text=True, check=True, timeout=60)
+        return json.loads(proc.stdout)
+
+    minified = minify_js(SCRIPT)
+    assert len(minified) < len(SCRIPT)
+    assert run(minified) == run(SCRIPT)
@@ -0,0 +1,57 @@
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('reportlab')
+
+import pdf_fonts
+from reportlab.pdfbase.ttfonts import TTFont
+
+
+@pytest.fixture
+def vera():
+    return pdf_fonts.find_font(['Vera.ttf'])
+
+
+def test_cached_font_matches_fresh_parse(tmp_path, vera):
+    stats = {}
+    pdf_fonts.load_ttfont('T1', vera, cache_dir=tmp_path, stats=stats)
+    font = pdf_fonts.load_ttfont('T1', vera, cache_dir=tmp_path, stats=stats)
+    assert stats == {'parsed': 1, 'cache_hits': 1}
+    fresh = TTFont('T2', str(vera))
+    assert font.face.name == fresh.face.name
+    assert font.stringWidth(pdf_fonts.PROBE_TEXT, 10) == fresh.stringWidth(pdf_fonts.PROBE_TEXT, 10)
+    codes = [ord(ch) for ch in 'TERRASOCIAL']
+    assert font.face.makeSubset(codes) == fresh.face.makeSubset(codes)
+
+
+def test_restored_font_diverging_from_probe_is_reparsed(tmp_path, vera):
+    pdf_fonts.load_ttfont('T1', vera, cache_dir=tmp_path)
+    cache_file = pdf_fonts._cache_file(vera, 0, tmp_path)
+    entry = pickle.loads(cache_file.read_bytes())
+    entry['state']['charWidths'] = {code: 0 for code in entry['state']['charWidths']}
+    cache_file.write_bytes(pickle.dumps(entry))
+    stats = {}
+    font = pdf_fonts.load_ttfont('T1', vera, cache_dir=tmp_path, stats=stats)
+    assert stats == {'rejected': 1, 'parsed': 1}
+    assert font.stringWidth('A', 10) == TTFont('T2', str(vera)).stringWidth('A', 10)
+    assert pdf_fonts.load_ttfont('T1', vera, cache_dir=tmp_path, stats=stats) is not None
+    assert stats['cache_hits'] == 1
+
+
+def test_nothing_cached_when_restore_diverges(tmp_path, vera, monkeypatch):
+    monkeypatch.setattr(pdf_fonts, '_restore', lambda name, path, state: None)
+    pdf_fonts.load_ttfont('T1', vera, cache_dir=tmp_path)
+    assert not pdf_fonts._cache_file(vera, 0, tmp_path).exists()
+
+
+def test_missing_emoji_font_is_reported():
+    code = ('import pdf_fonts; pdf_fonts.EMOJI_FONTS[:] = []; '
+            'import generate_prospectus as gp; assert gp.EMOJI_FONT is None')
+    proc = subprocess.run([sys.executable, '-c', code], cwd=str(Path(pdf_fonts.__file__).parent),
+                          capture_output=True, text=True, encoding='utf-8', timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert "Aucune police d'emoji" in proc.stderr
@@ -0,0 +1,138 @@
+import calendar
+import csv
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import releves
+from pricing import MIN_DAILY
+
+AS_OF = date(2026, 3, 1)
+
+RESERVATIONS = [
+    # id, lot_price, duration_months, monthly_amount, daily_amount, payment_frequency, created_at
+    (1, 1200000, 24, 50000, 0, 'mensuel', '2025-11-15'),       # mensuel, en retard
+    (2, 1300000, 24, 0, 0, 'quotidien', '2026-02-01'),         # minimum journalier (1 500)
+    (3, 40000, 12, 0, 1500, 'hebdomadaire', '2026-01-05'),     # trop-perçu
+    (4, 900000, 0, 0, 0, 'semestriel', '2025-01-31'),          # aucun paiement, durée par défaut
+    (5, 600000, 20, 30000, 0, 'monthly', '2026-02-10 09:30'),  # paiement antérieur au début
+    (6, 500000, 24, 0, 2000, 'journalier', ''),                # date de début absente
+]
+PAYMENTS = [
+    # reservation_id, amount, paid_at, status
+    (1, 50000, '2025-12-15', 'paid'),
+    (1, 50000, '2026-01-15', 'paid'),
+    (1, 50000, '2026-02-15', 'failed'),       # échec : ignoré
+    (2, 20000, '2026-02-20', 'success'),
+    (3, 30000, '2026-01-12', 'paid'),
+    (3, 20000, '2026-02-02', 'paid'),
+    (3, 5000, '2026-04-01', 'paid'),          # postérieur à la date du relevé : ignoré
+    (5, 30000, '2026-01-20', 'completed'),
+    (99, 10000, '2026-02-01', 'paid'),        # réservation inconnue
+]
+
+
+# ── Référence ligne par ligne (dates Python, sans NumPy) ─────────────────────
+def ref_months_between(start, end):
+    return (end.year - start.year) * 12 + end.month - start.month - (end.day < start.day)
+
+
+def ref_add_months(d, k):
+    month = d.month - 1 + k
+    year, month = d.year + month // 12, month % 12 + 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def ref_terms(price, duration, monthly_amount, daily_amount, frequency):
+    frequency = releves.FREQUENCY_ALIASES.get(frequency, frequency)
+    period_days, period_months = releves.FREQUENCIES.get(frequency, releves.FREQUENCIES['quotidien'])
+    duration = duration or 24
+    monthly = monthly_amount or -(-price // duration)
+    daily = max(daily_amount, MIN_DAILY)
+    installment = daily * period_days if period_days else monthly * period_months
+    return {'duration': duration, 'monthly': monthly, 'daily': daily, 'period_days': period_days,
+            'period_months': period_months, 'installment': installment}
+
+
+def ref_expected(start, at, price, terms):
+    if terms['period_days']:
+        periods = max((at - start).days, 0) // terms['period_days']
+    else:
+        periods = max(ref_months_between(start, at), 0) // terms['period_months']
+    return min(periods * terms['installment'], price)
+
+
+def ref_row(row, as_of):
+    rid, price, duration, monthly_amount, daily_amount, frequency, created_at = row
+    terms = ref_terms(price, duration, monthly_amount, daily_amount, frequency)
+    start = date.fromisoformat(created_at[:10]) if created_at else as_of
+    kept = [(amount, date.fromisoformat(paid_at)) for res_id, amount, paid_at, status in PAYMENTS
+            if res_id == rid and status in releves.PAID_STATUSES and date.fromisoformat(paid_at) <= as_of]
+    paid = sum(amount for amount, _ in kept)
+    expected = ref_expected(start, as_of, price, terms)
+    remaining = max(price - paid, 0)
+    if remaining == 0:
+        projected = max(paid_at for _, paid_at in kept)
+    else:
+        left = -(-remaining // terms['installment'])
+        projected = (as_of + timedelta(days=left * terms['period_days']) if terms['period_days']
+                     else ref_add_months(as_of, left * terms['period_months']))
+    return {'expected': expected, 'paid': paid, 'payments': len(kept), 'remaining': remaining,
+            'arrears': max(expected - paid, 0), 'advance': max(paid - expected, 0),
+            'projected_end': projected.isoformat()}
+
+
+@pytest.fixture(scope='module')
+def reconciled(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp('releves')
+    with open(tmp / 'reservations.csv', 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['id', 'lot_price', 'duration_months', 'monthly_amount', 'daily_amount',
+                         'payment_frequency', 'created_at'])
+        writer.writerows(RESERVATIONS)
+    with open(tmp / 'payments.csv', 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['reservation_id', 'amount', 'paid_at', 'status'])
+        writer.writerows(PAYMENTS)
+    res = releves.load_reservations(str(tmp / 'reservations.csv'))
+    pay = releves.load_payments(str(tmp / 'payments.csv'))
+    return res, releves.reconcile(res, pay, np.datetime64(AS_OF.isoformat()))
+
+
+@pytest.mark.parametrize('i', range(len(RESERVATIONS)), ids=[str(r[0]) for r in RESERVATIONS])
+def test_reconcile_matches_reference(reconciled, i):
+    _, rec = reconciled
+    want = ref_row(RESERVATIONS[i], AS_OF)
+    got = {key: int(rec[key][i]) for key in ('expected', 'paid', 'payments', 'remaining', 'arrears', 'advance')}
+    got['projected_end'] = str(rec['projected_end'][i])
+    assert got == want
+
+
+def test_reconcile_cases(reconciled):
+    _, rec = reconciled
+    status = dict(zip((r[0] for r in RESERVATIONS), rec['status']))
+    assert rec['daily'][1] == MIN_DAILY and rec['expected'][1] == 28 * MIN_DAILY
+    assert status[1] == 'En retard' and rec['arrears'][0] == 50000
+    assert status[3] == 'Soldé' and rec['advance'][2] == 50000 - rec['expected'][2]
+    assert rec['payments'][3] == 0 and status[4] == 'En retard'
+    assert status[5] == 'En avance' and rec['expected'][4] == 0 and rec['paid'][4] == 30000
+    assert rec['expected'][5] == 0 and str(rec['start'][5]) == AS_OF.isoformat()
+
+
+@pytest.mark.parametrize('i', [0, 1, 3], ids=['mensuel', 'quotidien', 'semestriel'])
+def test_schedule_matches_reference(reconciled, i):
+    _, rec = reconciled
+    rid, price, duration, monthly_amount, daily_amount, frequency, created_at = RESERVATIONS[i]
+    start = date.fromisoformat(created_at[:10])
+    terms_row = {k: int(rec[k][i]) for k in ('duration', 'monthly', 'daily', 'period_days', 'period_months', 'installment')}
+    assert terms_row == ref_terms(price, duration, monthly_amount, daily_amount, frequency)
+
+    ends, due, cumulative = releves.schedule(np.datetime64(start.isoformat()), price, terms_row)
+    want_ends = [ref_add_months(start, k) for k in range(1, len(ends) + 1)]
+    want_cumulative = [ref_expected(start, end, price, terms_row) for end in want_ends]
+    assert [str(e) for e in ends] == [e.isoformat() for e in want_ends]
+    assert cumulative.tolist() == want_cumulative
+    assert due.tolist() == [b - a for a, b in zip([0] + want_cumulative, want_cumulative)]
+    assert cumulative[-1] == price and (len(cumulative) == 1 or cumulative[-2] < price)
@@ -0,0 +1,40 @@
+import json
+import shutil
+
+import pytest
+
+import build_simulator_grid as sg
+from lots_source import DEFAULT_LOTS
+from pricing import MIN_DAILY
+
+
+def test_api_lots_use_minimum_daily_base():
+    # Options construites depuis /api/public/lots : sans data-daily, base de 1 500 FCFA/jour
+    grid = sg.build_grid(DEFAULT_LOTS)
+    assert [lot['daily'] for lot in grid['lots']] == [MIN_DAILY] * len(DEFAULT_LOTS)
+    premium = grid['lots'].index(next(lot for lot in grid['lots'] if lot['price'] == 1000000))
+    assert grid['grid'][premium][0][0] == MIN_DAILY
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node absent')
+def test_parity_with_page_javascript():
+    text, _ = sg.serialize(sg.build_grid(DEFAULT_LOTS))
+    assert sg.check_parity(text) == []
+
+
+def test_default_lots_are_never_inlined(tmp_path):
+    html = tmp_path / 'index.html'
+    html.write_text('<script type="application/json" id="simulator-grid"></script>', encoding='utf-8')
+    with pytest.raises(ValueError):
+        sg.build(None, inline=True, html_path=html, build_dir=tmp_path / 'build')
+    assert html.read_text(encoding='utf-8').endswith('id="simulator-grid"></script>')
+
+
+def test_grid_from_explicit_source_is_inlined(tmp_path):
+    lots = tmp_path / 'lots.json'
+    lots.write_text(json.dumps({'lots': [dict(DEFAULT_LOTS[0], id=7, title='Lot Réel')]}), encoding='utf-8')
+    html = tmp_path / 'index.html'
+    html.write_text('<script type="application/json" id="simulator-grid"></script>', encoding='utf-8')
+    result = sg.build(str(lots), inline=True, max_age=0, html_path=html, build_dir=tmp_path / 'build')
+    assert result['inlined']
+    assert '"title":"Lot Réel"' in html.read_text(encoding='utf-8')
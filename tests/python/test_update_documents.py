@@ -0,0 +1,52 @@
+import asyncio
+import multiprocessing
+import sys
+import time
+
+import update_documents as ud
+
+
+def test_timeout_kills_generator_process(tmp_path):
+    marker = tmp_path / 'fini'
+    script = f'import time, pathlib; time.sleep(2); pathlib.Path({str(marker)!r}).touch()'
+    jobs = {'lent': (lambda: ud._run_process('lent', sys.executable, '-c', script), [])}
+    t0 = time.perf_counter()
+    results = asyncio.run(ud.run_job_graph(jobs, timeout=0.5))
+    assert results['lent']['status'] == 'délai dépassé'
+    assert time.perf_counter() - t0 < 1.5
+    time.sleep(2.5)
+    assert not marker.exists()
+
+
+def test_failed_generator_reports_exit_code():
+    jobs = {'ko': (lambda: ud._run_process('ko', sys.executable, '-c', 'raise SystemExit(3)'), [])}
+    results = asyncio.run(ud.run_job_graph(jobs, timeout=10))
+    assert results['ko']['status'] == 'échec'
+    assert 'code 3' in results['ko']['error']
+
+
+def _sleepy_worker(conn):
+    while True:
+        task = conn.recv()
+        time.sleep(task)
+        conn.send(('réveillé', None))
+
+
+def test_timeout_kills_warm_worker():
+    slot = ud._WorkerSlot(multiprocessing.get_context(), target=_sleepy_worker)
+    assert asyncio.run(ud.worker_call(slot, 0)) == ('réveillé', None)
+    jobs = {'lent': (lambda: ud.worker_call(slot, 30), [])}
+    t0 = time.perf_counter()
+    results = asyncio.run(ud.run_job_graph(jobs, timeout=0.5))
+    assert results['lent']['status'] == 'délai dépassé'
+    assert time.perf_counter() - t0 < 5
+    assert not slot.proc.is_alive()
+
+
+def test_prospectus_worker_stays_warm(monkeypatch):
+    monkeypatch.setattr(ud, '_prospectus_slot', None)
+    slot = ud.prospectus_slot()
+    assert ud.prospectus_slot() is slot
+    slot.stop(kill=True)
+    assert ud.prospectus_slot() is not slot
+    ud.prospectus_slot().stop()
@@ -12,25 +12,56 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 
 Usage :
-    python3 update_documents.py [--target /chemin/vers/PROJET_FONCIER_SOCIAL]
+    python3 update_documents.py [--target /chemin/vers/PROJET_FONCIER_SOCIAL] [--jobs N]
 
 Si --target n'est pas spécifié, le script utilise le chemin par défaut :
     ~/Documents/Mano_Verde_SA/MonBot/documents/PROJET_FONCIER_SOCIAL
+
+Les documents ne sont régénérés que si leur générateur, ses données (lots,
+textes) ou la chaîne d'outils ont changé : voir .build_cache.json à côté des
+fichiers produits. --force ignore ce cache.
 """
 
 import os
 import sys
+import json
+import time
 import shutil
+import asyncio
+import sqlite3
+import tempfile
+import hashlib
+import platform
 import argparse
 import subprocess
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait
 from pathlib import Path
 from datetime import datetime
 
+from docx_rules import FLAG_MESSAGE, RuleSet, docx_may_match
+from docx_stream import rewrite_docx
+
 # ── Configuration ─────────────────────────────────────────────────────────────
 SCRIPT_DIR   = Path(__file__).parent.resolve()   # dossier Code_source
 DEFAULT_TARGET = Path.home() / 'Documents' / 'Mano_Verde_SA' / 'MonBot' / 'documents' / 'PROJET_FONCIER_SOCIAL'
 GENERATE_JS  = SCRIPT_DIR / 'generate_docs.js'
 GENERATE_PDF = SCRIPT_DIR / 'generate_prospectus.py'
+BUILD_CACHE_FILE = SCRIPT_DIR / '.build_cache.json'
+BUILD_CACHE_VERSION = 1
+
+# Fichiers dont dépend le prospectus, en plus de generate_prospectus.py
+PROSPECTUS_DEPS = [SCRIPT_DIR / 'pricing.py', SCRIPT_DIR / 'lots_source.py', SCRIPT_DIR / 'pdf_fonts.py']
+PROSPECTUS_LOCALES = 'locales/prospectus-*.json'
+# Langues du prospectus, rendues par un même processus chaud (un PDF par langue)
+PROSPECTUS_LANGS = ['fr', 'en', 'es', 'de', 'zh']
+PROSPECTUS_DOCS = [
+    'Prospectus_TERRASOCIAL_Fev2026.pdf',
+    *(f'Prospectus_TERRASOCIAL_Fev2026_{lang}.pdf' for lang in PROSPECTUS_LANGS if lang != 'fr'),
+]
 
 # Documents générés par ce script (dans SCRIPT_DIR)
 GENERATED_DOCS = [
@@ -38,7 +69,7 @@ GENERATED_DOCS = [
     'Politique_Paiement_TERRASOCIAL_Fev2026.docx',
     'Contrat_Reservation_TERRASOCIAL_Fev2026.docx',
     'Note_MiseAJour_NouveauModele_Fev2026.docx',
-    'Prospectus_TERRASOCIAL_Fev2026.pdf',
+    *PROSPECTUS_DOCS,
 ]
 
 # Substitutions de texte à appliquer dans les anciens documents Word
@@ -59,6 +90,9 @@ TEXT_REPLACEMENTS = [
 # Termes à signaler (présents dans les docs mais pas remplacés automatiquement)
 FLAG_TERMS = ['acompte', '10 %', '10%', 'Acompte', 'mensualité uniquement']
 
+# Règles compilées une fois : un seul balayage par paragraphe (voir docx_rules.py)
+RULES = RuleSet(TEXT_REPLACEMENTS, FLAG_TERMS)
+
 # ── Utilitaires ───────────────────────────────────────────────────────────────
 RESET  = '\033[0m'
 GREEN  = '\033[32m'
@@ -88,152 +122,959 @@ def ensure_target(target: Path) -> bool:
     return True
 
 
-def regenerate_documents():
-    """Relance la génération des documents Word et PDF."""
+def load_prospectus_module():
+    """Importe generate_prospectus une seule fois par processus.
+
+    ReportLab et les styles du prospectus restent chargés : les appels suivants
+    à build_prospectus() ne paient plus le démarrage d'un interpréteur.
+    """
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+    import generate_prospectus
+    return generate_prospectus
+
+
+# ── Cache de build ────────────────────────────────────────────────────────────
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _package_version(name: str) -> str:
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return 'absent'
+
+
+def node_toolchain() -> dict:
+    """Versions de Node.js et du paquet npm `docx` utilisées par generate_docs.js."""
+    try:
+        node = subprocess.run(['node', '--version'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        node = 'absent'
+    docx = 'absent'
+    for manifest in (SCRIPT_DIR / 'node_modules' / 'docx' / 'package.json', SCRIPT_DIR / 'package.json'):
+        try:
+            data = json.loads(manifest.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        docx = data.get('version') if manifest.parent.name == 'docx' else data.get('dependencies', {}).get('docx')
+        if docx:
+            break
+    return {'node': node, 'docx': docx}
+
+
+def python_toolchain() -> dict:
+    """Versions de Python et de ReportLab utilisées pour le prospectus."""
+    return {'python': platform.python_version(), 'reportlab': _package_version('reportlab')}
+
+
+def build_key(sources, inputs) -> str:
+    """Empreinte d'une génération : sources du générateur, données d'entrée et outils."""
+    h = hashlib.sha256(f'v{BUILD_CACHE_VERSION}'.encode())
+    for src in sources:
+        h.update(b'\0' + src.name.encode('utf-8') + b'\0')
+        h.update(src.read_bytes() if src.exists() else b'<absent>')
+    h.update(json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def load_build_cache() -> dict:
+    try:
+        return json.loads(BUILD_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_cache(cache: dict):
+    tmp = BUILD_CACHE_FILE.with_suffix('.tmp')
+    tmp.write_text(json.dumps(cache, ensure_ascii=False, indent=1, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, BUILD_CACHE_FILE)
+
+
+def cache_hit(cache: dict, job: str, key: str) -> bool:
+    """Vrai si la clé n'a pas changé et que les fichiers produits sont intacts."""
+    entry = cache.get(job)
+    if not entry or entry.get('key') != key:
+        return False
+    for name, digest in entry.get('outputs', {}).items():
+        out = SCRIPT_DIR / name
+        if not out.exists() or file_sha256(out) != digest:
+            return False
+    return True
+
+
+def record_build(cache: dict, job: str, key: str, outputs):
+    cache[job] = {
+        'key': key,
+        'outputs': {name: file_sha256(SCRIPT_DIR / name) for name in outputs if (SCRIPT_DIR / name).exists()},
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+# ── Orchestration des générateurs ─────────────────────────────────────────────
+JOB_TIMEOUT = 300  # secondes par générateur
+
+
+class JobFailed(Exception):
+    """Échec d'un générateur (code de sortie non nul, erreur Python)."""
+
+
+async def _pipe_lines(stream, emit):
+    """Relaie un flux de sous-processus ligne par ligne, au fil de l'eau."""
+    async for raw in stream:
+        line = raw.decode('utf-8', errors='replace').rstrip()
+        if line:
+            emit(line)
+
+
+async def _run_process(name, *argv):
+    """Lance un générateur en sous-processus, relaie sa sortie et le tue si la tâche est annulée.
+
+    `run_job_graph` annule la tâche au délai dépassé : le processus est alors
+    tué au lieu de continuer à écrire les fichiers en arrière-plan.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_tail = deque(maxlen=50)
+
+    def on_stderr(line):
+        stderr_tail.append(line)
+        warn(f'[{name}] {line}')
+
+    try:
+        await asyncio.gather(
+            # Les générateurs préfixent déjà leurs lignes de ✅
+            _pipe_lines(proc.stdout, lambda line: ok(f"[{name}] {line.strip().removeprefix('✅').strip()}")),
+            _pipe_lines(proc.stderr, on_stderr),
+            proc.wait(),
+        )
+    except asyncio.CancelledError:
+        # Délai dépassé : on ne laisse pas le générateur tourner derrière nous
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    if proc.returncode != 0:
+        reason = next((line for line in stderr_tail if 'Error' in line), stderr_tail[-1] if stderr_tail else '')
+        raise JobFailed(f'{Path(argv[0]).name} a terminé avec le code {proc.returncode}'
+                        + (f' : {reason}' if reason else ''))
+
+
+async def _job_word(cache, stats):
+    """Documents Word : `node generate_docs.js` en sous-processus asynchrone."""
+    word_docs = [d for d in GENERATED_DOCS if d.endswith('.docx')]
+    key = build_key([GENERATE_JS], node_toolchain())
+    if cache_hit(cache, 'word', key):
+        stats['hits'].append('word')
+        ok(f'[word] Documents Word à jour (cache) : {len(word_docs)} fichier(s)')
+        return 'cache'
+    stats['misses'].append('word')
+    cache.pop('word', None)
+    info('[word] Génération des documents Word...')
+    await _run_process('word', 'node', str(GENERATE_JS), str(SCRIPT_DIR))
+    record_build(cache, 'word', key, word_docs)
+    return 'généré'
+
+
+def _prospectus_key(lots_source):
+    """Clé de cache du prospectus (chargement des lots, polices retenues), calculée dans un thread."""
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+    from lots_source import load_lots
+    import pdf_fonts
+    lots = load_lots(lots_source)
+    locales = sorted(SCRIPT_DIR.glob(PROSPECTUS_LOCALES))
+    # Les polices retenues changent le rendu : une police installée invalide le cache
+    return build_key([GENERATE_PDF, *PROSPECTUS_DEPS, *locales],
+                     {'lots': lots, 'langs': PROSPECTUS_LANGS, 'fonts': pdf_fonts.selected_files(),
+                      'toolchain': python_toolchain()})
+
+
+def _prospectus_worker(conn):
+    """Processus chaud du prospectus : importe generate_prospectus une fois, puis rend chaque demande
+    (langues, dossier, source des lots) reçue ; renvoie ([(fichier, octets, secondes)], erreur)."""
+    prospectus = None
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        langs, out_dir, lots_source = task
+        try:
+            prospectus = prospectus or load_prospectus_module()
+            from lots_source import load_lots
+            results = prospectus.build_prospectuses(langs, out_dir, {'lots': load_lots(lots_source)})
+            conn.send(([(Path(out).name, size, seconds) for _, out, size, seconds in results], None))
+        except Exception as e:
+            conn.send((None, str(e) or type(e).__name__))
+    conn.close()
+
+
+_prospectus_slot = None
+
+
+def prospectus_slot():
+    """Processus chaud du prospectus, démarré au premier appel et gardé d'une génération à l'autre.
+
+    Démarré hors de la boucle asyncio (regenerate_documents) : le fork ne
+    copie alors aucun thread. Un processus abattu (délai dépassé) est remplacé.
+    """
+    global _prospectus_slot
+    if _prospectus_slot is None or not _prospectus_slot.proc.is_alive():
+        _prospectus_slot = _WorkerSlot(multiprocessing.get_context(), target=_prospectus_worker)
+    return _prospectus_slot
+
+
+def _recv_reply(conn):
+    try:
+        return conn.recv()
+    except (EOFError, OSError):
+        return None, 'processus interrompu'
+
+
+async def worker_call(slot, task):
+    """Envoie `task` au processus `slot` et attend sa réponse sans bloquer la boucle.
+
+    Une tâche annulée (délai dépassé de run_job_graph) abat le processus : le
+    rendu s'arrête, et le thread en attente sur le canal reçoit EOFError.
+    """
+    slot.task = task
+    slot.conn.send(task)
+    try:
+        reply = await asyncio.to_thread(_recv_reply, slot.conn)
+    except asyncio.CancelledError:
+        slot.stop(kill=True)
+        raise
+    slot.task = None
+    return reply
+
+
+async def _job_prospectus(cache, stats, lots_source, slot):
+    """Prospectus PDF, toutes langues : rendus par le processus chaud `slot`, abattu au délai dépassé.
+
+    Un rendu ReportLab dans un thread ne peut pas être interrompu : asyncio.wait_for
+    rendrait la main sans arrêter l'écriture des PDF.
+    """
+    key = await asyncio.to_thread(_prospectus_key, lots_source)
+    if cache_hit(cache, 'prospectus', key):
+        stats['hits'].append('prospectus')
+        ok('[prospectus] Prospectus PDF à jour (cache)')
+        return 'cache'
+    stats['misses'].append('prospectus')
+    cache.pop('prospectus', None)
+    info(f"[prospectus] Génération du Prospectus PDF ({', '.join(PROSPECTUS_LANGS)})...")
+    outputs, error = await worker_call(slot, (PROSPECTUS_LANGS, str(SCRIPT_DIR), lots_source))
+    if error:
+        raise JobFailed(error)
+    for name, size, seconds in outputs:
+        ok(f'[prospectus] {name} ({round(size / 1024)} Ko, {seconds:.2f} s)')
+    record_build(cache, 'prospectus', key, [name for name, _, _ in outputs])
+    return 'généré'
+
+
+async def run_job_graph(jobs: dict, timeout: int = JOB_TIMEOUT) -> dict:
+    """
+    Exécute un graphe de tâches {nom: (fabrique de coroutine, [dépendances])}.
+    Chaque tâche démarre dès que ses dépendances ont réussi, avec son propre
+    délai ; celles dont une dépendance a échoué ne sont pas lancées.
+    Retourne {nom: {'status', 'seconds', 'error'}}.
+    """
+    results = {}
+    tasks = {}
+
+    async def run(name):
+        factory, deps = jobs[name]
+        for dep in deps:
+            await tasks[dep]
+        failed = [dep for dep in deps if results[dep]['status'] not in ('cache', 'généré')]
+        if failed:
+            results[name] = {'status': 'non lancé', 'seconds': 0.0, 'error': f"dépend de {', '.join(failed)}"}
+            return
+        t0 = time.perf_counter()
+        status, error = None, None
+        try:
+            status = await asyncio.wait_for(factory(), timeout)
+        except asyncio.TimeoutError:
+            status, error = 'délai dépassé', f'plus de {timeout} s'
+        except Exception as e:
+            status, error = 'échec', str(e) or type(e).__name__
+        results[name] = {'status': status, 'seconds': round(time.perf_counter() - t0, 3), 'error': error}
+        if error:
+            warn(f'[{name}] {status} : {error[:500]}')
+
+    for name in jobs:
+        tasks[name] = asyncio.ensure_future(run(name))
+    await asyncio.gather(*tasks.values())
+    return {name: results[name] for name in jobs}
+
+
+def regenerate_documents(lots_source=None, force=False, timeout=JOB_TIMEOUT) -> dict:
+    """Relance, en parallèle, la génération des documents Word et PDF dont les entrées ont changé.
+
+    `lots_source` : export/base des lots disponibles pour le prospectus
+    (voir lots_source.py) ; None = lots par défaut du backend.
+    `force` : régénère tout sans consulter le cache.
+    `timeout` : délai maximal par générateur, en secondes.
+    Les générateurs sont indépendants : la durée totale est celle du plus lent.
+    Retourne {'hits': [...], 'misses': [...], 'jobs': {nom: {'status', 'seconds', 'error'}}, 'seconds'}.
+    """
     head('GÉNÉRATION DES DOCUMENTS')
+    cache = {} if force else load_build_cache()
+    stats = {'hits': [], 'misses': []}
 
-    # Word documents (Node.js)
+    jobs = {}
     if GENERATE_JS.exists():
-        info('Génération des documents Word...')
-        result = subprocess.run(
-            ['node', str(GENERATE_JS), str(SCRIPT_DIR)],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            for line in result.stdout.strip().splitlines():
-                ok(line.strip())
-        else:
-            warn(f'Avertissement génération Word : {result.stderr[:200]}')
+        jobs['word'] = (lambda: _job_word(cache, stats), [])
     else:
         warn(f'Script JS non trouvé : {GENERATE_JS} — utilisation des fichiers existants.')
-
-    # Prospectus PDF (Python)
     if GENERATE_PDF.exists():
-        info('Génération du Prospectus PDF...')
-        result = subprocess.run(
-            [sys.executable, str(GENERATE_PDF), str(SCRIPT_DIR)],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            ok(result.stdout.strip())
-        else:
-            warn(f'Avertissement génération PDF : {result.stderr[:200]}')
+        slot = prospectus_slot()
+        jobs['prospectus'] = (lambda: _job_prospectus(cache, stats, lots_source, slot), [])
     else:
         warn(f'Script PDF non trouvé : {GENERATE_PDF} — utilisation des fichiers existants.')
 
+    t0 = time.perf_counter()
+    stats['jobs'] = asyncio.run(run_job_graph(jobs, timeout)) if jobs else {}
+    stats['seconds'] = round(time.perf_counter() - t0, 3)
+    for name, job in stats['jobs'].items():
+        if job['status'] not in ('cache', 'généré'):
+            cache.pop(name, None)
+
+    try:
+        save_build_cache(cache)
+    except OSError as e:
+        warn(f'Cache de build non enregistré : {e}')
+    info(f"Cache de build : {len(stats['hits'])} à jour, {len(stats['misses'])} régénéré(s)")
+    for name, job in stats['jobs'].items():
+        info(f"  {name:<12} {job['status']:<14} {job['seconds']:.2f} s")
+    info(f"Génération terminée en {stats['seconds']:.2f} s")
+    return stats
+
+
+# ── Copie vers le dossier cible ───────────────────────────────────────────────
+FICLONE = 0x40049409  # ioctl Linux : clone (reflink) sur Btrfs, XFS, bcachefs…
+COPY_JOBS = 4
+
+
+def _copy_data(src: Path, dst_fd: int, size: int) -> str:
+    """Copie le contenu de `src` dans `dst_fd` par le chemin noyau le plus rapide disponible."""
+    with open(src, 'rb') as fsrc:
+        src_fd = fsrc.fileno()
+        if sys.platform.startswith('linux'):
+            try:
+                import fcntl
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                return 'reflink'
+            except (ImportError, OSError):
+                pass
+        if hasattr(os, 'copy_file_range'):
+            copied = 0
+            try:
+                while copied < size:
+                    n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError:
+                pass
+            if copied == size:
+                return 'copy_file_range'
+            # Système de fichiers non pris en charge : on repart de zéro
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+            fsrc.seek(0)
+        with open(dst_fd, 'wb', closefd=False) as fdst:
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+        return 'copie'
+
+
+def sync_file(src: Path, dst: Path) -> tuple:
+    """
+    Copie `src` vers `dst` seulement si le contenu diffère (taille puis
+    SHA-256). L'écriture passe par un fichier temporaire renommé à la fin :
+    le fichier cible n'est jamais visible à moitié écrit.
+    Retourne ('identique' | 'copié', méthode, octets).
+    """
+    size = src.stat().st_size
+    if dst.exists() and dst.stat().st_size == size and file_sha256(dst) == file_sha256(src):
+        return 'identique', None, size
+    fd, tmp = tempfile.mkstemp(prefix=f'.{dst.name}.', suffix='.tmp', dir=str(dst.parent))
+    try:
+        try:
+            method = _copy_data(src, fd, size)
+        finally:
+            os.close(fd)
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return 'copié', method, size
+
 
-def copy_to_target(target: Path) -> list:
-    """Copie les documents générés vers le dossier cible."""
+def copy_to_target(target: Path, jobs: int = COPY_JOBS, source_dir: Path = SCRIPT_DIR,
+                   names: list = GENERATED_DOCS) -> tuple:
+    """
+    Copie les documents générés (`names`, depuis `source_dir`) vers le dossier
+    cible, en parallèle, sans réécrire ceux qui y sont déjà à l'identique (pas
+    de nouvel envoi par les clients de synchronisation Drive/Dropbox).
+    Retourne (documents présents dans la cible, {'copied_bytes', 'skipped_bytes', 'copied', 'skipped'}).
+    """
     head('COPIE DES DOCUMENTS VERS LE DOSSIER PROJET')
     copied = []
-    for doc_name in GENERATED_DOCS:
-        src = SCRIPT_DIR / doc_name
-        dst = target / doc_name
-        if src.exists():
+    stats = {'copied': 0, 'skipped': 0, 'copied_bytes': 0, 'skipped_bytes': 0}
+    sources = []
+    for doc_name in names:
+        if (source_dir / doc_name).exists():
+            sources.append(doc_name)
+        else:
+            warn(f'{doc_name} non trouvé dans {source_dir}')
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(sources) or 1))) as pool:
+        futures = {name: pool.submit(sync_file, source_dir / name, target / name) for name in sources}
+        for doc_name, future in futures.items():
             try:
-                shutil.copy2(src, dst)
-                size_kb = round(src.stat().st_size / 1024)
-                ok(f'{doc_name} ({size_kb} Ko) → {target.name}/')
-                copied.append(doc_name)
+                status, method, size = future.result()
             except Exception as e:
                 err(f'{doc_name} : {e}')
+                continue
+            size_kb = round(size / 1024)
+            if status == 'identique':
+                info(f'{doc_name} ({size_kb} Ko) déjà à jour dans {target.name}/')
+                stats['skipped'] += 1
+                stats['skipped_bytes'] += size
+            else:
+                ok(f'{doc_name} ({size_kb} Ko) → {target.name}/ [{method}]')
+                stats['copied'] += 1
+                stats['copied_bytes'] += size
+            copied.append(doc_name)
+    return copied, stats
+
+
+def _iter_paragraphs(doc):
+    """Paragraphes du corps puis des tableaux (une seule fois par cellule fusionnée)."""
+    yield from doc.paragraphs
+    seen = set()
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if id(cell._tc) in seen:
+                    continue
+                seen.add(id(cell._tc))
+                yield from cell.paragraphs
+
+
+def _updated_path(docx_path: Path) -> Path:
+    """Nom du document mis à jour : suffixe _MisAJour, sauf version déjà à jour."""
+    stem = docx_path.stem
+    if not stem.endswith('_v2') and 'Fev2026' not in stem:
+        return docx_path.with_name(f'{stem}_MisAJour_Fev2026.docx')
+    return docx_path
+
+
+def process_word_doc(docx_path: Path, prescan: bool = True, backend: str = 'docx') -> dict:
+    """
+    Applique TEXT_REPLACEMENTS à un ancien document Word et relève FLAG_TERMS.
+    N'affiche rien : renvoie {'modifications', 'flagged', 'saved_as', 'skipped'},
+    où saved_as est le nom du fichier enregistré (None si rien n'a changé) et
+    skipped indique que la pré-analyse du zip n'a trouvé aucun terme (le
+    document n'est alors pas chargé).
+    backend : 'docx' (python-docx, paragraphes du corps et des tableaux) ou
+    'stream' (réécriture XML en flux, voir docx_stream.py).
+    Exécutable dans un processus de travail (voir run_word_pool).
+    """
+    if prescan and not docx_may_match(docx_path, RULES):
+        return {'modifications': [], 'flagged': [], 'saved_as': None, 'skipped': True}
+
+    if backend == 'stream':
+        new_path = _updated_path(docx_path)
+        result = rewrite_docx(docx_path, new_path, RULES)
+        return {'modifications': result['modifications'], 'flagged': result['flagged'],
+                'saved_as': new_path.name if result['changed'] else None, 'skipped': False}
+
+    from docx import Document as DocxDocument
+
+    doc = DocxDocument(str(docx_path))
+    modifications = []
+    flagged = {}
+    changed = False
+
+    for para in _iter_paragraphs(doc):
+        runs = para.runs
+        new_texts, descs = RULES.rewrite([run.text for run in runs])
+        if new_texts is not None:
+            for run, text in zip(runs, new_texts):
+                if run.text != text:
+                    run.text = text
+            changed = True
+            modifications.extend(d for d in descs if d not in modifications)
+
+        # Termes à signaler (après remplacement)
+        for term in RULES.flags(para.text):
+            flagged.setdefault(term, FLAG_MESSAGE.format(term))
+
+    saved_as = None
+    if changed:
+        # Sauvegarde avec suffixe _MisAJour
+        new_path = _updated_path(docx_path)
+        doc.save(str(new_path))
+        saved_as = new_path.name
+    return {'modifications': modifications, 'flagged': list(flagged.values()), 'saved_as': saved_as,
+            'skipped': False}
+
+
+def measure_word_doc(docx_path: Path, **options) -> dict:
+    """process_word_doc() avec ses mesures : result['metrics'] = durée, CPU, octets lus et écrits."""
+    size_in = docx_path.stat().st_size
+    w0, c0 = time.perf_counter(), time.process_time()
+    result = process_word_doc(docx_path, **options)
+    saved = docx_path.with_name(result['saved_as']) if result['saved_as'] else None
+    result['metrics'] = {
+        'seconds': round(time.perf_counter() - w0, 6),
+        'cpu_seconds': round(time.process_time() - c0, 6),
+        'bytes_read': size_in,
+        'bytes_written': saved.stat().st_size if saved and saved.exists() else 0,
+    }
+    return result
+
+
+# ── Pool de processus pour les documents Word ─────────────────────────────────
+DOC_TIMEOUT = 120  # secondes accordées à un document avant d'abattre son processus
+
+
+def _word_worker(conn):
+    """Boucle d'un processus de travail : reçoit (index, chemin, options), renvoie (index, résultat, erreur)."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        index, path, options = task
+        try:
+            conn.send((index, measure_word_doc(Path(path), **options), None))
+        except Exception as e:
+            conn.send((index, None, str(e) or type(e).__name__))
+    conn.close()
+
+
+class _WorkerSlot:
+    """Un processus de travail et son canal dédié ; remplaçable s'il plante ou se bloque."""
+
+    def __init__(self, ctx, target=None):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=target or _word_worker, args=(child,), daemon=True)
+        self.proc.start()
+        child.close()
+        self.task = None
+        self.deadline = None
+
+    def submit(self, task, timeout, options):
+        self.task = task
+        self.deadline = time.monotonic() + timeout
+        self.conn.send((task[0], str(task[1]), options))
+
+    def stop(self, kill=False):
+        if kill:
+            self.proc.kill()
         else:
-            warn(f'{doc_name} non trouvé dans {SCRIPT_DIR}')
-    return copied
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.proc.join(5)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+        self.conn.close()
 
 
-def update_existing_word_docs(target: Path) -> dict:
+def run_word_pool(paths, jobs, timeout=DOC_TIMEOUT, options=None):
+    """
+    Traite `paths` dans `jobs` processus (measure_word_doc(chemin, **options))
+    et produit (index, résultat, erreur)
+    dans l'ordre de fin. Un document qui fait planter son processus ou dépasse
+    `timeout` secondes est signalé en erreur ; le processus est remplacé et
+    le reste du lot continue.
+    """
+    options = options or {}
+    ctx = multiprocessing.get_context()
+    queue = deque(enumerate(paths))
+    slots = [_WorkerSlot(ctx) for _ in range(min(jobs, len(queue)))]
+    try:
+        for slot in slots:
+            if queue:
+                slot.submit(queue.popleft(), timeout, options)
+        while True:
+            busy = [s for s in slots if s.task is not None]
+            if not busy:
+                break
+            delay = max(0.0, min(s.deadline for s in busy) - time.monotonic())
+            wait([s.conn for s in busy] + [s.proc.sentinel for s in busy], timeout=delay)
+            for i, slot in enumerate(slots):
+                if slot.task is None:
+                    continue
+                index = slot.task[0]
+                failure = None
+                if slot.conn.poll():
+                    try:
+                        yield slot.conn.recv()
+                    except EOFError:
+                        failure = f'processus interrompu (code {slot.proc.exitcode})'
+                elif not slot.proc.is_alive():
+                    failure = f'processus interrompu (code {slot.proc.exitcode})'
+                elif time.monotonic() >= slot.deadline:
+                    failure = f'délai dépassé ({timeout} s)'
+                else:
+                    continue
+                if failure:
+                    yield index, None, failure
+                    slot.stop(kill=True)
+                    slot = slots[i] = _WorkerSlot(ctx)
+                slot.task = None
+                if queue:
+                    slot.submit(queue.popleft(), timeout, options)
+    finally:
+        for slot in slots:
+            slot.stop(kill=slot.task is not None)
+
+
+# ── Manifeste incrémental (dossier cible) ─────────────────────────────────────
+MANIFEST_NAME = '.terrasocial_manifest.sqlite'
+# États d'un document dans le manifeste ; 'error' est retenté à chaque passage
+OUTCOMES = {
+    'updated':   'mis à jour',
+    'unchanged': 'sans modification automatique',
+    'skipped':   'sans terme (pré-analyse)',
+    'generated': 'produit par la mise à jour',
+    'error':     'en erreur',
+}
+
+
+def open_manifest(target: Path):
+    """Ouvre (ou crée) le manifeste SQLite du dossier cible."""
+    conn = sqlite3.connect(str(target / MANIFEST_NAME))
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS documents ('
+        ' path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT,'
+        ' rules_version TEXT, outcome TEXT, saved_as TEXT, modifications TEXT,'
+        ' flagged TEXT, error TEXT, processed_at TEXT)'
+    )
+    return conn
+
+
+def manifest_record(conn, target: Path, path: Path, outcome: str, rules_version: str,
+                    result: dict = None, error: str = None, sha256: str = None):
+    """Enregistre l'état d'un document (taille, mtime, empreinte, règles, résultat)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return
+    result = result or {}
+    conn.execute(
+        'INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (path.relative_to(target).as_posix(), st.st_size, st.st_mtime_ns,
+         sha256 or file_sha256(path), rules_version, outcome, result.get('saved_as'),
+         json.dumps(result.get('modifications', []), ensure_ascii=False),
+         json.dumps(result.get('flagged', []), ensure_ascii=False),
+         error, datetime.now().isoformat(timespec='seconds'))
+    )
+
+
+def manifest_pending(conn, target: Path, docx_files: list, rules_version: str) -> list:
+    """
+    Documents à (re)traiter : nouveaux, modifiés, traités avec d'autres règles
+    ou en erreur. Taille et mtime identiques suffisent ; si seul le mtime a
+    changé, l'empreinte SHA-256 tranche (et le mtime est mis à jour).
+    """
+    known = {row[0]: row for row in conn.execute(
+        'SELECT path, size, mtime_ns, sha256, rules_version, outcome FROM documents')}
+    pending = []
+    for path in docx_files:
+        rel = path.relative_to(target).as_posix()
+        row = known.get(rel)
+        if row is None or row[5] == 'error' or (row[4] != rules_version and row[5] != 'generated'):
+            pending.append(path)
+            continue
+        st = path.stat()
+        if (st.st_size, st.st_mtime_ns) == (row[1], row[2]):
+            continue
+        if st.st_size == row[1] and file_sha256(path) == row[3]:
+            conn.execute('UPDATE documents SET mtime_ns = ? WHERE path = ?', (st.st_mtime_ns, rel))
+            continue
+        pending.append(path)
+    # Documents disparus du dossier
+    present = {p.relative_to(target).as_posix() for p in docx_files}
+    conn.executemany('DELETE FROM documents WHERE path = ?', [(p,) for p in known if p not in present])
+    return pending
+
+
+def manifest_summary(target: Path) -> dict:
+    """État cumulé du manifeste : {'counts': {état: n}, 'updated': [...], 'flagged': [...], 'errors': [...]}."""
+    summary = {'counts': {}, 'updated': [], 'flagged': [], 'errors': []}
+    if not (target / MANIFEST_NAME).exists():
+        return summary
+    conn = open_manifest(target)
+    try:
+        for path, outcome, saved_as, modifications, flagged, error in conn.execute(
+                'SELECT path, outcome, saved_as, modifications, flagged, error FROM documents ORDER BY path'):
+            summary['counts'][outcome] = summary['counts'].get(outcome, 0) + 1
+            if outcome == 'updated':
+                summary['updated'].append((path, saved_as, json.loads(modifications or '[]')))
+            elif outcome == 'unchanged' and flagged and flagged != '[]':
+                summary['flagged'].append((path, json.loads(flagged)))
+            elif outcome == 'error':
+                summary['errors'].append((path, error))
+    finally:
+        conn.close()
+    return summary
+
+
+def _report_word_doc(docx_path: Path, result: dict, results: dict):
+    """Affiche le résultat d'un document et l'ajoute à `results` s'il a été modifié."""
+    if result['skipped']:
+        return
+    if result['saved_as']:
+        ok(f"{docx_path.name} → {result['saved_as']}")
+        for mod in result['modifications']:
+            info(f'    • {mod}')
+        results[docx_path.name] = result['modifications']
+    else:
+        info(f'{docx_path.name} : aucune modification automatique nécessaire')
+        for flag in result['flagged']:
+            warn(f'    {flag}')
+
+
+def update_existing_word_docs(target: Path, jobs: int = 1, timeout: int = DOC_TIMEOUT,
+                              prescan: bool = True, backend: str = 'docx',
+                              incremental: bool = True, metrics: dict = None) -> dict:
     """
     Cherche et met à jour les anciens documents Word dans le dossier cible.
     Remplace les termes liés à l'acompte 10% par le nouveau modèle.
+    Avec jobs > 1, les documents sont traités en parallèle dans des processus
+    isolés (un fichier corrompu qui plante ou se bloque est signalé sans
+    interrompre le reste) ; les résultats restent affichés dans l'ordre des
+    fichiers. Avec prescan, les documents dont le XML ne contient aucun terme
+    sont écartés sans être chargés (voir docx_rules.docx_may_match).
+    backend 'stream' réécrit les documents en flux, sans python-docx.
+    Avec incremental, le manifeste du dossier cible (MANIFEST_NAME) écarte
+    les documents déjà traités avec les mêmes règles et inchangés depuis.
+    `metrics`, si fourni, reçoit les compteurs ('counters') et les mesures
+    par document ('documents') ; voir --metrics.
     Retourne un dict {fichier: [modifications]}.
     """
     head('MISE À JOUR DES DOCUMENTS WORD EXISTANTS')
 
     try:
-        from docx import Document as DocxDocument
+        if backend == 'docx':
+            import docx  # noqa: F401
     except ImportError:
         warn("python-docx non installé. Tentative d'installation...")
         subprocess.run([sys.executable, '-m', 'pip', 'install', 'python-docx', '-q'], check=True)
-        from docx import Document as DocxDocument
 
     results = {}
-    docx_files = list(target.rglob('*.docx'))
+    # Ne pas modifier les fichiers qu'on vient de générer, ni les fichiers
+    # temporaires de Word (~$…) ou d'une réécriture interrompue (.~…)
+    docx_files = sorted(
+        p for p in target.rglob('*.docx')
+        if p.name not in GENERATED_DOCS and not p.name.startswith(('~$', '.~'))
+    )
 
     if not docx_files:
         info('Aucun fichier .docx trouvé dans le dossier cible.')
         return results
 
-    for docx_path in docx_files:
-        # Ne pas modifier les fichiers qu'on vient de générer
-        if docx_path.name in GENERATED_DOCS:
-            continue
+    counters = {'found': len(docx_files), 'unchanged_since_last_run': 0, 'scanned': 0,
+                'skipped_prescan': 0, 'modified': 0, 'errors': 0, 'bytes_read': 0, 'bytes_written': 0}
+    documents = []
+    if metrics is not None:
+        metrics['counters'] = counters
+        metrics['documents'] = documents
 
-        try:
-            doc = DocxDocument(str(docx_path))
-            modifications = []
-            flagged = []
-            changed = False
-
-            # Parcourir tous les paragraphes
-            for para in doc.paragraphs:
-                for old, new, desc in TEXT_REPLACEMENTS:
-                    if old.lower() in para.text.lower():
-                        for run in para.runs:
-                            if old.lower() in run.text.lower():
-                                run.text = run.text.replace(old, new)
-                                run.text = run.text.replace(old.lower(), new.lower())
-                                changed = True
-                                if desc not in modifications:
-                                    modifications.append(desc)
-
-                # Termes à signaler
-                for term in FLAG_TERMS:
-                    if term.lower() in para.text.lower() and term not in [m for m in modifications]:
-                        if term not in flagged:
-                            flagged.append(f'Terme "{term}" trouvé (vérification manuelle conseillée)')
-
-            # Parcourir les tableaux
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for para in cell.paragraphs:
-                            for old, new, desc in TEXT_REPLACEMENTS:
-                                if old.lower() in para.text.lower():
-                                    for run in para.runs:
-                                        if old.lower() in run.text.lower():
-                                            run.text = run.text.replace(old, new)
-                                            run.text = run.text.replace(old.lower(), new.lower())
-                                            changed = True
-                                            if desc not in modifications:
-                                                modifications.append(desc)
-
-            if changed:
-                # Sauvegarde avec suffixe _MisAJour
-                stem = docx_path.stem
-                if not stem.endswith('_v2') and 'Fev2026' not in stem:
-                    new_path = docx_path.with_name(f'{stem}_MisAJour_Fev2026.docx')
-                else:
-                    new_path = docx_path
-                doc.save(str(new_path))
-                ok(f'{docx_path.name} → {new_path.name}')
-                for mod in modifications:
-                    info(f'    • {mod}')
-                results[docx_path.name] = modifications
+    rules_version = f'{RULES.version}:{backend}'
+    manifest = open_manifest(target)
+    try:
+        todo = manifest_pending(manifest, target, docx_files, rules_version) if incremental else docx_files
+        counters['unchanged_since_last_run'] = len(docx_files) - len(todo)
+        if len(todo) < len(docx_files):
+            info(f'{len(docx_files) - len(todo)}/{len(docx_files)} document(s) inchangé(s) depuis le dernier passage (manifeste)')
+
+        skipped = 0
+
+        def finish(docx_path, result, error):
+            nonlocal skipped
+            rel = docx_path.relative_to(target).as_posix()
+            if error:
+                err(f'Erreur sur {docx_path.name} : {error}')
+                manifest_record(manifest, target, docx_path, 'error', rules_version, error=str(error)[:500])
+                counters['errors'] += 1
+                documents.append({'path': rel, 'outcome': 'error', 'error': str(error)[:500]})
+                return
+            skipped += result['skipped']
+            m = result['metrics']
+            counters['scanned'] += 1
+            counters['skipped_prescan'] += result['skipped']
+            counters['modified'] += bool(result['saved_as'])
+            counters['bytes_read'] += m['bytes_read']
+            counters['bytes_written'] += m['bytes_written']
+            _report_word_doc(docx_path, result, results)
+            if result['skipped']:
+                outcome = 'skipped'
+            elif result['saved_as']:
+                outcome = 'updated'
+                saved = docx_path.with_name(result['saved_as'])
+                if saved != docx_path:
+                    manifest_record(manifest, target, saved, 'generated', rules_version)
             else:
-                info(f'{docx_path.name} : aucune modification automatique nécessaire')
-                if flagged:
-                    for flag in flagged:
-                        warn(f'    {flag}')
+                outcome = 'unchanged'
+            manifest_record(manifest, target, docx_path, outcome, rules_version, result)
+            documents.append({'path': rel, 'outcome': outcome, **m})
 
-        except Exception as e:
-            err(f'Erreur sur {docx_path.name} : {e}')
+        if jobs <= 1 or len(todo) <= 1:
+            for docx_path in todo:
+                try:
+                    result = measure_word_doc(docx_path, prescan=prescan, backend=backend)
+                except Exception as e:
+                    finish(docx_path, None, str(e))
+                    continue
+                finish(docx_path, result, None)
+        else:
+            info(f'{len(todo)} document(s) — {jobs} processus')
+            # Les résultats arrivent dans le désordre : on les affiche dans l'ordre des fichiers
+            pending = {}
+            next_index = 0
+            for index, result, error in run_word_pool(todo, jobs, timeout, {'prescan': prescan, 'backend': backend}):
+                pending[index] = (result, error)
+                while next_index in pending:
+                    result, error = pending.pop(next_index)
+                    finish(todo[next_index], result, error)
+                    next_index += 1
 
+        if skipped:
+            info(f'{skipped}/{len(todo)} document(s) sans terme à traiter, écartés par la pré-analyse')
+        manifest.commit()
+    finally:
+        manifest.close()
     return results
 
 
-def generate_rapport(target: Path, copied: list, updated: dict):
-    """Génère un rapport de mise à jour dans le dossier cible."""
+# ── Mesures et profilage (--metrics, --profile) ───────────────────────────────
+def _cpu_seconds() -> float:
+    """Temps CPU du processus et de ses enfants terminés (node, processus de travail)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def peak_rss_kb() -> dict:
+    """Mémoire résidente maximale (Ko) du processus et de ses enfants depuis le démarrage."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return {'self': None, 'children': None}
+    scale = 1024 if sys.platform == 'darwin' else 1  # octets sous macOS, Ko sous Linux
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }
+
+
+@contextmanager
+def measure_phase(metrics, name: str):
+    """Chronomètre une phase (mur, CPU, RSS max) dans metrics['phases'][name] ; sans effet si metrics est None."""
+    if metrics is None:
+        yield
+        return
+    w0, c0 = time.perf_counter(), _cpu_seconds()
+    try:
+        yield
+    finally:
+        metrics['phases'][name] = {
+            'wall_seconds': round(time.perf_counter() - w0, 4),
+            'cpu_seconds': round(_cpu_seconds() - c0, 4),
+            'peak_rss_kb': peak_rss_kb(),
+        }
+
+
+def profile_slowest(target: Path, documents: list, out_dir: Path, top: int = 5, **options) -> list:
+    """
+    Rejoue les `top` documents les plus lents sur une copie temporaire, sous
+    cProfile puis sous tracemalloc, et écrit <document>.prof (lisible avec
+    pstats ou snakeviz) et <document>.tracemalloc.txt dans `out_dir`.
+    Un document déjà mis à jour sur place est rejoué dans son état actuel.
+    """
+    import cProfile
+    import tracemalloc
+
+    slowest = sorted((d for d in documents if 'seconds' in d), key=lambda d: d['seconds'], reverse=True)[:top]
+    if not slowest:
+        return []
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for doc in slowest:
+            src = target / doc['path']
+            if not src.exists():
+                continue
+            stem = doc['path'].replace('/', '__')[:-len('.docx')]
+
+            work = Path(tmp) / 'cprofile' / src.name
+            work.parent.mkdir(exist_ok=True)
+            shutil.copy2(src, work)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                process_word_doc(work, **options)
+            finally:
+                profiler.disable()
+            profiler.dump_stats(str(out_dir / f'{stem}.prof'))
+
+            work = Path(tmp) / 'tracemalloc' / src.name
+            work.parent.mkdir(exist_ok=True)
+            shutil.copy2(src, work)
+            tracemalloc.start(25)
+            try:
+                process_word_doc(work, **options)
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            lines = [f"{doc['path']} — {doc['seconds']:.3f} s au passage mesuré",
+                     f'Pic de mémoire Python suivie : {peak / 1024:.0f} Ko', '']
+            lines += [str(stat) for stat in snapshot.statistics('lineno')[:30]]
+            (out_dir / f'{stem}.tracemalloc.txt').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+            doc['profile'] = f'{out_dir.name}/{stem}.prof'
+            written.append(doc['path'])
+    return written
+
+
+def write_metrics(target: Path, metrics: dict) -> Path:
+    """Écrit les mesures JSON à côté du rapport (METRIQUES_MiseAJour_TERRASOCIAL_AAAAMMJJ.json)."""
+    path = target / f'METRIQUES_MiseAJour_TERRASOCIAL_{datetime.now().strftime("%Y%m%d")}.json'
+    path.write_text(json.dumps(metrics, ensure_ascii=False, indent=1), encoding='utf-8')
+    return path
+
+
+def generate_rapport(target: Path, copied: list, updated: dict, manifest: dict = None,
+                     regen: dict = None):
+    """Génère un rapport de mise à jour dans le dossier cible.
+
+    `manifest` : état cumulé de tous les passages (voir manifest_summary).
+    `regen` : statistiques de regenerate_documents() (durée par générateur).
+    """
     head('RAPPORT DE MISE À JOUR')
 
     now = datetime.now().strftime('%d/%m/%Y à %H:%M')
@@ -255,6 +1096,11 @@ def generate_rapport(target: Path, copied: list, updated: dict):
         'DOCUMENTS COPIÉS/GÉNÉRÉS',
         '-' * 40,
     ]
+    if regen and regen.get('jobs'):
+        lines.append(f"  Génération : {regen['seconds']:.2f} s au total (générateurs en parallèle)")
+        for name, job in regen['jobs'].items():
+            detail = f" — {job['error']}" if job['error'] else ''
+            lines.append(f"    • {name:<12} {job['status']:<14} {job['seconds']:>7.2f} s{detail}")
     for doc in copied:
         lines.append(f'  ✅ {doc}')
     if not copied:
@@ -269,6 +1115,28 @@ def generate_rapport(target: Path, copied: list, updated: dict):
     else:
         lines.append('  Aucun fichier ancien mis à jour (ou aucun trouvé).')
 
+    if manifest and manifest['counts']:
+        lines += ['', 'ÉTAT CUMULÉ DES ANCIENS DOCUMENTS (tous passages)', '-' * 40]
+        for outcome, label in OUTCOMES.items():
+            if outcome in manifest['counts']:
+                lines.append(f"  {manifest['counts'][outcome]:>6}  {label}")
+        if manifest['updated']:
+            lines += ['', '  Documents mis à jour :']
+            for path, saved_as, mods in manifest['updated']:
+                lines.append(f'  ✅ {path} → {saved_as}')
+                for mod in mods:
+                    lines.append(f'      • {mod}')
+        if manifest['flagged']:
+            lines += ['', '  Vérification manuelle conseillée :']
+            for path, flags in manifest['flagged']:
+                lines.append(f'  ⚠️  {path}')
+                for flag in flags:
+                    lines.append(f'      • {flag}')
+        if manifest['errors']:
+            lines += ['', '  Erreurs (retentées au prochain passage) :']
+            for path, error in manifest['errors']:
+                lines.append(f'  ❌ {path} : {error}')
+
     lines += [
         '',
         'RÉSUMÉ DU NOUVEAU MODÈLE',
@@ -290,7 +1158,7 @@ def generate_rapport(target: Path, copied: list, updated: dict):
         '  • Politique_Paiement_TERRASOCIAL_Fev2026.docx',
         '  • Contrat_Reservation_TERRASOCIAL_Fev2026.docx',
         '  • Note_MiseAJour_NouveauModele_Fev2026.docx',
-        '  • Prospectus_TERRASOCIAL_Fev2026.pdf',
+        '  • Prospectus_TERRASOCIAL_Fev2026.pdf (+ ' + ', '.join(l for l in PROSPECTUS_LANGS if l != 'fr') + ')',
         '',
         '=' * 70,
         'Produit automatiquement par update_documents.py — TERRASOCIAL',
@@ -319,6 +1187,47 @@ def main():
         '--no-update-existing', action='store_true',
         help='Ne pas mettre à jour les anciens documents Word existants'
     )
+    parser.add_argument(
+        '--lots', metavar='SOURCE',
+        help='Lots disponibles pour le prospectus : export JSON, base SQLite ou dump .sql'
+    )
+    parser.add_argument(
+        '--job-timeout', type=int, default=JOB_TIMEOUT,
+        help=f'Délai maximal par générateur (node, prospectus), en secondes (défaut : {JOB_TIMEOUT})'
+    )
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help='Processus pour la mise à jour des anciens documents Word (0 = nombre de cœurs, défaut : 1)'
+    )
+    parser.add_argument(
+        '--doc-timeout', type=int, default=DOC_TIMEOUT,
+        help=f'Délai maximal par document Word en mode --jobs, en secondes (défaut : {DOC_TIMEOUT})'
+    )
+    parser.add_argument(
+        '--backend', choices=['docx', 'stream'], default='docx',
+        help='Réécriture des anciens documents Word : python-docx (défaut) ou XML en flux, '
+             'qui recopie les images et autres parties sans les recompresser'
+    )
+    parser.add_argument(
+        '--full', action='store_true',
+        help='Retraiter tous les anciens documents Word, même inchangés depuis le dernier passage'
+    )
+    parser.add_argument(
+        '--no-prescan', action='store_true',
+        help='Charger tous les anciens documents Word, sans pré-analyse du zip'
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help='Régénérer les documents même si le cache de build est à jour'
+    )
+    parser.add_argument(
+        '--metrics', action='store_true',
+        help='Écrire les mesures (durée, CPU, mémoire par phase et par document) en JSON à côté du rapport'
+    )
+    parser.add_argument(
+        '--profile', type=int, nargs='?', const=5, default=0, metavar='N',
+        help='Profiler (cProfile, tracemalloc) les N documents les plus lents (défaut : 5) ; implique --metrics'
+    )
     args = parser.parse_args()
 
     target = Path(args.target)
@@ -333,29 +1242,70 @@ def main():
     if not ensure_target(target):
         sys.exit(1)
 
-    # 2. Régénérer les documents
-    if not args.no_regen:
-        regenerate_documents()
-    else:
-        info('Régénération ignorée (--no-regen)')
+    metrics = None
+    if args.metrics or args.profile:
+        metrics = {'started_at': datetime.now().isoformat(timespec='seconds'),
+                   'argv': sys.argv[1:], 'phases': {}}
+    word_metrics = {} if metrics is not None else None
+
+    # 2. Régénérer les documents (terminé avant la copie et la mise à jour)
+    regen = None
+    with measure_phase(metrics, 'regenerate'):
+        if not args.no_regen:
+            regen = regenerate_documents(args.lots, force=args.force, timeout=args.job_timeout)
+        else:
+            info('Régénération ignorée (--no-regen)')
 
     # 3. Copier vers le dossier cible
-    copied = copy_to_target(target)
+    with measure_phase(metrics, 'copy'):
+        copied, copy_stats = copy_to_target(target)
 
     # 4. Mettre à jour les anciens documents
     updated = {}
-    if not args.no_update_existing:
-        updated = update_existing_word_docs(target)
-    else:
-        info('Mise à jour des anciens docs ignorée (--no-update-existing)')
+    word_options = {'prescan': not args.no_prescan, 'backend': args.backend}
+    with measure_phase(metrics, 'update'):
+        if not args.no_update_existing:
+            jobs = args.jobs or os.cpu_count() or 1
+            updated = update_existing_word_docs(target, jobs=jobs, timeout=args.doc_timeout,
+                                                incremental=not args.full, metrics=word_metrics,
+                                                **word_options)
+        else:
+            info('Mise à jour des anciens docs ignorée (--no-update-existing)')
 
     # 5. Rapport
-    rapport = generate_rapport(target, copied, updated)
+    with measure_phase(metrics, 'report'):
+        rapport = generate_rapport(target, copied, updated, manifest_summary(target), regen)
+
+    # 6. Mesures et profilage
+    metrics_path = None
+    if metrics is not None:
+        documents = word_metrics.get('documents', [])
+        if args.profile and documents:
+            head('PROFILAGE DES DOCUMENTS LES PLUS LENTS')
+            profile_dir = target / f'PROFIL_MiseAJour_TERRASOCIAL_{datetime.now().strftime("%Y%m%d")}'
+            for path in profile_slowest(target, documents, profile_dir, args.profile, **word_options):
+                ok(f'{path} → {profile_dir.name}/')
+        counters = dict(word_metrics.get('counters', {}))
+        counters['copy_files_copied'] = copy_stats['copied']
+        counters['copy_files_skipped'] = copy_stats['skipped']
+        counters['copy_bytes_written'] = copy_stats['copied_bytes']
+        counters['copy_bytes_skipped'] = copy_stats['skipped_bytes']
+        metrics.update({
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'counters': counters,
+            'generators': (regen or {}).get('jobs', {}),
+            'documents': documents,
+        })
+        metrics_path = write_metrics(target, metrics)
 
     print(f'\n{BOLD}{GREEN}═══ TERMINÉ ═══{RESET}')
-    print(f'  {len(copied)} document(s) copié(s)')
+    print(f'  {len(copied)} document(s) dans la cible : {copy_stats["copied"]} copié(s) '
+          f'({round(copy_stats["copied_bytes"] / 1024)} Ko), {copy_stats["skipped"]} déjà à jour '
+          f'({round(copy_stats["skipped_bytes"] / 1024)} Ko non réécrits)')
     print(f'  {len(updated)} document(s) ancien(s) mis à jour')
     print(f'  Rapport : {rapport}')
+    if metrics_path:
+        print(f'  Mesures : {metrics_path}')
     print(f'\n  📁 Ouvrez : {target}\n')
 
 